@@ -0,0 +1,27 @@
+"""
+Backend URL lookup shared by the AI recruiter test scripts.
+"""
+
+import functools
+import re
+from pathlib import Path
+
+FRONTEND_ENV_PATH = Path("/app/frontend/.env")
+DEFAULT_BACKEND_URL = "https://miniapp-wvsxfa.fly.dev"  # Production URL from frontend/.env
+
+_BACKEND_URL_RE = re.compile(rb'^REACT_APP_BACKEND_URL=(.+)$', re.M)
+
+
+@functools.lru_cache(maxsize=1)
+def get_backend_url() -> str:
+    """Backend URL from REACT_APP_BACKEND_URL in the frontend .env, falling back to production
+
+    The file is read once per process and scanned with a single regex search.
+    """
+    try:
+        content = FRONTEND_ENV_PATH.read_bytes()
+    except FileNotFoundError:
+        return DEFAULT_BACKEND_URL
+    
+    match = _BACKEND_URL_RE.search(content)
+    return match.group(1).decode().strip() if match else DEFAULT_BACKEND_URL
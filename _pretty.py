@@ -0,0 +1,34 @@
+"""
+Lazy pretty-printing of JSON payloads for log messages.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+class Pretty:
+    """Wrap a payload so it is only serialized if the log record is emitted
+
+    Usage: logger.info("Response: %s", Pretty(data))
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return _dumps(self.obj)
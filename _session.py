@@ -0,0 +1,70 @@
+"""
+Shared aiohttp session for the AI recruiter test scripts.
+
+All scripts hit the same backend host, so one pooled session keeps the
+TCP/TLS connection alive between requests instead of re-handshaking.
+"""
+
+from typing import Optional
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+from _env import get_backend_url
+
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _make_resolver() -> Optional[AbstractResolver]:
+    """aiodns-backed resolver when available, otherwise aiohttp's default"""
+    try:
+        import aiodns  # noqa: F401
+    except ImportError:
+        return None
+    return aiohttp.AsyncResolver()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        connector = aiohttp.TCPConnector(
+            resolver=_make_resolver(),
+            limit=100,
+            limit_per_host=50,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        # base_url lets callers pass bare paths, the host is parsed only once
+        _SESSION = aiohttp.ClientSession(
+            base_url=get_backend_url(),
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+    return _SESSION
+
+
+async def close_session():
+    """Close the process-wide session (call once at shutdown)"""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+
+
+async def get_auth_session(auth_token: str) -> aiohttp.ClientSession:
+    """Return a session that sends the bearer token by default
+
+    It shares the pooled connector of the process-wide session, so closing
+    it leaves the underlying connections open for reuse.
+    """
+    base = await get_session()
+    return aiohttp.ClientSession(
+        base_url=get_backend_url(),
+        connector=base.connector,
+        connector_owner=False,
+        timeout=base.timeout,
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
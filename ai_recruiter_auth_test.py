@@ -24,38 +24,43 @@ import asyncio
 import aiohttp
 import json
 import logging
-from pathlib import Path
 from typing import Dict, Any
 
+from _env import get_backend_url
+from _session import get_session, close_session
+from logger_setup import configure_once
+
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_once()
 logger = logging.getLogger(__name__)
 
 class AIRecruiterAuthTester:
+    # (method, endpoint, json payload) of every endpoint that must require authentication
+    _AUTH_CASES = (
+        ("GET", "/api/ai-recruiter/profile", None),
+        ("POST", "/api/ai-recruiter/start", {"user_language": "ru"}),
+        ("POST", "/api/ai-recruiter/continue", {
+            "user_message": "Я ищу работу разработчика в Берлине",
+            "conversation_data": {"test": "data"}
+        }),
+    )
+    
     def __init__(self):
         # Get backend URL from frontend .env file
-        frontend_env_path = Path("/app/frontend/.env")
-        self.backend_url = "https://miniapp-wvsxfa.fly.dev"  # Production URL from frontend/.env
-        
-        if frontend_env_path.exists():
-            with open(frontend_env_path, 'r') as f:
-                for line in f:
-                    if line.startswith('REACT_APP_BACKEND_URL='):
-                        self.backend_url = line.split('=', 1)[1].strip()
-                        break
-            
+        self.backend_url = get_backend_url()
+        
         logger.info(f"Testing AI recruiter endpoints at: {self.backend_url}")
         
         self.session = None
         self.test_results = []
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # Shared session is closed once in main()
+        self.session = None
     
     def log_test_result(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test result"""
@@ -69,36 +74,44 @@ class AIRecruiterAuthTester:
             "response_data": response_data
         })
     
-    async def make_request(self, method: str, endpoint: str, **kwargs) -> tuple[bool, Any, str]:
-        """Make HTTP request and return success, data, error"""
+    async def make_request(self, method: str, endpoint: str, parse_body: bool = False, **kwargs) -> tuple[int, Any, str]:
+        """Make HTTP request and return status code, data, error (status 0 on connection failure)
+        
+        The auth tests only look at the status code, so the body is skipped unless parse_body is set.
+        """
         try:
-            url = f"{self.backend_url}{endpoint}"
-            
-            async with self.session.request(method, url, **kwargs) as response:
+            # The shared session carries base_url, so only the path is passed
+            async with self.session.request(method, endpoint, **kwargs) as response:
+                if not parse_body:
+                    response.release()
+                    error = f"HTTP {response.status}" if response.status >= 400 else ""
+                    return response.status, None, error
+                
+                if response.status >= 400:
+                    # Error bodies are only logged, no need to parse them as JSON
+                    return response.status, await response.text(), f"HTTP {response.status}"
+                
                 try:
-                    data = await response.json()
-                except:
+                    data = await response.json(content_type=None)
+                except (aiohttp.ContentTypeError, json.JSONDecodeError, aiohttp.ClientPayloadError):
                     data = await response.text()
                 
-                if response.status < 400:
-                    return True, data, ""
-                else:
-                    return False, data, f"HTTP {response.status}"
+                return response.status, data, ""
                     
         except Exception as e:
-            return False, None, str(e)
+            return 0, None, str(e)
     
-    async def test_ai_recruiter_profile_auth(self):
-        """Test GET /api/ai-recruiter/profile authentication requirement"""
-        logger.info("=== Testing GET /api/ai-recruiter/profile Authentication ===")
+    async def _test_auth_case(self, method: str, endpoint: str, payload: Any) -> bool:
+        """Test that a single endpoint requires authentication"""
+        logger.info(f"=== Testing {method} {endpoint} Authentication ===")
         
-        success, data, error = await self.make_request("GET", "/api/ai-recruiter/profile")
+        status, data, error = await self.make_request(method, endpoint, json=payload)
         
         # Should fail with 401 or 403 (authentication required)
-        is_auth_required = not success and ("401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", "")) or "401" in str(data) or "403" in str(data))))
+        is_auth_required = status in (401, 403)
         
         self.log_test_result(
-            "GET /api/ai-recruiter/profile - Authentication required",
+            f"{method} {endpoint} - Authentication required",
             is_auth_required,
             f"Correctly requires authentication (401/403)" if is_auth_required else f"Unexpected response: {error}",
             data
@@ -106,60 +119,22 @@ class AIRecruiterAuthTester:
         
         return is_auth_required
     
-    async def test_ai_recruiter_start_auth(self):
-        """Test POST /api/ai-recruiter/start authentication requirement"""
-        logger.info("=== Testing POST /api/ai-recruiter/start Authentication ===")
-        
-        start_data = {
-            "user_language": "ru"
-        }
-        
-        success, data, error = await self.make_request("POST", "/api/ai-recruiter/start", json=start_data)
-        
-        # Should fail with 401 or 403 (authentication required)
-        is_auth_required = not success and ("401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", "")) or "401" in str(data) or "403" in str(data))))
-        
-        self.log_test_result(
-            "POST /api/ai-recruiter/start - Authentication required",
-            is_auth_required,
-            f"Correctly requires authentication (401/403)" if is_auth_required else f"Unexpected response: {error}",
-            data
+    async def _run_auth_cases(self) -> list:
+        """Run every entry of _AUTH_CASES concurrently, results in table order"""
+        return await asyncio.gather(
+            *(self._test_auth_case(method, endpoint, payload) for method, endpoint, payload in self._AUTH_CASES),
+            return_exceptions=True
         )
-        
-        return is_auth_required
-    
-    async def test_ai_recruiter_continue_auth(self):
-        """Test POST /api/ai-recruiter/continue authentication requirement"""
-        logger.info("=== Testing POST /api/ai-recruiter/continue Authentication ===")
-        
-        continue_data = {
-            "user_message": "Я ищу работу разработчика в Берлине",
-            "conversation_data": {"test": "data"}
-        }
-        
-        success, data, error = await self.make_request("POST", "/api/ai-recruiter/continue", json=continue_data)
-        
-        # Should fail with 401 or 403 (authentication required)
-        is_auth_required = not success and ("401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", "")) or "401" in str(data) or "403" in str(data))))
-        
-        self.log_test_result(
-            "POST /api/ai-recruiter/continue - Authentication required",
-            is_auth_required,
-            f"Correctly requires authentication (401/403)" if is_auth_required else f"Unexpected response: {error}",
-            data
-        )
-        
-        return is_auth_required
     
     async def test_api_prefix_requirement(self):
         """Test that endpoints require /api prefix (critical for Kubernetes ingress)"""
         logger.info("=== Testing /api Prefix Requirement ===")
         
         # Test that endpoints without /api prefix return 404
-        success_no_prefix, data_no_prefix, error_no_prefix = await self.make_request("GET", "/ai-recruiter/profile")
+        status_no_prefix, data_no_prefix, error_no_prefix = await self.make_request("GET", "/ai-recruiter/profile")
         
         # Should fail with 404 (not found) because correct endpoint is /api/ai-recruiter/profile
-        is_404_without_prefix = not success_no_prefix and ("404" in str(error_no_prefix) or (isinstance(data_no_prefix, dict) and "404" in str(data_no_prefix)))
+        is_404_without_prefix = status_no_prefix == 404
         
         self.log_test_result(
             "GET /ai-recruiter/profile (without /api prefix) - Should return 404",
@@ -175,11 +150,23 @@ class AIRecruiterAuthTester:
         logger.info("🎯 STARTING AI RECRUITER AUTHENTICATION TESTS")
         logger.info("=" * 60)
         
-        # Run all tests
-        profile_auth = await self.test_ai_recruiter_profile_auth()
-        start_auth = await self.test_ai_recruiter_start_auth()
-        continue_auth = await self.test_ai_recruiter_continue_auth()
-        api_prefix = await self.test_api_prefix_requirement()
+        # Run all tests concurrently - they are independent requests to the same host
+        auth_results, api_prefix = await asyncio.gather(
+            self._run_auth_cases(),
+            self.test_api_prefix_requirement(),
+            return_exceptions=True
+        )
+        if isinstance(auth_results, Exception):
+            auth_results = [auth_results] * len(self._AUTH_CASES)
+        results = [*auth_results, api_prefix]
+        
+        # A test that raised counts as failed
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Test raised an exception: {result}")
+        profile_auth, start_auth, continue_auth, api_prefix = (
+            False if isinstance(result, Exception) else result for result in results
+        )
         
         # Summary
         logger.info("=" * 60)
@@ -207,10 +194,18 @@ class AIRecruiterAuthTester:
 
 async def main():
     """Main test runner"""
-    async with AIRecruiterAuthTester() as tester:
-        success = await tester.run_all_tests()
-        return success
+    try:
+        async with AIRecruiterAuthTester() as tester:
+            success = await tester.run_all_tests()
+            return success
+    finally:
+        await close_session()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     success = asyncio.run(main())
     exit(0 if success else 1)
\ No newline at end of file
@@ -7,99 +7,134 @@ to understand why users are getting "Ошибка запуска AI рекрут
 """
 
 import asyncio
-import aiohttp
+import httpx
 import json
 import logging
-from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from _env import get_backend_url
+from _pretty import Pretty
+from logger_setup import configure_once
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_once()
 logger = logging.getLogger(__name__)
 
-async def analyze_ai_recruiter_errors():
+def _loads(raw: bytes):
+    """Decode a JSON body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def create_client() -> httpx.AsyncClient:
+    """One HTTP/2 client for the whole analysis, authentication included"""
+    return httpx.AsyncClient(
+        http2=True,
+        base_url=get_backend_url(),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        timeout=30.0
+    )
+
+async def analyze_ai_recruiter_errors(client: httpx.AsyncClient):
     """Analyze detailed error responses from AI recruiter endpoints"""
     
-    # Get backend URL
-    frontend_env_path = Path("/app/frontend/.env")
-    backend_url = "https://miniapp-wvsxfa.fly.dev"
-    
-    if frontend_env_path.exists():
-        with open(frontend_env_path, 'r') as f:
-            for line in f:
-                if line.startswith('REACT_APP_BACKEND_URL='):
-                    backend_url = line.split('=', 1)[1].strip()
-                    break
+    logger.info(f"🔍 Analyzing AI Recruiter errors at: {client.base_url}")
     
-    logger.info(f"🔍 Analyzing AI Recruiter errors at: {backend_url}")
-    
-    async with aiohttp.ClientSession() as session:
-        # Step 1: Authenticate
-        telegram_auth_data = {
-            "telegram_user": {
-                "id": 123456789,
-                "first_name": "Test",
-                "last_name": "User", 
-                "username": "testuser",
-                "language_code": "ru"
-            }
+    # Step 1: Authenticate
+    telegram_auth_data = {
+        "telegram_user": {
+            "id": 123456789,
+            "first_name": "Test",
+            "last_name": "User", 
+            "username": "testuser",
+            "language_code": "ru"
         }
+    }
+    
+    response = await client.post("/api/auth/telegram/verify", json=telegram_auth_data)
+    auth_token = _loads(response.content).get("access_token")
         
-        async with session.post(f"{backend_url}/api/auth/telegram/verify", json=telegram_auth_data) as response:
-            auth_data = await response.json()
-            auth_token = auth_data.get("access_token")
-            
-        if not auth_token:
-            logger.error("❌ Failed to get auth token")
-            return
-            
-        logger.info("✅ Authentication successful")
+    if not auth_token:
+        logger.error("❌ Failed to get auth token")
+        return
         
-        headers = {"Authorization": f"Bearer {auth_token}"}
+    logger.info("✅ Authentication successful")
+    client.headers["Authorization"] = f"Bearer {auth_token}"
+    
+    # Steps 2-4 are independent once we have the token, so they run as parallel
+    # streams over the same HTTP/2 connection the auth request opened
+    results = await asyncio.gather(
+        test_profile(client),
+        test_start(client),
+        test_continue(client),
+        return_exceptions=True
+    )
+    
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"❌ Request failed: {result!r}")
+
+async def test_profile(client: httpx.AsyncClient):
+    """Step 2: Test AI recruiter profile"""
+    logger.info("\n🔍 Testing GET /api/ai-recruiter/profile...")
+    response = await client.get("/api/ai-recruiter/profile")
+    profile_data = _loads(response.content)
+    logger.info("📋 Profile Response: %s", Pretty(profile_data))
+
+async def test_start(client: httpx.AsyncClient):
+    """Step 3: Test AI recruiter start"""
+    logger.info("\n🔍 Testing POST /api/ai-recruiter/start...")
+    start_data = {"user_language": "ru"}
+    response = await client.post("/api/ai-recruiter/start", json=start_data)
+    start_response = _loads(response.content)
+    logger.info("🚀 Start Response: %s", Pretty(start_response))
+    
+    # Analyze the error
+    if start_response.get("status") == "error":
+        error_message = start_response.get("message", "")
+        error_details = start_response.get("error", "")
         
-        # Step 2: Test AI recruiter profile
-        logger.info("\n🔍 Testing GET /api/ai-recruiter/profile...")
-        async with session.get(f"{backend_url}/api/ai-recruiter/profile", headers=headers) as response:
-            profile_data = await response.json()
-            logger.info(f"📋 Profile Response: {json.dumps(profile_data, indent=2, ensure_ascii=False)}")
+        logger.error(f"❌ AI RECRUITER START ERROR FOUND:")
+        logger.error(f"   Message: {error_message}")
+        logger.error(f"   Error: {error_details}")
         
-        # Step 3: Test AI recruiter start
-        logger.info("\n🔍 Testing POST /api/ai-recruiter/start...")
-        start_data = {"user_language": "ru"}
-        async with session.post(f"{backend_url}/api/ai-recruiter/start", json=start_data, headers=headers) as response:
-            start_response = await response.json()
-            logger.info(f"🚀 Start Response: {json.dumps(start_response, indent=2, ensure_ascii=False)}")
-            
-            # Analyze the error
-            if start_response.get("status") == "error":
-                error_message = start_response.get("message", "")
-                error_details = start_response.get("error", "")
-                
-                logger.error(f"❌ AI RECRUITER START ERROR FOUND:")
-                logger.error(f"   Message: {error_message}")
-                logger.error(f"   Error: {error_details}")
-                
-                # Check if this matches user's reported error
-                if "Ошибка запуска AI рекрутера" in error_message or "AI рекрутер" in error_message:
-                    logger.error("🎯 THIS IS THE EXACT ERROR USER IS EXPERIENCING!")
-                
-        # Step 4: Test AI recruiter continue
-        logger.info("\n🔍 Testing POST /api/ai-recruiter/continue...")
-        continue_data = {
-            "user_message": "Я ищу работу разработчика в Берлине",
-            "conversation_data": {"conversation_id": "test_conversation", "messages": []}
-        }
-        async with session.post(f"{backend_url}/api/ai-recruiter/continue", json=continue_data, headers=headers) as response:
-            continue_response = await response.json()
-            logger.info(f"💬 Continue Response: {json.dumps(continue_response, indent=2, ensure_ascii=False)}")
-            
-            # Analyze the error
-            if continue_response.get("status") == "error":
-                error_message = continue_response.get("message", "")
-                error_details = continue_response.get("error", "")
-                
-                logger.error(f"❌ AI RECRUITER CONTINUE ERROR FOUND:")
-                logger.error(f"   Message: {error_message}")
-                logger.error(f"   Error: {error_details}")
+        # Check if this matches user's reported error
+        if "Ошибка запуска AI рекрутера" in error_message or "AI рекрутер" in error_message:
+            logger.error("🎯 THIS IS THE EXACT ERROR USER IS EXPERIENCING!")
+
+async def test_continue(client: httpx.AsyncClient):
+    """Step 4: Test AI recruiter continue"""
+    logger.info("\n🔍 Testing POST /api/ai-recruiter/continue...")
+    continue_data = {
+        "user_message": "Я ищу работу разработчика в Берлине",
+        "conversation_data": {"conversation_id": "test_conversation", "messages": []}
+    }
+    response = await client.post("/api/ai-recruiter/continue", json=continue_data)
+    continue_response = _loads(response.content)
+    logger.info("💬 Continue Response: %s", Pretty(continue_response))
+    
+    # Analyze the error
+    if continue_response.get("status") == "error":
+        error_message = continue_response.get("message", "")
+        error_details = continue_response.get("error", "")
+        
+        logger.error(f"❌ AI RECRUITER CONTINUE ERROR FOUND:")
+        logger.error(f"   Message: {error_message}")
+        logger.error(f"   Error: {error_details}")
+
+async def main():
+    """Main analysis runner"""
+    async with create_client() as client:
+        await analyze_ai_recruiter_errors(client)
 
 if __name__ == "__main__":
-    asyncio.run(analyze_ai_recruiter_errors())
\ No newline at end of file
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
\ No newline at end of file
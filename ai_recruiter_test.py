@@ -35,77 +35,318 @@
 """
 
 import asyncio
-import aiohttp
+import httpx
 import json
+import msgspec
 import logging
+import os
+import tempfile
+import threading
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from _env import get_backend_url
+from logger_setup import configure_once, stop_listener
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+configure_once(use_queue=True)
 logger = logging.getLogger(__name__)
 
+# orjson decodes/encodes response and request bodies in C when it is installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _json_bytes(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+# Telegram user scenarios to test; each gets its own tester sharing one client
+TELEGRAM_USERS = (
+    {
+        "id": 123456789,
+        "first_name": "Test",
+        "last_name": "User",
+        "username": "testuser",
+        "language_code": "ru"
+    },
+)
+
+# Bearer tokens are cached per Telegram user id so reruns can start the endpoint
+# tests without waiting for the verify call (the auth test still always makes it)
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "ai_recruiter_tester" / "token.json"
+TOKEN_MAX_AGE_S = 3600
+_token_cache_lock = threading.Lock()
+
+def _read_token_cache() -> Dict[str, Any]:
+    try:
+        return json.loads(TOKEN_CACHE_PATH.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _update_token_cache(user_id: str, token: Optional[str]):
+    with _token_cache_lock:
+        cache = _read_token_cache()
+        if token:
+            cache[user_id] = {"token": token, "ts": time.time()}
+        else:
+            cache.pop(user_id, None)
+        TOKEN_CACHE_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # The file holds bearer tokens: owner-only (mkstemp creates it 0600) and
+        # replaced atomically so a concurrent reader never sees a partial write
+        fd, tmp_path = tempfile.mkstemp(dir=TOKEN_CACHE_PATH.parent, prefix=".token-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(cache))
+            os.replace(tmp_path, TOKEN_CACHE_PATH)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+async def load_cached_token(user_id: Any) -> Optional[str]:
+    """Cached token for the user if it is younger than TOKEN_MAX_AGE_S"""
+    cache = await asyncio.to_thread(_read_token_cache)
+    entry = cache.get(str(user_id))
+    if entry and time.time() - entry.get("ts", 0) < TOKEN_MAX_AGE_S:
+        return entry.get("token")
+    return None
+
+async def store_cached_token(user_id: Any, token: Optional[str]):
+    """Save the user's token, or drop it when token is None"""
+    try:
+        await asyncio.to_thread(_update_token_cache, str(user_id), token)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not update token cache: {e}")
+
+# Upper bound on in-flight requests to the backend
+MAX_CONCURRENT_REQUESTS = 8
+
+# Request bodies that never change, serialized once at import
+_START_PAYLOAD = _json_bytes({"user_language": "ru"})
+_CONTINUE_NO_AUTH_PAYLOAD = _json_bytes({
+    "user_message": "test message",
+    "conversation_data": {"conversation_id": "test"}
+})
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Used by the continue test when start didn't return conversation data
+_FALLBACK_CONVERSATION_DATA = {"conversation_id": "test_conversation", "messages": []}
+
+class AIResponse(msgspec.Struct):
+    """Keys the AI recruiter endpoints may return; keys missing from the body stay UNSET"""
+    status: Any = msgspec.UNSET
+    message: Any = msgspec.UNSET
+    response: Any = msgspec.UNSET
+    ai_message: Any = msgspec.UNSET
+    profile: Any = msgspec.UNSET
+    conversation_data: Any = msgspec.UNSET
+    
+    def has(self, *fields: str) -> bool:
+        """True if the body contained any of the given keys"""
+        return any(getattr(self, field) is not msgspec.UNSET for field in fields)
+
+class _EndpointCase(NamedTuple):
+    """One authenticated AI recruiter endpoint check"""
+    key: str
+    method: str
+    endpoint: str
+    title: str
+    payload: Optional[bytes]
+    timeout_s: float
+    # Groups of alternative keys; the response needs at least one key of each group
+    required_keys: Tuple[Tuple[str, ...], ...]
+    fail_hint: str
+
+_PROFILE_CASE = _EndpointCase(
+    "ai_profile", "GET", "/api/ai-recruiter/profile",
+    "🎯 GET /api/ai-recruiter/profile - Get user profile",
+    None, 5,
+    (("status",), ("profile", "message")),
+    "Profile endpoint"
+)
+_START_CASE = _EndpointCase(
+    "ai_start", "POST", "/api/ai-recruiter/start",
+    "🎯 POST /api/ai-recruiter/start - Start AI recruiter conversation",
+    _START_PAYLOAD, 30,
+    (("status",), ("conversation_data", "message", "response", "ai_message")),
+    "КРИТИЧЕСКАЯ ОШИБКА: AI recruiter start"
+)
+# The continue payload is built from the start response at run time
+_CONTINUE_CASE = _EndpointCase(
+    "ai_continue", "POST", "/api/ai-recruiter/continue",
+    "🎯 POST /api/ai-recruiter/continue - Continue AI recruiter conversation",
+    None, 30,
+    (("status",), ("response", "ai_message", "message")),
+    "AI recruiter continue"
+)
+
 class AIRecruiterTester:
-    def __init__(self):
-        # Get backend URL from frontend .env file
-        frontend_env_path = Path("/app/frontend/.env")
-        self.backend_url = "https://miniapp-wvsxfa.fly.dev"  # Production URL from frontend/.env
-        
-        if frontend_env_path.exists():
-            with open(frontend_env_path, 'r') as f:
-                for line in f:
-                    if line.startswith('REACT_APP_BACKEND_URL='):
-                        self.backend_url = line.split('=', 1)[1].strip()
-                        break
-            
+    def __init__(self,
+                 telegram_user: Optional[Dict[str, Any]] = None,
+                 client: Optional[httpx.AsyncClient] = None,
+                 rate_limiter: Optional[asyncio.Semaphore] = None):
+        """telegram_user defaults to the first TELEGRAM_USERS entry.
+        
+        Pass a shared client to run several testers in one process; it is then
+        left open on exit. Testers sharing a client should share rate_limiter too.
+        """
+        # Get backend URL from frontend .env file (parsed once per process)
+        self.backend_url = get_backend_url()
+        
+        self.telegram_user = telegram_user or TELEGRAM_USERS[0]
+        # Serialized once per tester, reused by the auth request
+        self._tg_auth_payload = _json_bytes({"telegram_user": self.telegram_user})
+        
         logger.info(f"🎯 Testing AI Recruiter at: {self.backend_url}")
         
-        self.session = None
+        self.client = client
+        self._owns_client = client is None
+        self._rate_limiter = rate_limiter or asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         self.test_results = []
+        self._results_by_key: Dict[str, Dict[str, Any]] = {}
+        self._passed_count = 0
         self.auth_token = None
-        
+        self._token_from_cache = False
+        self._reauth_lock = asyncio.Lock()
+        self._auth_headers = {}
+        self._auth_json_headers = _JSON_HEADERS
+        
+    @staticmethod
+    async def create_client(backend_url: str) -> httpx.AsyncClient:
+        """One client for the whole run: with HTTP/2 all concurrent requests are
+        multiplexed as streams over a single connection to the backend host.
+        The cookie jar accepts no cookies, so runs and users don't share them"""
+        return httpx.AsyncClient(
+            http2=True,
+            base_url=backend_url,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        )
+    
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.client is None:
+            self.client = await self.create_client(self.backend_url)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        if self.client and self._owns_client:
+            await self.client.aclose()
     
-    def log_test_result(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
-        """Log test result"""
+    def log_test_result(self, test_name: str, success: bool, details: str = "", response_data: Any = None, key: Optional[str] = None):
+        """Log test result; key makes it retrievable from the summary without scanning"""
         status = "✅ PASS" if success else "❌ FAIL"
         logger.info(f"{status} - {test_name}: {details}")
         
-        self.test_results.append({
+        result = {
             "test": test_name,
             "success": success,
             "details": details,
             "response_data": response_data
-        })
+        }
+        self.test_results.append(result)
+        if key:
+            self._results_by_key[key] = result
+        if success:
+            self._passed_count += 1
+    
+    def _log_task_failures(self, test_name: str, eg: BaseExceptionGroup):
+        """Record every exception raised inside a TaskGroup as a failed test"""
+        for exc in eg.exceptions:
+            if isinstance(exc, BaseExceptionGroup):
+                self._log_task_failures(test_name, exc)
+                continue
+            self.log_test_result(test_name, False, f"❌ Test raised an exception: {exc!r}", None)
     
-    async def make_request(self, method: str, endpoint: str, **kwargs) -> tuple[bool, Any, str]:
-        """Make HTTP request and return success, data, error"""
+    @staticmethod
+    def _is_auth_error(error: str, data: Any) -> bool:
+        """Check whether a failed request was rejected for missing authentication"""
+        detail = data.get("detail", "") if isinstance(data, dict) else ""
+        return error in ("HTTP 401", "HTTP 403") or detail == "Not authenticated"
+    
+    def _apply_auth(self):
+        """Build the Authorization headers once after the token is obtained"""
+        self._auth_headers = {"Authorization": f"Bearer {self.auth_token}"} if self.auth_token else {}
+        self._auth_json_headers = {**self._auth_headers, **_JSON_HEADERS}
+    
+    async def _reauthenticate(self, rejected_token: str):
+        """Replace a rejected cached token with a fresh one from Telegram verify"""
+        async with self._reauth_lock:
+            if self.auth_token != rejected_token:
+                return  # another request already refreshed it
+            
+            logger.warning("⚠️ Cached token rejected, re-authenticating")
+            self._token_from_cache = False
+            user_id = self.telegram_user["id"]
+            await store_cached_token(user_id, None)
+            
+            success, data, error = await self._send("POST", "/api/auth/telegram/verify", auth=False, content=self._tg_auth_payload)
+            if success and isinstance(data, dict) and data.get("access_token"):
+                self.auth_token = data["access_token"]
+                self._apply_auth()
+                await store_cached_token(user_id, self.auth_token)
+    
+    async def make_request(self, method: str, endpoint: str, *, auth: bool = True, timeout_s: float = 15.0, response_type: Optional[type] = None, **kwargs) -> tuple[bool, Any, str]:
+        """Make HTTP request and return success, data, error
+        
+        With response_type (a msgspec.Struct) a successful JSON body is decoded and
+        validated straight into it in one C pass; error bodies stay plain dicts.
+        auth=False sends the request without the bearer token (for auth-requirement checks),
+        so concurrent tests never have to swap self.auth_token.
+        timeout_s bounds the whole request, so a hung endpoint fails fast with error "timeout".
+        Pre-serialized JSON can be passed as content=bytes; the Content-Type header is added for it.
+        A 401 on a cached token triggers one re-authentication and retry.
+        """
+        token = self.auth_token
+        result = await self._send(method, endpoint, auth=auth, timeout_s=timeout_s, response_type=response_type, **kwargs)
+        
+        # The token may have been replaced by the auth test while the request was in flight
+        if auth and result[2] == "HTTP 401" and (self._token_from_cache or token != self.auth_token):
+            await self._reauthenticate(token)
+            result = await self._send(method, endpoint, auth=auth, timeout_s=timeout_s, response_type=response_type, **kwargs)
+        
+        return result
+    
+    async def _send(self, method: str, endpoint: str, *, auth: bool = True, timeout_s: float = 15.0, response_type: Optional[type] = None, **kwargs) -> tuple[bool, Any, str]:
+        """Single request attempt for make_request"""
         try:
-            url = f"{self.backend_url}{endpoint}"
+            # Add auth header if we have a token, and Content-Type for pre-serialized bodies
+            is_json_bytes = isinstance(kwargs.get('content'), bytes)
+            if auth and self._auth_headers:
+                extra_headers = self._auth_json_headers if is_json_bytes else self._auth_headers
+            else:
+                extra_headers = _JSON_HEADERS if is_json_bytes else None
+            if extra_headers:
+                headers = kwargs.get('headers')
+                kwargs['headers'] = {**headers, **extra_headers} if headers else extra_headers
             
-            # Add auth header if we have a token
-            if self.auth_token and 'headers' not in kwargs:
-                kwargs['headers'] = {}
-            if self.auth_token:
-                kwargs['headers']['Authorization'] = f"Bearer {self.auth_token}"
+            # Cap in-flight requests so concurrent tests don't trip backend rate limits
+            async with self._rate_limiter:
+                response = await self.client.request(method, endpoint, timeout=timeout_s, **kwargs)
             
-            async with self.session.request(method, url, **kwargs) as response:
+            # HTML/text error pages (e.g. a 502 from the edge) skip the doomed JSON parse
+            if response.headers.get("content-type", "").startswith("application/json"):
                 try:
-                    data = await response.json()
-                except:
-                    data = await response.text()
-                
-                if response.status < 400:
-                    return True, data, ""
-                else:
-                    return False, data, f"HTTP {response.status}"
+                    if response_type is not None and response.status_code < 400:
+                        data = msgspec.json.decode(response.content, type=response_type)
+                    else:
+                        data = _json_loads(response.content)
+                except ValueError:  # also msgspec.DecodeError / ValidationError
+                    data = response.text
+            else:
+                data = response.text
+            
+            if response.status_code < 400:
+                return True, data, ""
+            else:
+                return False, data, f"HTTP {response.status_code}"
                     
+        except httpx.TimeoutException:
+            return False, None, "timeout"
         except Exception as e:
             return False, None, str(e)
     
@@ -113,18 +354,9 @@ class AIRecruiterTester:
         """🎯 КРИТИЧЕСКИЙ ТЕСТ: Telegram Authentication for AI Recruiter"""
         logger.info("=== 🎯 КРИТИЧЕСКИЙ ТЕСТ: Telegram Authentication for AI Recruiter ===")
         
-        # Test Telegram authentication with user data from the request
-        telegram_auth_data = {
-            "telegram_user": {
-                "id": 123456789,
-                "first_name": "Test",
-                "last_name": "User", 
-                "username": "testuser",
-                "language_code": "ru"
-            }
-        }
-        
-        success, data, error = await self.make_request("POST", "/api/auth/telegram/verify", json=telegram_auth_data)
+        # Always exercise the verify endpoint, even when a cached token is in use
+        user_id = self.telegram_user["id"]
+        success, data, error = await self.make_request("POST", "/api/auth/telegram/verify", auth=False, content=self._tg_auth_payload)
         
         if success and isinstance(data, dict):
             has_access_token = "access_token" in data
@@ -134,20 +366,25 @@ class AIRecruiterTester:
             # Store auth token for subsequent AI recruiter tests
             if has_access_token:
                 self.auth_token = data["access_token"]
+                self._token_from_cache = False
+                self._apply_auth()
+                await store_cached_token(user_id, self.auth_token)
                 logger.info(f"✅ Telegram authentication successful, token stored for AI recruiter tests")
             
             self.log_test_result(
                 "🎯 POST /api/auth/telegram/verify - Telegram authentication for AI recruiter",
                 has_access_token and has_user_data and token_type_correct,
                 f"Token: {'✅' if has_access_token else '❌'}, User data: {'✅' if has_user_data else '❌'}, Token type: {data.get('token_type')}, User ID: {data.get('user', {}).get('id', 'N/A')}",
-                data
+                data,
+                key="tg_auth"
             )
         else:
             self.log_test_result(
                 "🎯 POST /api/auth/telegram/verify - Telegram authentication for AI recruiter",
                 False,
                 f"❌ КРИТИЧЕСКАЯ ОШИБКА: Telegram authentication failed: {error}",
-                data
+                data,
+                key="tg_auth"
             )
     
     async def test_ai_recruiter_endpoints(self):
@@ -164,132 +401,98 @@ class AIRecruiterTester:
             )
             return
         
-        # 1. Test GET /api/ai-recruiter/profile - должен возвращать профиль пользователя или сообщение о том, что профиль не найден
-        logger.info("Testing GET /api/ai-recruiter/profile...")
-        success, data, error = await self.make_request("GET", "/api/ai-recruiter/profile")
-        
-        if success and isinstance(data, dict):
-            has_status = "status" in data
-            has_profile_data = "profile" in data or "message" in data
-            
-            self.log_test_result(
-                "🎯 GET /api/ai-recruiter/profile - Get user profile",
-                has_status and has_profile_data,
-                f"✅ Status: {data.get('status')}, Has profile data: {has_profile_data}, Response keys: {list(data.keys())}",
-                data
-            )
-        else:
-            # Check if it's an authentication error
-            is_auth_error = "401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", ""))))
-            
-            self.log_test_result(
-                "🎯 GET /api/ai-recruiter/profile - Get user profile",
-                False,
-                f"❌ Profile endpoint failed: {error}. Auth error: {is_auth_error}",
-                data
-            )
-        
-        # 2. Test POST /api/ai-recruiter/start - должен запускать разговор с AI-рекрутером с параметром user_language: 'ru'
-        logger.info("Testing POST /api/ai-recruiter/start...")
-        start_data = {
-            "user_language": "ru"
-        }
-        
-        success, data, error = await self.make_request("POST", "/api/ai-recruiter/start", json=start_data)
-        
-        conversation_data = None
-        if success and isinstance(data, dict):
-            has_status = "status" in data
-            has_conversation_data = "conversation_data" in data
-            has_message = "message" in data or "response" in data or "ai_message" in data
-            
-            # Store conversation data for continue test
-            conversation_data = data.get("conversation_data", {})
-            
-            self.log_test_result(
-                "🎯 POST /api/ai-recruiter/start - Start AI recruiter conversation",
-                has_status and (has_conversation_data or has_message),
-                f"✅ Status: {data.get('status')}, Has conversation data: {has_conversation_data}, Has message: {has_message}, Response keys: {list(data.keys())}",
-                data
-            )
-        else:
-            # Check if it's an authentication error
-            is_auth_error = "401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", ""))))
-            
-            self.log_test_result(
-                "🎯 POST /api/ai-recruiter/start - Start AI recruiter conversation",
-                False,
-                f"❌ КРИТИЧЕСКАЯ ОШИБКА: AI recruiter start failed: {error}. Auth error: {is_auth_error}. This could be the source of 'Ошибка запуска AI рекрутера'",
-                data
-            )
-        
-        # 3. Test POST /api/ai-recruiter/continue - должен продолжать разговор с AI-рекрутером
-        logger.info("Testing POST /api/ai-recruiter/continue...")
+        # Profile is independent; continue needs the conversation data returned by start
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._run_case(_PROFILE_CASE))
+                tg.create_task(self._run_start_then_continue())
+        except* Exception as eg:
+            self._log_task_failures("🎯 AI Recruiter endpoint tests", eg)
+    
+    async def _run_start_then_continue(self):
+        """Run the start case, then continue the conversation it opened"""
+        parsed = await self._run_case(_START_CASE)
         
-        # Use conversation data from start if available, otherwise use empty dict
+        # Use conversation data from start if available, otherwise use the fallback
+        conversation_data = parsed.conversation_data if parsed and parsed.has("conversation_data") else None
         if not conversation_data:
-            conversation_data = {"conversation_id": "test_conversation", "messages": []}
+            conversation_data = _FALLBACK_CONVERSATION_DATA
             logger.warning("⚠️ Using fallback conversation data for continue test")
         
         continue_data = {
             "user_message": "Я ищу работу разработчика в Берлине",
             "conversation_data": conversation_data
         }
-        
-        success, data, error = await self.make_request("POST", "/api/ai-recruiter/continue", json=continue_data)
-        
-        if success and isinstance(data, dict):
-            has_status = "status" in data
-            has_response = "response" in data or "ai_message" in data or "message" in data
-            has_updated_conversation = "conversation_data" in data
-            
-            self.log_test_result(
-                "🎯 POST /api/ai-recruiter/continue - Continue AI recruiter conversation",
-                has_status and has_response,
-                f"✅ Status: {data.get('status')}, Has response: {has_response}, Has updated conversation: {has_updated_conversation}, Response keys: {list(data.keys())}",
-                data
+        await self._run_case(_CONTINUE_CASE, content=_json_bytes(continue_data))
+    
+    async def _run_case(self, case: _EndpointCase, content: Optional[bytes] = None) -> Optional[AIResponse]:
+        """Request one endpoint case and log whether its response has the required keys
+        
+        content overrides the case payload. Returns the parsed response, or None on failure.
+        """
+        logger.info(f"Testing {case.method} {case.endpoint}...")
+        success, data, error = await self.make_request(
+            case.method, case.endpoint, timeout_s=case.timeout_s,
+            content=content if content is not None else case.payload,
+            response_type=AIResponse
+        )
+        
+        if success and isinstance(data, AIResponse):
+            # Every group of alternative keys must be represented in the response
+            checks = [data.has(*fields) for fields in case.required_keys]
+            checks_details = ", ".join(
+                f"Has {'/'.join(fields)}: {present}" for fields, present in zip(case.required_keys, checks)
             )
-        else:
-            # Check if it's an authentication error
-            is_auth_error = "401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", ""))))
+            # Only the keys the struct knows about; UNSET fields are left out
+            response_data = msgspec.to_builtins(data)
             
             self.log_test_result(
-                "🎯 POST /api/ai-recruiter/continue - Continue AI recruiter conversation",
-                False,
-                f"❌ AI recruiter continue failed: {error}. Auth error: {is_auth_error}",
-                data
+                case.title,
+                all(checks),
+                f"✅ Status: {response_data.get('status')}, {checks_details}, Response keys: {list(response_data)}",
+                response_data,
+                key=case.key
             )
+            return data
+        
+        # Check if it's an authentication error
+        is_auth_error = self._is_auth_error(error, data)
+        
+        self.log_test_result(
+            case.title,
+            False,
+            f"❌ {case.fail_hint} failed: {error}. Auth error: {is_auth_error}",
+            data,
+            key=case.key
+        )
+        return None
     
     async def test_ai_recruiter_authentication_requirements(self):
         """🎯 КРИТИЧЕСКИЙ ТЕСТ: AI Recruiter Authentication Requirements"""
         logger.info("=== 🎯 КРИТИЧЕСКИЙ ТЕСТ: AI Recruiter Authentication Requirements ===")
         
-        # Temporarily remove auth token to test authentication requirements
-        original_token = self.auth_token
-        self.auth_token = None
-        
         # Test all AI recruiter endpoints without authentication
         ai_recruiter_endpoints = [
-            ("GET", "/api/ai-recruiter/profile", "Get AI recruiter profile"),
-            ("POST", "/api/ai-recruiter/start", "Start AI recruiter conversation"),
-            ("POST", "/api/ai-recruiter/continue", "Continue AI recruiter conversation")
+            ("GET", "/api/ai-recruiter/profile", "Get AI recruiter profile", None),
+            ("POST", "/api/ai-recruiter/start", "Start AI recruiter conversation", _START_PAYLOAD),
+            ("POST", "/api/ai-recruiter/continue", "Continue AI recruiter conversation", _CONTINUE_NO_AUTH_PAYLOAD)
         ]
         
-        for method, endpoint, description in ai_recruiter_endpoints:
-            if method == "POST" and "start" in endpoint:
-                test_data = {"user_language": "ru"}
-                success, data, error = await self.make_request(method, endpoint, json=test_data)
-            elif method == "POST" and "continue" in endpoint:
-                test_data = {
-                    "user_message": "test message",
-                    "conversation_data": {"conversation_id": "test"}
-                }
-                success, data, error = await self.make_request(method, endpoint, json=test_data)
+        # The probes are independent, so fire them all at once
+        results = await asyncio.gather(
+            *(self.make_request(method, endpoint, auth=False, timeout_s=3, content=test_data)
+              for method, endpoint, _, test_data in ai_recruiter_endpoints),
+            return_exceptions=True
+        )
+        
+        for (method, endpoint, description, _), result in zip(ai_recruiter_endpoints, results):
+            if isinstance(result, Exception):
+                success, data, error = False, None, str(result)
             else:
-                success, data, error = await self.make_request(method, endpoint)
+                success, data, error = result
             
             # Should fail with 401 or 403 (authentication required)
-            is_auth_required = not success and ("401" in str(error) or "403" in str(error) or (isinstance(data, dict) and ("Not authenticated" in str(data.get("detail", "")))))
+            is_auth_required = not success and self._is_auth_error(error, data)
             
             self.log_test_result(
                 f"🎯 {method} {endpoint} - {description} (no auth)",
@@ -297,19 +500,30 @@ class AIRecruiterTester:
                 f"✅ Correctly requires authentication" if is_auth_required else f"❌ SECURITY ISSUE: Endpoint allows unauthorized access: {error}",
                 data
             )
-        
-        # Restore auth token
-        self.auth_token = original_token
     
     async def run_all_tests(self):
         """Run all AI recruiter tests"""
         logger.info("🎯 STARTING AI RECRUITER ENDPOINTS TESTING")
         logger.info("=" * 80)
         
-        # Test sequence
-        await self.test_telegram_authentication()
-        await self.test_ai_recruiter_authentication_requirements()
-        await self.test_ai_recruiter_endpoints()
+        # Test sequence: authenticate first, then the unauthenticated sweep and
+        # the authenticated endpoint tests run concurrently. With a recent cached
+        # token the endpoint tests start right away, alongside the auth test
+        cached_token = await load_cached_token(self.telegram_user["id"])
+        if cached_token:
+            self.auth_token = cached_token
+            self._token_from_cache = True
+            self._apply_auth()
+        else:
+            await self.test_telegram_authentication()
+        try:
+            async with asyncio.TaskGroup() as tg:
+                if cached_token:
+                    tg.create_task(self.test_telegram_authentication())
+                tg.create_task(self.test_ai_recruiter_authentication_requirements())
+                tg.create_task(self.test_ai_recruiter_endpoints())
+        except* Exception as eg:
+            self._log_task_failures("🎯 AI Recruiter test suite", eg)
         
         # Summary
         logger.info("=" * 80)
@@ -317,7 +531,7 @@ class AIRecruiterTester:
         logger.info("=" * 80)
         
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result["success"])
+        passed_tests = self._passed_count
         failed_tests = total_tests - passed_tests
         
         logger.info(f"📊 Total tests: {total_tests}")
@@ -328,19 +542,19 @@ class AIRecruiterTester:
         # Critical findings
         logger.info("\n🔍 CRITICAL FINDINGS:")
         
-        auth_test = next((r for r in self.test_results if "Telegram authentication for AI recruiter" in r["test"]), None)
+        auth_test = self._results_by_key.get("tg_auth")
         if auth_test and not auth_test["success"]:
             logger.error("❌ КРИТИЧЕСКАЯ ПРОБЛЕМА: Telegram authentication не работает - это может быть причиной 'Ошибка запуска AI рекрутера'")
         
-        start_test = next((r for r in self.test_results if "Start AI recruiter conversation" in r["test"] and "no auth" not in r["test"]), None)
+        start_test = self._results_by_key.get("ai_start")
         if start_test and not start_test["success"]:
             logger.error("❌ КРИТИЧЕСКАЯ ПРОБЛЕМА: AI recruiter start endpoint не работает - это источник 'Ошибка запуска AI рекрутера'")
         
-        profile_test = next((r for r in self.test_results if "Get user profile" in r["test"] and "no auth" not in r["test"]), None)
+        profile_test = self._results_by_key.get("ai_profile")
         if profile_test and not profile_test["success"]:
             logger.warning("⚠️ AI recruiter profile endpoint не работает")
         
-        continue_test = next((r for r in self.test_results if "Continue AI recruiter conversation" in r["test"] and "no auth" not in r["test"]), None)
+        continue_test = self._results_by_key.get("ai_continue")
         if continue_test and not continue_test["success"]:
             logger.warning("⚠️ AI recruiter continue endpoint не работает")
         
@@ -363,10 +577,27 @@ class AIRecruiterTester:
         }
 
 async def main():
-    """Main test runner"""
-    async with AIRecruiterTester() as tester:
-        results = await tester.run_all_tests()
-        return results
+    """Main test runner: one tester per Telegram user, all sharing one client"""
+    try:
+        client = await AIRecruiterTester.create_client(get_backend_url())
+        async with client:
+            rate_limiter = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            testers = [
+                AIRecruiterTester(telegram_user=user, client=client, rate_limiter=rate_limiter)
+                for user in TELEGRAM_USERS
+            ]
+            # Leaving the group waits for every tester, so the client is never
+            # closed under an in-flight request
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(tester.run_all_tests()) for tester in testers]
+            return [task.result() for task in tasks]
+    finally:
+        stop_listener()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -11,20 +11,981 @@
 
 import logging
 import json
+import operator
 import asyncio
+import copy
+import functools
+import hashlib
+import heapq
+import re
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+from types import MappingProxyType
 from modern_llm_manager import modern_llm_manager
 from job_search_service import JobSearchService
 from german_cities_service import GermanCitiesService
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Время хода: берется один раз на ход, в UTC с указанием пояса, чтобы отметки
+# разных воркеров были сравнимы независимо от их локального времени
+_now = functools.partial(datetime.now, timezone.utc)
+
+# JSON-объект в ответе LLM: от первой "{" до последней "}"
+_JSON_RE = re.compile(r'\{.*\}', re.S)
+
+# JSON-массив в ответе LLM: от первой "[" до последней "]"
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.S)
+
+# Ответы LLM длиннее этого (символов) разбираются в отдельном потоке
+JSON_THREAD_THRESHOLD = 64_000
+
+def _loads(raw: str) -> Any:
+    """Разбор JSON, через orjson если он установлен"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _extract_json(text: str) -> Dict[str, Any]:
+    """Разбор JSON-объекта из ответа LLM (пустой словарь, если его нет)"""
+    match = _JSON_RE.search(text) if text else None
+    if not match:
+        return {}
+    return _loads(match.group(0))
+
+async def _extract_json_async(text: str) -> Dict[str, Any]:
+    """_extract_json, для больших ответов - в потоке, чтобы не блокировать event loop"""
+    if text and len(text) > JSON_THREAD_THRESHOLD:
+        return await asyncio.to_thread(_extract_json, text)
+    return _extract_json(text)
+
+def _extract_json_array(text: str) -> List[Any]:
+    """Разбор JSON-массива из ответа LLM (пустой список, если его нет)"""
+    match = _JSON_ARRAY_RE.search(text) if text else None
+    if not match:
+        return []
+    parsed = _loads(match.group(0))
+    return parsed if isinstance(parsed, list) else []
+
+# Названия языков для промптов перевода
+_TRANSLATION_LANGUAGE_NAMES = {
+    'ru': 'русский',
+    'en': 'английский',
+    'de': 'немецкий',
+    'uk': 'украинский',
+    'es': 'испанский',
+    'fr': 'французский'
+}
+
+# Сколько вакансий переводится одним запросом к LLM
+TRANSLATION_BATCH_SIZE = 5
+
+# Инструкции перевода пачки вакансий: одинаковы для всех пачек на один язык
+_BATCH_TRANSLATION_INSTRUCTIONS = """Переведи информацию о вакансиях на {lang_name} язык.
+
+Верни результат в формате JSON-массива, по одному объекту на вакансию:
+[
+    {{
+        "index": номер вакансии,
+        "title": "переведенное название",
+        "company": "название компании",
+        "location": "локация",
+        "description": "переведенное описание",
+        "requirements": "переведенные требования",
+        "salary": "зарплата"
+    }}
+]
+
+Только JSON, без дополнительного текста."""
+
+# Слова текста вакансии для сравнения с навыками профиля
+_WORD_RE = re.compile(r'\w+')
+
+# Поля вакансии, которые читает анализ совместимости
+_JOB_ANALYSIS_FIELDS = ('title', 'location', 'description', 'requirements')
+
+def _job_content_key(job: Dict[str, Any]) -> bytes:
+    """Хэш полей вакансии из _JOB_ANALYSIS_FIELDS - ключ кэшей признаков и совместимости"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for field_name in _JOB_ANALYSIS_FIELDS:
+        hasher.update(str(job.get(field_name, '')).encode('utf-8'))
+        hasher.update(b'\0')
+    return hasher.digest()
+
+# Кэш ответов LLM на детерминированные запросы (переводы): размер в памяти и время жизни (секунды)
+LLM_CACHE_MAX_ENTRIES = 1024
+LLM_CACHE_TTL = 24 * 3600
+
+# Размер кэша демо-переводов (по языку и полям вакансии)
+DEMO_TRANSLATION_CACHE_SIZE = 256
+
+# Размер кэша AI-анализа ответов (по этапу и нормализованному ответу)
+ANALYSIS_CACHE_SIZE = 1024
+
+# Размер кэша признаков вакансий (по содержимому), общего для всех пользователей
+JOB_FEATURE_CACHE_SIZE = 512
+
+# Размер кэша результатов анализа совместимости (по профилю и вакансии)
+COMPATIBILITY_CACHE_SIZE = 4096
+
+# Сколько ходов истории хранить: первый и последние MAX_HISTORY - 1 (в памяти и в БД).
+# Промпт использует краткое изложение, счетчик всех ходов - history_length
+MAX_HISTORY = 8
+
+# Сколько живет заранее запущенный поиск вакансий (секунды)
+JOB_PREFETCH_TTL = 300.0
+
+# Кэш результатов поиска вакансий по (профессия, город, уровень): время жизни (секунды) и размер
+JOB_SEARCH_CACHE_TTL = 600.0
+JOB_SEARCH_CACHE_SIZE = 256
+
+# Язык вакансий из поиска (Bundesagentur für Arbeit): рекомендации на другом языке переводятся
+JOB_SEARCH_LANGUAGE = 'de'
+
+# Служебные ответы modern_llm_manager при недоступности провайдера - их не кэшируем
+_LLM_FALLBACK_PREFIXES = ('AI сервис недоступен', 'Демо анализ', '⚠️ Система работает')
+
+# =====================================================
+# КЛЮЧЕВЫЕ СЛОВА ДЛЯ ИЗВЛЕЧЕНИЯ ДАННЫХ ИЗ ОТВЕТОВ
+# =====================================================
+# В каждой таблице порядок задает приоритет: если в сообщении найдено
+# несколько вариантов, выбирается тот, что стоит раньше
+
+_GERMAN_LEVELS = {level: level.upper() for level in ['a1', 'a2', 'b1', 'b2', 'c1', 'c2']}
+
+# Уровень языка - отдельным словом ("B1", "b2-level"), а не частью слова или числа ("a100")
+_GERMAN_LEVEL_RE = re.compile(r'\b([abc][12])\b')
+
+# Числовое значение уровня для сравнения требований вакансии с уровнем кандидата
+_GERMAN_LEVEL_MAP = {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 6}
+
+# Город -> нормализованное название (расширенный список)
+_CITY_ALIASES = {
+    'berlin': 'Berlin', 'берлин': 'Berlin',
+    'münchen': 'München', 'мюнхен': 'München', 'munich': 'München',
+    'hamburg': 'Hamburg', 'гамбург': 'Hamburg',
+    'köln': 'Köln', 'кёльн': 'Köln', 'cologne': 'Köln',
+    'frankfurt': 'Frankfurt', 'франкфурт': 'Frankfurt',
+    'düsseldorf': 'Düsseldorf', 'дюссельдорф': 'Düsseldorf',
+    'stuttgart': 'Stuttgart', 'штутгарт': 'Stuttgart',
+    'leipzig': 'Leipzig', 'лейпциг': 'Лейпциг',
+    'dresden': 'Dresden', 'дрезден': 'Дрезден',
+    'hannover': 'Hannover', 'ганновер': 'Ганновер',
+    'nürnberg': 'Nürnberg', 'нюрнберг': 'Нюрнберг', 'nuremberg': 'Nuremberg'
+}
+
+# Поиск профессии (значительно расширенный список)
+_PROFESSION_PATTERNS = {
+    'developer': ['developer', 'разработчик', 'программист', 'dev', 'coder'],
+    'python developer': ['python', 'пайтон'],
+    'frontend developer': ['frontend', 'фронтенд', 'react', 'vue', 'angular'],
+    'backend developer': ['backend', 'бэкенд', 'бекенд'],
+    'fullstack developer': ['fullstack', 'фуллстек', 'full stack', 'full-stack'],
+    'data scientist': ['data scientist', 'дата саентист', 'аналитик данных'],
+    'designer': ['designer', 'дизайнер', 'ui', 'ux'],
+    'manager': ['manager', 'менеджер', 'project manager', 'проект-менеджер'],
+    'qa engineer': ['qa', 'тестировщик', 'quality', 'tester'],
+    'devops': ['devops', 'девопс', 'infrastructure', 'инфраструктура'],
+    'engineer': ['engineer', 'инженер'],
+    'analyst': ['analyst', 'аналитик'],
+    'consultant': ['consultant', 'консультант'],
+    'marketing': ['marketing', 'маркетинг', 'маркетолог'],
+    'sales': ['sales', 'продажи', 'менеджер по продажам']
+}
+
+# Отдельные слова, если точная профессия не найдена
+_PROFESSION_WORDS = frozenset([
+    'developer', 'разработчик', 'программист', 'manager', 'менеджер',
+    'designer', 'дизайнер', 'analyst', 'аналитик', 'specialist', 'специалист'
+])
+
+# Расширенный поиск технических навыков
+_TECH_SKILLS = {
+    'python': ['python', 'пайтон', 'питон'],
+    'javascript': ['javascript', 'js', 'джаваскрипт'],
+    'java': ['java', 'джава'],
+    'react': ['react', 'реакт'],
+    'vue': ['vue', 'vue.js'],
+    'angular': ['angular', 'ангуляр'],
+    'node.js': ['node', 'node.js', 'nodejs'],
+    'django': ['django', 'джанго'],
+    'flask': ['flask', 'фласк'],
+    'docker': ['docker', 'докер'],
+    'kubernetes': ['kubernetes', 'k8s', 'кубернетес'],
+    'postgresql': ['postgresql', 'postgres', 'постгрес'],
+    'mysql': ['mysql', 'майсквл'],
+    'mongodb': ['mongodb', 'mongo'],
+    'redis': ['redis', 'редис'],
+    'git': ['git', 'гит'],
+    'aws': ['aws', 'amazon'],
+    'linux': ['linux', 'линукс'],
+    'sql': ['sql', 'эсквл'],
+    'html': ['html'],
+    'css': ['css'],
+    'typescript': ['typescript', 'ts'],
+    'c++': ['c++', 'cpp'],
+    'c#': ['c#', 'csharp'],
+    'php': ['php', 'пхп'],
+    'go': ['golang', 'go'],
+    'rust': ['rust', 'раст'],
+    'kotlin': ['kotlin', 'котлин'],
+    'swift': ['swift', 'свифт']
+}
+
+_EDUCATION_KEYWORDS = ['университет', 'институт', 'university', 'degree', 'диплом', 'образование', 'магистр', 'бакалавр']
+
+_WORK_FORMAT_KEYWORDS = {
+    'remote': ['remote', 'удаленно', 'удаленная', 'дистанционно', 'из дома', 'home office'],
+    'office': ['office', 'офис', 'офисе', 'на месте', 'очно'],
+    'hybrid': ['hybrid', 'гибрид', 'смешанный', 'частично удаленно']
+}
+
+_EMPLOYMENT_KEYWORDS = {
+    'full_time': ['полный день', 'full time', 'fulltime', 'полная занятость', 'фулл тайм'],
+    'part_time': ['частичная занятость', 'part time', 'parttime', 'неполный день'],
+    'contract': ['контракт', 'contract', 'подряд', 'фриланс', 'freelance'],
+    'internship': ['стажировка', 'internship', 'intern', 'практика']
+}
+
+_COMPANY_SIZE_KEYWORDS = {
+    'startup': ['стартап', 'startup', 'молодая компания', 'небольшая компания'],
+    'small': ['малая', 'маленькая', 'small company', 'до 50'],
+    'medium': ['средняя', 'medium', 'средний размер', '50-500'],
+    'large': ['большая', 'крупная', 'large', 'корпорация', 'более 500']
+}
+
+# Паттерны для поиска лет опыта
+_EXPERIENCE_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(\d+)\s*(?:год|лет|года)',
+    r'(\d+)\s*years?',
+    r'(\d+)\s*лет\s*опыта',
+    r'опыт\s*(\d+)',
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'
+]]
+
+# Паттерны для поиска зарплатных ожиданий
+_SALARY_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(\d+)\s*(?:000)?\s*(?:-|до|to)\s*(\d+)\s*(?:000)?\s*(?:евро|euro|eur|€)',
+    r'от\s*(\d+)\s*(?:000)?\s*до\s*(\d+)\s*(?:000)?\s*(?:евро|euro|eur|€)',
+    r'(\d+)\s*(?:к|k|тысяч)\s*(?:-|до|to)\s*(\d+)\s*(?:к|k|тысяч)',
+    r'зарплата\s*(\d+)',
+    r'salary\s*(\d+)'
+]]
+
+# Паттерны для поиска требуемого уровня немецкого в тексте вакансии (порядок - приоритет)
+_JOB_GERMAN_LEVEL_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'german.*?([abc][12])',
+    r'deutsch.*?([abc][12])',
+    r'([abc][12]).*german',
+    r'([abc][12]).*deutsch'
+]]
+
+# Паттерны для поиска требуемого опыта в тексте вакансии
+_JOB_EXPERIENCE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+    r'(\d+)\+?\s*jahre?\s*erfahrung',
+    r'experience.*?(\d+)\+?\s*years?',
+    r'minimum.*?(\d+)\+?\s*years?'
+]]
+
+# Соседние города для оценки локации: (крупный город, города рядом)
+_NEARBY_CITIES = (
+    ('berlin', ('potsdam', 'brandenburg')),
+    ('munich', ('münchen', 'augsburg')),
+    ('hamburg', ('bremen', 'lübeck')),
+    ('frankfurt', ('mainz', 'darmstadt', 'wiesbaden')),
+    ('cologne', ('köln', 'düsseldorf', 'bonn')),
+    ('stuttgart', ('karlsruhe', 'heilbronn'))
+)
+# Симметричные пары точных названий (отсортированы) для проверки одним хешированием
+_NEARBY_CITY_PAIRS = frozenset(
+    tuple(sorted((main_city, city)))
+    for main_city, nearby in _NEARBY_CITIES
+    for city in nearby
+)
+
+# Категории данных, которые ищутся на каждом этапе
+_STAGE_KEYWORD_CATEGORIES = {
+    'initial': frozenset(['german_level', 'preferred_city', 'profession']),
+    'skills': frozenset(['technical_skills', 'has_education']),
+    'preferences': frozenset(['work_format', 'employment_type', 'company_size_preference'])
+}
+
+# Промпт AI-анализа ответа пользователя (форматируется только он, без сборки в методе)
+_ANALYSIS_PROMPT_TEMPLATE = """Проанализируй ответ пользователя и извлеки структурированную информацию.
+        
+Этап: {stage}
+Ответ пользователя: "{user_message}"
+
+Верни JSON с найденной информацией. Например:
+{{"profession": "Software Developer", "german_level": "B1", "city": "Berlin", "experience": "3 years"}}
+
+Только JSON, без дополнительного текста:"""
+
+# Поля, при наличии которых ответ этапа считается распознанным без LLM
+_STAGE_REQUIRED_FIELDS = {
+    'initial': frozenset(['profession', 'preferred_city']),
+    'skills': frozenset(['technical_skills']),
+    'preferences': frozenset(['work_format'])
+}
+
+def _build_keyword_entries() -> Dict[str, Tuple[Tuple[str, Any, int], ...]]:
+    """Ключевое слово -> кортеж (категория, каноническое значение, приоритет)"""
+    entries: Dict[str, List[Tuple[str, Any, int]]] = {}
+    
+    def add(category: str, keyword: str, canonical: Any, priority: int):
+        entries.setdefault(keyword, []).append((category, canonical, priority))
+    
+    for priority, (keyword, city) in enumerate(_CITY_ALIASES.items()):
+        add('preferred_city', keyword, city, priority)
+    for priority, keyword in enumerate(_EDUCATION_KEYWORDS):
+        add('has_education', keyword, True, priority)
+    
+    grouped_tables = [
+        ('profession', _PROFESSION_PATTERNS),
+        ('technical_skills', _TECH_SKILLS),
+        ('work_format', _WORK_FORMAT_KEYWORDS),
+        ('employment_type', _EMPLOYMENT_KEYWORDS),
+        ('company_size_preference', _COMPANY_SIZE_KEYWORDS)
+    ]
+    for category, table in grouped_tables:
+        for priority, (canonical, keywords) in enumerate(table.items()):
+            for keyword in keywords:
+                add(category, keyword, canonical, priority)
+    
+    return {keyword: tuple(values) for keyword, values in entries.items()}
+
+_KEYWORD_ENTRIES = _build_keyword_entries()
+
+# Ключевые слова каждого этапа только с его категориями: на ходу ищется лишь то,
+# что этап может извлечь, и совпадения не нужно фильтровать по категории
+_STAGE_KEYWORD_ENTRIES = {
+    stage: {
+        keyword: matched
+        for keyword, entries in _KEYWORD_ENTRIES.items()
+        for matched in [tuple(entry for entry in entries if entry[0] in categories)]
+        if matched
+    }
+    for stage, categories in _STAGE_KEYWORD_CATEGORIES.items()
+}
+
+def _build_keyword_regex(entries: Dict[str, Tuple[Tuple[str, Any, int], ...]]):
+    """Запасной вариант без pyahocorasick: (регулярка, ключевое слово -> записи с префиксами)
+    
+    Одна регулярка с альтернацией всех ключевых слов. Lookahead дает совпадение в каждой
+    позиции (самое длинное слово), а слова, которые являются его префиксами, добавляются
+    из таблицы - так находятся все вхождения.
+    """
+    pattern = re.compile(
+        '(?=(' + '|'.join(re.escape(keyword) for keyword in sorted(entries, key=len, reverse=True)) + '))'
+    )
+    prefix_entries = {
+        keyword: tuple(
+            entry
+            for prefix, prefix_matched in entries.items() if keyword.startswith(prefix)
+            for entry in prefix_matched
+        )
+        for keyword in entries
+    }
+    return pattern, prefix_entries
+
+_STAGE_KEYWORD_RE = {stage: _build_keyword_regex(entries) for stage, entries in _STAGE_KEYWORD_ENTRIES.items()}
+
+def _build_keyword_automaton(entries: Dict[str, Tuple[Tuple[str, Any, int], ...]]):
+    """Автомат Ахо-Корасик по ключевым словам (None без pyahocorasick)"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, matched in entries.items():
+        automaton.add_word(keyword, matched)
+    automaton.make_automaton()
+    return automaton
+
+# Неизменные инструкции для каждого этапа интервью. Они уходят системным сообщением
+# перед данными разговора и побайтно совпадают между ходами, поэтому провайдеры
+# могут кэшировать этот префикс
+_STAGE_INSTRUCTIONS = {
+    'ru': {
+        'initial': """Ты - профессиональный AI-рекрутер, который помогает найти идеальную работу в Германии.
+
+Твоя задача - провести короткое интервью (максимум 3-5 вопросов) чтобы узнать:
+- Какую работу ищет человек
+- Какой у него опыт и навыки
+- Где хочет работать
+- Уровень немецкого языка
+
+Будь дружелюбным, профессиональным и эффективным. НЕ говори "Здравствуйте" повторно.""",
+        
+        'skills': """Ты - профессиональный AI-рекрутер. Продолжи интервью.
+
+Теперь узнай подробности о навыках и опыте работы. Задай ОДИН конкретный вопрос.""",
+        
+        'preferences': """Ты - профессиональный AI-рекрутер. Продолжи интервью.
+
+Теперь узнай предпочтения по работе (зарплата, график, компания). Задай ОДИН конкретный вопрос.""",
+        
+        'complete': """Ты - профессиональный AI-рекрутер. Интервью завершено!
+
+Поблагодари пользователя и скажи, что начинаешь поиск идеальных вакансий специально для него."""
+    },
+    'en': {
+        'initial': """You are a professional AI recruiter helping find the perfect job in Germany.
+
+Your task is to conduct a short interview (maximum 3-5 questions) to learn:
+- What job they're looking for
+- Their experience and skills
+- Where they want to work
+- German language level
+
+Be friendly, professional, and efficient. DON'T say "Hello" repeatedly.""",
+        
+        'skills': """You are a professional AI recruiter. Continue the interview.
+
+Now learn details about skills and work experience. Ask ONE specific question.""",
+        
+        'preferences': """You are a professional AI recruiter. Continue the interview.
+
+Now learn work preferences (salary, schedule, company). Ask ONE specific question.""",
+        
+        'complete': """You are a professional AI recruiter. Interview completed!
+
+Thank the user and say you're starting to search for perfect job opportunities specifically for them."""
+    }
+}
+
+# Подписи для изменяемой части промпта
+_DYNAMIC_LABELS = {
+    'ru': {
+        'collected': 'Уже собрано',
+        'user': 'Пользователь ответил',
+        'answer': 'Твой ответ (на русском языке):'
+    },
+    'en': {
+        'collected': 'Already collected',
+        'user': 'User responded',
+        'answer': 'Your response (in English):'
+    }
+}
+
+def _build_suffix_templates() -> Dict[Tuple[str, bool, bool], str]:
+    """Шаблоны изменяемой части промпта по (язык, есть собранные данные, есть ответ пользователя)"""
+    templates = {}
+    for language, labels in _DYNAMIC_LABELS.items():
+        for has_collected in (False, True):
+            for has_user_message in (False, True):
+                parts = ["{history_summary}"]
+                if has_collected:
+                    parts.append(f"{labels['collected']}: {{collected_data}}")
+                if has_user_message:
+                    parts.append(f'{labels["user"]}: "{{user_message}}"')
+                parts.append(labels['answer'])
+                templates[(language, has_collected, has_user_message)] = sys.intern("\n\n".join(parts))
+    return templates
+
+# Шаблоны строятся один раз при импорте; на ходу форматируется только выбранный
+_SUFFIX_TEMPLATES = MappingProxyType(_build_suffix_templates())
+
+# Системные промпты по (язык, этап), собираются один раз при импорте
+_SYSTEM_PROMPTS = MappingProxyType({
+    (language, stage): sys.intern(text)
+    for language, stages in _STAGE_INSTRUCTIONS.items()
+    for stage, text in stages.items()
+})
+
+_DEFAULT_SYSTEM_PROMPT = _SYSTEM_PROMPTS[('ru', 'initial')]
+
+def _static_system_prompt(language: str, stage: str) -> str:
+    """Системные инструкции для этапа (один и тот же объект строки на каждом ходу)"""
+    prompt = _SYSTEM_PROMPTS.get((language, stage))
+    if prompt is None:
+        # Неизвестный язык - русские инструкции этапа, неизвестный этап - начальные
+        prompt = _SYSTEM_PROMPTS.get(('ru', stage), _DEFAULT_SYSTEM_PROMPT)
+    return prompt
+
+# Краткое изложение истории: нет сообщений, одно сообщение, несколько (шаблон)
+_HISTORY_SUMMARIES = (
+    "Разговор только начинается.",
+    "Это первое взаимодействие с пользователем.",
+    "Уже было {n} сообщений. Предыдущие ответы пользователя учтены."
+)
+
+def _history_summary(history_length: int) -> str:
+    """Краткое изложение истории разговора по количеству сообщений"""
+    if history_length > 1:
+        return _HISTORY_SUMMARIES[2].format(n=history_length)
+    return _HISTORY_SUMMARIES[1 if history_length == 1 else 0]
+
+def _compact_collected(collected_data: Dict[str, Any]) -> str:
+    """Собранные данные для промпта: "ключ: значение" без кавычек и скобок repr словаря"""
+    parts = []
+    for key, value in collected_data.items():
+        if value is None or value == '' or value == []:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ', '.join(str(item) for item in value)
+        parts.append(f"{key}: {value}")
+    return '; '.join(parts)
+
+def _dynamic_suffix(collected_data: Dict[str, Any],
+                    user_message: Optional[str],
+                    history_summary: str,
+                    language: str) -> str:
+    """Данные текущего хода, которые идут после системных инструкций"""
+    collected = _compact_collected(collected_data) if collected_data else ''
+    has_collected = bool(collected)
+    has_user_message = user_message is not None
+    template = _SUFFIX_TEMPLATES.get((language, has_collected, has_user_message))
+    if template is None:
+        template = _SUFFIX_TEMPLATES[('ru', has_collected, has_user_message)]
+    return template.format(
+        history_summary=history_summary,
+        collected_data=collected,
+        user_message=user_message
+    )
+
+# =====================================================
+# ТЕКСТЫ ОТВЕТОВ ПО УМОЛЧАНИЮ
+# =====================================================
+# Неизменяемые таблицы строятся один раз при импорте; методы только читают их
+
+def _intern_key(value: Any) -> Any:
+    """Интернирование кода языка или этапа из запроса или БД
+    
+    Ключи таблиц ниже - литералы, они интернированы компилятором. Интернированный
+    ключ поиска совпадает с ними по указателю, и dict не сравнивает строки посимвольно.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+# Первое сообщение, если LLM недоступен
+_FALLBACK_MESSAGES = MappingProxyType({
+    'ru': "Привет! Я AI-рекрутер, помогу найти идеальную работу в Германии. Расскажи, какую работу ищешь?",
+    'en': "Hi! I'm an AI recruiter, I'll help find the perfect job in Germany. Tell me what job you're looking for?",
+    'de': "Hallo! Ich bin ein AI-Recruiter und helfe dir den perfekten Job in Deutschland zu finden. Erzähl mir, welchen Job du suchst?"
+})
+
+# Сообщения для каждого этапа интервью, если LLM недоступен
+_STAGE_MESSAGES = MappingProxyType({
+    'ru': MappingProxyType({
+        'initial': """👋 Привет! Я AI-рекрутер и помогу найти идеальную работу в Германии. 
+
+Расскажи мне:
+• Какую должность ищешь? (например: разработчик, дизайнер, маркетолог)
+• В каком городе хочешь работать?
+• Какой у тебя уровень немецкого языка? (A1-C2)
+
+Начни с любого пункта! 🚀""",
+        
+        'skills': """💼 Отлично! Теперь расскажи о своем опыте:
+
+• Сколько лет работаешь в этой сфере?
+• Какие технологии/инструменты знаешь?
+• Есть ли образование или сертификаты?
+• Какие проекты реализовывал?
+
+Чем подробнее - тем лучше подберу вакансии! ⚡""",
+        
+        'preferences': """⚙️ Почти готово! Последние детали:
+
+• Какая зарплата интересна? (от ... до ... EUR)
+• Готов работать полный день или предпочитаешь частичную занятость?
+• Интересует удаленная работа или только офис?
+• Есть предпочтения по размеру компании? (стартап/корпорация)
+
+После этого найду идеальные варианты! 🎯""",
+        
+        'complete': """🎉 Профиль готов! Сейчас ищу лучшие вакансии...
+
+На основе твоих данных я найду:
+✅ Вакансии с подходящими требованиями
+✅ Позиции в выбранном городе
+✅ Работу с нужным уровнем немецкого
+✅ Соответствующую зарплатную вилку
+
+Также могу:
+🔄 Перевести любую вакансию на русский
+📊 Проанализировать совместимость
+✍️ Составить сопроводительное письмо
+
+Вот что нашел для тебя:"""
+    }),
+    'en': MappingProxyType({
+        'initial': """👋 Hi! I'm an AI recruiter helping find perfect jobs in Germany.
+
+Tell me:
+• What position are you looking for? (e.g., developer, designer, marketer)
+• Which city would you like to work in?
+• What's your German level? (A1-C2)
+
+Start with any point! 🚀""",
+        
+        'skills': """💼 Great! Now tell me about your experience:
+
+• How many years have you worked in this field?
+• What technologies/tools do you know?
+• Do you have education or certifications?
+• What projects have you implemented?
+
+The more details, the better I can match jobs! ⚡""",
+        
+        'preferences': """⚙️ Almost ready! Final details:
+
+• What salary range interests you? (from ... to ... EUR)
+• Full-time or part-time preference?
+• Interested in remote work or office only?
+• Company size preference? (startup/corporation)
+
+After this, I'll find perfect matches! 🎯""",
+        
+        'complete': """🎉 Profile ready! Searching for best jobs...
+
+Based on your data, I'll find:
+✅ Jobs matching your requirements
+✅ Positions in your chosen city
+✅ Work with your German level
+✅ Matching salary range
+
+I can also:
+🔄 Translate any job to English
+📊 Analyze compatibility
+✍️ Create cover letters
+
+Here's what I found for you:"""
+    }),
+    'de': MappingProxyType({
+        'initial': """👋 Hallo! Ich bin ein AI-Recruiter und helfe bei der Jobsuche in Deutschland.
+
+Erzähl mir:
+• Welche Position suchst du? (z.B. Entwickler, Designer, Marketer)
+• In welcher Stadt möchtest du arbeiten?
+• Wie ist dein Deutschniveau? (A1-C2)
+
+Fang mit einem Punkt an! 🚀""",
+        
+        'skills': """💼 Toll! Jetzt erzähl von deiner Erfahrung:
+
+• Wie viele Jahre Berufserfahrung hast du?
+• Welche Technologien/Tools beherrschst du?
+• Hast du Ausbildung oder Zertifikate?
+• Welche Projekte hast du umgesetzt?
+
+Je mehr Details, desto besser kann ich Jobs finden! ⚡""",
+        
+        'preferences': """⚙️ Fast fertig! Letzte Details:
+
+• Welches Gehalt stellst du dir vor? (von ... bis ... EUR)
+• Vollzeit oder Teilzeit?
+• Remote-Arbeit oder nur Büro?
+• Präferenz für Unternehmensgröße? (Startup/Konzern)
+
+Danach finde ich perfekte Stellen! 🎯""",
+        
+        'complete': """🎉 Profil fertig! Suche beste Jobs...
+
+Basierend auf deinen Daten finde ich:
+✅ Jobs mit passenden Anforderungen
+✅ Stellen in deiner gewählten Stadt
+✅ Arbeit mit deinem Deutschniveau
+✅ Passende Gehaltsvorstellungen
+
+Ich kann auch:
+🔄 Jobs ins Deutsche übersetzen
+📊 Kompatibilität analysieren
+✍️ Anschreiben erstellen
+
+Hier ist was ich für dich gefunden habe:"""
+    })
+})
+
+# Те же сообщения одной плоской таблицей: (язык, этап) -> текст.
+# Тексты интернированы: каждое сообщение существует в одном экземпляре,
+# и возвращенные строки можно сравнивать через `is`
+_STAGE_MESSAGES_FLAT = MappingProxyType({
+    (language, stage): sys.intern(message)
+    for language, messages in _STAGE_MESSAGES.items()
+    for stage, message in messages.items()
+})
+
+# Ответ по умолчанию (неизвестный язык или этап) - заранее связанное имя,
+# чтобы не искать его в таблице при каждом вызове
+_DEFAULT_STAGE_MESSAGE = _STAGE_MESSAGES_FLAT[('ru', 'initial')]
+
+# Сообщение о завершении интервью
+_COMPLETION_MESSAGES = MappingProxyType({
+    'ru': """🎉 Отлично! Ваш профиль готов!
+
+Теперь я могу предложить вам:
+
+🎯 **ПЕРСОНАЛЬНЫЕ РЕКОМЕНДАЦИИ ВАКАНСИЙ**
+• Подобрал лучшие варианты под ваш профиль
+• Проанализировал совместимость с каждой позицией
+• Указал конкретные шаги для каждой вакансии
+
+💡 **ДОПОЛНИТЕЛЬНЫЕ ВОЗМОЖНОСТИ:**
+🔄 **Перевод вакансий** - переведу любую вакансию на русский
+📊 **Анализ совместимости** - детальный разбор ваших шансов
+✍️ **Сопроводительные письма** - составлю для каждой вакансии
+📝 **Улучшение резюме** - подскажу как адаптировать под вакансию
+
+⭐ Вот лучшие вакансии специально для вас:""",
+    
+    'en': """🎉 Excellent! Your profile is ready!
+
+Now I can offer you:
+
+🎯 **PERSONALIZED JOB RECOMMENDATIONS**
+• Selected best matches for your profile
+• Analyzed compatibility with each position
+• Provided specific action steps for each job
+
+💡 **ADDITIONAL FEATURES:**
+🔄 **Job Translation** - translate any job to English
+📊 **Compatibility Analysis** - detailed breakdown of your chances
+✍️ **Cover Letters** - create personalized letters for each job
+📝 **Resume Improvement** - advice on adapting to specific jobs
+
+⭐ Here are the best jobs specifically for you:""",
+    
+    'de': """🎉 Ausgezeichnet! Ihr Profil ist fertig!
+
+Jetzt kann ich Ihnen anbieten:
+
+🎯 **PERSONALISIERTE STELLENEMPFEHLUNGEN**
+• Beste Übereinstimmungen für Ihr Profil ausgewählt
+• Kompatibilität mit jeder Position analysiert
+• Spezifische Handlungsschritte für jede Stelle bereitgestellt
+
+💡 **ZUSÄTZLICHE FUNKTIONEN:**
+🔄 **Stellenübersetzung** - übersetze jede Stelle ins Deutsche
+📊 **Kompatibilitätsanalyse** - detaillierte Aufschlüsselung Ihrer Chancen
+✍️ **Anschreiben** - erstelle personalisierte Briefe für jede Stelle
+📝 **Lebenslauf-Verbesserung** - Ratschläge zur Anpassung an spezifische Jobs
+
+⭐ Hier sind die besten Jobs speziell für Sie:"""
+})
+
+# Демо-перевод: переводы распространенных должностей и городов
+_RU_TITLE_TRANSLATIONS = MappingProxyType({
+    'software developer': 'Разработчик ПО',
+    'full stack developer': 'Fullstack разработчик',
+    'frontend developer': 'Frontend разработчик',
+    'backend developer': 'Backend разработчик',
+    'data scientist': 'Специалист по данным',
+    'project manager': 'Проект-менеджер',
+    'ui/ux designer': 'UI/UX дизайнер',
+    'marketing manager': 'Менеджер по маркетингу',
+    'sales manager': 'Менеджер по продажам'
+})
+
+_RU_CITY_TRANSLATIONS = MappingProxyType({
+    'berlin': 'Берлин',
+    'munich': 'Мюнхен',
+    'hamburg': 'Гамбург',
+    'frankfurt': 'Франкфурт',
+    'cologne': 'Кёльн',
+    'stuttgart': 'Штутгарт'
+})
+
+_DE_TITLE_TRANSLATIONS = MappingProxyType({
+    'software developer': 'Softwareentwickler',
+    'full stack developer': 'Fullstack-Entwickler',
+    'frontend developer': 'Frontend-Entwickler',
+    'backend developer': 'Backend-Entwickler',
+    'project manager': 'Projektmanager',
+    'designer': 'Designer'
+})
+
+# Демо-перевод в JSON: то же, что json.dumps(..., ensure_ascii=False, indent=2)
+# для плоского словаря с этими полями
+_DEMO_JSON_TEMPLATE = """{{
+  "title": {title},
+  "company": {company},
+  "location": {location},
+  "description": {description},
+  "requirements": {requirements},
+  "salary": {salary},
+  "translation_note": {translation_note}
+}}"""
+
+def _json_value(value: Any) -> str:
+    """JSON-представление одного значения для _DEMO_JSON_TEMPLATE, через orjson если он установлен"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            # orjson.JSONEncodeError (нестроковые ключи, одиночные суррогаты) - через json
+            pass
+    return json.dumps(value, ensure_ascii=False)
+
+# Демо-перевод: значения полей, которых нет в вакансии
+_DEMO_JOB_DEFAULTS = MappingProxyType({
+    'title': 'Software Developer',
+    'company': 'Tech Company',
+    'location': 'Berlin, Germany',
+    'description': 'Interesting software development position',
+    'requirements': 'Programming experience required',
+    'salary': 'Competitive salary'
+})
+
+# Поля демо-перевода одним вызовом в порядке _DEMO_JOB_DEFAULTS
+_demo_job_fields = operator.itemgetter(*_DEMO_JOB_DEFAULTS)
+
+# Демо-перевод: оформление описания и требований ({description}, {requirements},
+# {company} подставляются из вакансии)
+_DEMO_TRANSLATION_TEMPLATES = MappingProxyType({
+    'ru': MappingProxyType({
+        'description': """📋 Описание позиции:
+{description}
+
+🏢 О компании: {company} - динамично развивающаяся компания в сфере технологий.
+
+🎯 Что предлагаем:
+• Конкурентоспособная зарплата
+• Возможность профессионального роста
+• Современные технологии и инструменты
+• Дружный коллектив профессионалов""",
+        
+        'requirements': """✅ Требования:
+{requirements}
+
+📚 Будет плюсом:
+• Опыт работы в команде
+• Знание современных методологий разработки
+• Желание изучать новые технологии"""
+    }),
+    'en': MappingProxyType({
+        'description': """📋 Position Description:
+{description}
+
+🏢 About Company: {company} - rapidly growing technology company.
+
+🎯 What we offer:
+• Competitive salary package
+• Professional growth opportunities
+• Modern technologies and tools
+• Friendly team of professionals""",
+        
+        'requirements': """✅ Requirements:
+{requirements}
+
+📚 Nice to have:
+• Team collaboration experience
+• Knowledge of modern development methodologies
+• Willingness to learn new technologies"""
+    }),
+    'de': MappingProxyType({
+        'description': """📋 Stellenbeschreibung:
+{description}
+
+🏢 Über das Unternehmen: {company} - dynamisch wachsendes Technologieunternehmen.
+
+🎯 Was wir bieten:
+• Wettbewerbsfähiges Gehalt
+• Berufliche Entwicklungsmöglichkeiten
+• Moderne Technologien und Tools
+• Freundliches Profi-Team""",
+        
+        'requirements': """✅ Anforderungen:
+{requirements}
+
+📚 Von Vorteil:
+• Teamarbeit-Erfahrung
+• Kenntnisse moderner Entwicklungsmethoden
+• Lernbereitschaft für neue Technologien"""
+    })
+})
+
+_DEFAULT_DEMO_TRANSLATION_TEMPLATES = _DEMO_TRANSLATION_TEMPLATES['en']
+
+# Номер языка в кортежах сообщений ниже; неизвестный язык - 0 (русский)
+_LANGUAGE_INDEX = MappingProxyType({'ru': 0, 'en': 1, 'de': 2})
+
+# Сообщения без вложенного выбора по этапу - кортежи в порядке _LANGUAGE_INDEX
+# (интернированы, как и _STAGE_MESSAGES_FLAT)
+_FALLBACK_MESSAGES_BY_INDEX = tuple(sys.intern(_FALLBACK_MESSAGES[language]) for language in _LANGUAGE_INDEX)
+_COMPLETION_MESSAGES_BY_INDEX = tuple(sys.intern(_COMPLETION_MESSAGES[language]) for language in _LANGUAGE_INDEX)
+
+def _fallback_message(language: str) -> str:
+    """Fallback сообщение"""
+    return _FALLBACK_MESSAGES_BY_INDEX[_LANGUAGE_INDEX.get(language, 0)]
+
+def _fallback_message_for_stage(stage: str, language: str) -> str:
+    """Улучшенные fallback сообщения для каждого этапа"""
+    # Известные язык и этап - одна проба плоской таблицы; иначе тот же этап
+    # на русском, затем начальное сообщение
+    return (_STAGE_MESSAGES_FLAT.get((language, stage))
+            or _STAGE_MESSAGES_FLAT.get(('ru', stage), _DEFAULT_STAGE_MESSAGE))
+
+def _completion_message(language: str) -> str:
+    """Улучшенное сообщение о завершении"""
+    return _COMPLETION_MESSAGES_BY_INDEX[_LANGUAGE_INDEX.get(language, 0)]
+
+@dataclass(slots=True)
+class CategoryResult:
+    """Результат анализа одной категории совместимости (локация, навыки, язык...)"""
+    max_score: int
+    score: int = 0
+    strengths: List[str] = field(default_factory=list)
+    concerns: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Категория в формате ответа (списки не копируются)"""
+        return {
+            'score': self.score,
+            'max_score': self.max_score,
+            'strengths': self.strengths,
+            'concerns': self.concerns,
+            'recommendations': self.recommendations
+        }
+
 class AdvancedAIRecruiter:
     def __init__(self, database):
         self.db = database
-        self.job_search_service = JobSearchService()
-        self.cities_service = GermanCitiesService()
+        
+        # Ключевые слова этапа ищутся одним проходом его автомата
+        self._kw_automata = {
+            stage: _build_keyword_automaton(entries) for stage, entries in _STAGE_KEYWORD_ENTRIES.items()
+        }
+        
+        # LRU кэш ответов LLM на переводы: ключ -> (время записи, ответ);
+        # дублируется в БД между процессами
+        self._llm_cache: OrderedDict = OrderedDict()
+        
+        # Поиск вакансий, запущенный заранее на этапе предпочтений:
+        # user_id -> (параметры поиска, задача, время запуска)
+        self._job_prefetch: Dict[str, Tuple[Dict[str, Any], asyncio.Task, float]] = {}
+        
+        # Кэш результатов поиска: параметры -> (время поиска, результат)
+        self._job_search_cache: OrderedDict = OrderedDict()
+        
+        # LRU кэш признаков вакансий: хэш полей вакансии -> текст, слова, требования
+        self._job_feature_cache: OrderedDict = OrderedDict()
+        
+        # LRU кэш анализа совместимости: (хэш профиля, хэш полей вакансии) -> анализ
+        self._compatibility_cache: OrderedDict = OrderedDict()
+        
+        # LRU кэш демо-переводов: (язык, поля вакансии) -> JSON
+        self._demo_translation_cache: OrderedDict = OrderedDict()
+        
+        # LRU кэш AI-анализа ответов: хэш (этап, ответ) -> извлеченные данные.
+        # Частые ответы ("Berlin, B1, Python developer") совпадают у разных пользователей
+        self._analysis_cache: OrderedDict = OrderedDict()
         
         # Этапы разговора - сокращены для быстроты
         self.stages = {
@@ -44,6 +1005,16 @@ class AdvancedAIRecruiter:
             'fr': 'français'
         }
     
+    @functools.cached_property
+    def job_search_service(self) -> JobSearchService:
+        """Сервис поиска вакансий (создается при первом поиске)"""
+        return JobSearchService()
+    
+    @functools.cached_property
+    def cities_service(self) -> GermanCitiesService:
+        """Сервис немецких городов (создается при первом обращении)"""
+        return GermanCitiesService()
+    
     async def start_conversation(self,
                                 user_id: str,
                                 user_language: str = 'ru',
@@ -54,14 +1025,16 @@ class AdvancedAIRecruiter:
         try:
             logger.info(f"Starting advanced AI recruiter for user {user_id}")
             
+            user_language = _intern_key(user_language)
+            
             # Проверяем существующий профиль
-            existing_profile = await self.db.get_ai_recruiter_profile(user_id)
+            existing_profile = await self._get_profile(user_id)
             
             if existing_profile:
                 # Возобновляем разговор
                 return await self._resume_conversation(existing_profile, user_language, user_providers)
             
-            # Создаем новый профиль
+            # Создаем новый профиль (его время создания - время первого хода)
             profile = self._create_initial_profile(user_id, user_language)
             
             # Генерируем первое сообщение
@@ -70,12 +1043,14 @@ class AdvancedAIRecruiter:
             )
             
             # Обновляем профиль
-            profile['conversation_history'].append({
-                'timestamp': datetime.now().isoformat(),
+            turn = {
+                'timestamp': profile['created_at'],
                 'stage': 'initial',
                 'ai_message': ai_message,
                 'user_message': None
-            })
+            }
+            profile['conversation_history'].append(turn)
+            self._update_summary(profile, turn)
             
             # Сохраняем в базу
             await self.db.save_ai_recruiter_profile(user_id, profile)
@@ -84,7 +1059,7 @@ class AdvancedAIRecruiter:
                 'status': 'success',
                 'stage': 'initial',
                 'ai_message': ai_message,
-                'profile': profile,
+                'profile': self._profile_view(profile),
                 'progress': 0,
                 'is_complete': False
             }
@@ -94,7 +1069,7 @@ class AdvancedAIRecruiter:
             return {
                 'status': 'error',
                 'message': f'Ошибка запуска AI-рекрутера: {str(e)}',
-                'fallback_message': self._get_fallback_message(user_language)
+                'fallback_message': _fallback_message(user_language)
             }
     
     async def continue_conversation(self,
@@ -107,63 +1082,20 @@ class AdvancedAIRecruiter:
         try:
             logger.info(f"Continuing conversation for user {user_id}")
             
-            # Получаем профиль
-            profile = await self.db.get_ai_recruiter_profile(user_id)
-            if not profile:
-                return {
-                    'status': 'error',
-                    'message': 'Профиль не найден. Начните разговор заново.',
-                    'restart_required': True
-                }
-            
-            # Анализируем ответ пользователя
-            extracted_data = await self._analyze_user_response(
-                user_message, profile, user_providers
-            )
-            
-            # Обновляем профиль
-            profile['collected_data'].update(extracted_data)
-            profile['last_interaction'] = datetime.now().isoformat()
+            profile = await self._get_profile(user_id)
+            if not profile:
+                return self._profile_not_found()
             
-            # Определяем следующий этап
-            next_stage = self._get_next_stage(profile)
-            profile['stage'] = next_stage
+            next_stage, extracted_data = await self._begin_turn(profile, user_message, user_providers)
             
             # Генерируем ответ
             ai_message = await self._generate_smart_message(
                 profile, next_stage, user_message, profile['language'], user_providers
             )
             
-            # Добавляем в историю
-            profile['conversation_history'].append({
-                'timestamp': datetime.now().isoformat(),
-                'stage': next_stage,
-                'ai_message': ai_message,
-                'user_message': user_message,
-                'extracted_data': extracted_data
-            })
-            
-            # Рассчитываем прогресс
-            progress = self._calculate_progress(profile)
-            is_complete = next_stage == 'complete'
-            
-            # Генерируем рекомендации если профиль завершен
-            recommendations = None
-            if is_complete:
-                recommendations = await self._generate_job_recommendations(profile, user_providers)
-            
-            # Сохраняем профиль
-            await self.db.save_ai_recruiter_profile(user_id, profile)
-            
-            return {
-                'status': 'success',
-                'stage': next_stage,
-                'ai_message': ai_message,
-                'profile': profile,
-                'progress': progress,
-                'is_complete': is_complete,
-                'recommendations': recommendations
-            }
+            return await self._finish_turn(
+                user_id, profile, next_stage, user_message, extracted_data, ai_message, user_providers
+            )
             
         except Exception as e:
             logger.error(f"Failed to continue conversation: {e}")
@@ -179,7 +1111,7 @@ class AdvancedAIRecruiter:
         🎯 Получение персональных рекомендаций работы
         """
         try:
-            profile = await self.db.get_ai_recruiter_profile(user_id)
+            profile = await self._get_profile(user_id)
             if not profile:
                 return {
                     'status': 'error',
@@ -217,13 +1149,7 @@ class AdvancedAIRecruiter:
             # Получаем перевод
             if user_providers:
                 provider, model, api_key = user_providers[0]
-                translation = await modern_llm_manager.generate_content(
-                    prompt=prompt,
-                    provider=provider,
-                    model=model,
-                    api_key=api_key,
-                    max_tokens=2000
-                )
+                translation = await self._cached_generate(prompt, provider, model, api_key, max_tokens=2000)
             else:
                 translation = self._create_demo_translation(job_data, target_language)
             
@@ -245,6 +1171,86 @@ class AdvancedAIRecruiter:
                 'fallback_translation': job_data
             }
     
+    async def translate_jobs(self,
+                             jobs: List[Dict[str, Any]],
+                             target_language: str,
+                             user_providers: List[Tuple[str, str, str]] = None) -> Dict[str, Any]:
+        """
+        🌍 Перевод нескольких вакансий: один запрос к LLM на пачку
+        
+        Пачки по TRANSLATION_BATCH_SIZE вакансий переводятся параллельно.
+        """
+        try:
+            logger.info(f"Translating {len(jobs)} jobs to {target_language}")
+            
+            if user_providers:
+                provider, model, api_key = user_providers[0]
+                batches = [jobs[i:i + TRANSLATION_BATCH_SIZE] for i in range(0, len(jobs), TRANSLATION_BATCH_SIZE)]
+                translated_batches = await asyncio.gather(
+                    *[self._translate_batch(batch, target_language, provider, model, api_key) for batch in batches]
+                )
+                translated_jobs = [job for batch in translated_batches for job in batch]
+            else:
+                translated_jobs = [
+                    self._parse_translation(self._create_demo_translation(job, target_language), job)
+                    for job in jobs
+                ]
+            
+            return {
+                'status': 'success',
+                'original_jobs': jobs,
+                'translated_jobs': translated_jobs,
+                'target_language': target_language
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to translate jobs: {e}")
+            return {
+                'status': 'error',
+                'message': f'Ошибка перевода: {str(e)}',
+                'fallback_translation': jobs
+            }
+    
+    async def _translate_batch(self,
+                               jobs: List[Dict[str, Any]],
+                               target_language: str,
+                               provider: str,
+                               model: str,
+                               api_key: str) -> List[Dict[str, Any]]:
+        """Перевод пачки вакансий одним запросом (одна вакансия - обычным промптом)
+        
+        Вакансии, которых нет в ответе на пачку, переводятся по одной через translate_job.
+        """
+        if len(jobs) == 1:
+            return [await self._translate_single(jobs[0], target_language, provider, model, api_key)]
+        
+        system_prompt, prompt = self._create_batch_translation_prompt(jobs, target_language)
+        translation = await self._cached_generate(
+            prompt, provider, model, api_key, max_tokens=2000 * len(jobs), system_message=system_prompt
+        )
+        translated = self._parse_batch_translation(translation, jobs)
+        
+        missing = [index for index, job in enumerate(translated) if job is jobs[index]]
+        if missing:
+            logger.warning(f"Batch translation missed {len(missing)} of {len(jobs)} jobs, translating them one by one")
+            singles = await asyncio.gather(
+                *[self._translate_single(jobs[index], target_language, provider, model, api_key) for index in missing]
+            )
+            for index, job in zip(missing, singles):
+                translated[index] = job
+        
+        return translated
+    
+    async def _translate_single(self,
+                                job: Dict[str, Any],
+                                target_language: str,
+                                provider: str,
+                                model: str,
+                                api_key: str) -> Dict[str, Any]:
+        """Перевод одной вакансии через translate_job (при ошибке - оригинал)"""
+        result = await self.translate_job(job, target_language, [(provider, model, api_key)])
+        return result.get('translated_job', job)
+    
     async def analyze_job_compatibility(self,
                                        user_id: str,
                                        job_data: Dict[str, Any],
@@ -253,7 +1259,7 @@ class AdvancedAIRecruiter:
         🔍 Анализ совместимости с вакансией
         """
         try:
-            profile = await self.db.get_ai_recruiter_profile(user_id)
+            profile = await self._get_profile(user_id)
             if not profile:
                 return {
                     'status': 'error',
@@ -281,16 +1287,149 @@ class AdvancedAIRecruiter:
     # ВНУТРЕННИЕ МЕТОДЫ
     # =====================================================
     
+    async def _get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Профиль пользователя из БД"""
+        profile = await self.db.get_ai_recruiter_profile(user_id)
+        if profile:
+            # Строки из JSON не интернированы; язык и этап участвуют в поиске по таблицам на каждом ходу
+            profile['language'] = _intern_key(profile.get('language', 'ru'))
+            profile['stage'] = _intern_key(profile.get('stage', 'initial'))
+        return profile
+    
+    async def close(self):
+        """Остановка: отмена фоновых поисков, закрытие HTTP-сессии"""
+        for _, task, _ in self._job_prefetch.values():
+            task.cancel()
+        self._job_prefetch.clear()
+        
+        # Сервис поиска создается лениво - закрываем, только если он был создан
+        job_search_service = self.__dict__.get('job_search_service')
+        if job_search_service is not None:
+            await job_search_service.close_session()
+    
+    async def _save_turn(self, user_id: str, profile: Dict[str, Any], turn: Dict[str, Any]):
+        """Запись нового хода в журнал и изменившихся полей профиля
+        
+        Журнал ходов только дописывается (старые ходы сверх MAX_HISTORY удаляются),
+        поэтому запись дешевая и идет сразу: профиль в БД всегда актуален для
+        других процессов и прямого чтения.
+        """
+        # Первый ход хранится в снимке профиля, в журнале - только последние
+        await self.db.append_ai_recruiter_turns(user_id, [turn], keep_last=MAX_HISTORY - 1)
+        await self.db.update_ai_recruiter_header(user_id, {
+            'stage': profile['stage'],
+            'collected_data': profile['collected_data'],
+            'last_interaction': profile['last_interaction'],
+            'history_length': profile.get('history_length'),
+            'history_summary': profile.get('history_summary')
+        })
+    
+    def _profile_not_found(self) -> Dict[str, Any]:
+        """Ответ на продолжение разговора без сохраненного профиля"""
+        return {
+            'status': 'error',
+            'message': 'Профиль не найден. Начните разговор заново.',
+            'restart_required': True
+        }
+    
+    async def _begin_turn(self,
+                          profile: Dict[str, Any],
+                          user_message: str,
+                          user_providers: List[Tuple[str, str, str]] = None) -> Tuple[str, Dict[str, Any]]:
+        """Разбор ответа пользователя и переход к следующему этапу: (этап, извлеченные данные)"""
+        
+        # Анализируем ответ пользователя
+        extracted_data = await self._analyze_user_response(
+            user_message, profile, user_providers
+        )
+        
+        # Обновляем профиль
+        profile['collected_data'].update(extracted_data)
+        profile['last_interaction'] = _now().isoformat()
+        
+        # Определяем следующий этап
+        next_stage = self._get_next_stage(profile)
+        profile['stage'] = next_stage
+        
+        # Рекомендации понадобятся после следующего ответа - ищем вакансии заранее
+        if next_stage == 'preferences':
+            self._prefetch_jobs(profile)
+        
+        return next_stage, extracted_data
+    
+    async def _finish_turn(self,
+                           user_id: str,
+                           profile: Dict[str, Any],
+                           next_stage: str,
+                           user_message: str,
+                           extracted_data: Dict[str, Any],
+                           ai_message: str,
+                           user_providers: List[Tuple[str, str, str]] = None) -> Dict[str, Any]:
+        """Запись хода в историю, рекомендации по завершении и сохранение профиля"""
+        
+        # Добавляем в историю (одна отметка времени на ход, см. _begin_turn)
+        turn = {
+            'timestamp': profile['last_interaction'],
+            'stage': next_stage,
+            'ai_message': ai_message,
+            'user_message': user_message,
+            'extracted_data': extracted_data
+        }
+        history = profile['conversation_history']
+        history.append(turn)
+        self._update_summary(profile, turn)
+        
+        # Промпт использует только краткое изложение, поэтому в памяти достаточно
+        # начала разговора и последних ходов (счетчик ходов уже обновлен выше)
+        if len(history) > MAX_HISTORY:
+            del history[1:len(history) - MAX_HISTORY + 1]
+        
+        # Рассчитываем прогресс
+        progress = self._calculate_progress(profile)
+        is_complete = next_stage == 'complete'
+        
+        # Генерируем рекомендации если профиль завершен
+        recommendations = None
+        if is_complete:
+            recommendations = await self._generate_job_recommendations(profile, user_providers)
+        
+        # Записываем новый ход и изменившиеся поля
+        await self._save_turn(user_id, profile, turn)
+        
+        return {
+            'status': 'success',
+            'stage': next_stage,
+            'ai_message': ai_message,
+            'profile': self._profile_view(profile),
+            'progress': progress,
+            'is_complete': is_complete,
+            'recommendations': recommendations
+        }
+    
+    def _profile_view(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Профиль для ответа на ход разговора - без истории, которая растет с каждым ходом
+        
+        Полный профиль с историей отдает отдельный запрос профиля.
+        """
+        return {
+            'user_id': profile.get('user_id'),
+            'stage': profile.get('stage'),
+            'collected_data': profile.get('collected_data', {}),
+            'language': profile.get('language'),
+            'last_interaction': profile.get('last_interaction')
+        }
+    
     def _create_initial_profile(self, user_id: str, language: str) -> Dict[str, Any]:
         """Создание начального профиля"""
+        now_iso = _now().isoformat()
         return {
             'user_id': user_id,
             'language': language,
             'stage': 'initial',
             'collected_data': {},
             'conversation_history': [],
-            'created_at': datetime.now().isoformat(),
-            'last_interaction': datetime.now().isoformat()
+            'created_at': now_iso,
+            'last_interaction': now_iso
         }
     
     async def _resume_conversation(self,
@@ -306,8 +1445,8 @@ class AdvancedAIRecruiter:
             return {
                 'status': 'success',
                 'stage': 'complete',
-                'ai_message': self._get_completion_message(language),
-                'profile': profile,
+                'ai_message': _completion_message(language),
+                'profile': self._profile_view(profile),
                 'progress': 100,
                 'is_complete': True,
                 'recommendations': recommendations
@@ -322,7 +1461,7 @@ class AdvancedAIRecruiter:
             'status': 'success',
             'stage': current_stage,
             'ai_message': ai_message,
-            'profile': profile,
+            'profile': self._profile_view(profile),
             'progress': self._calculate_progress(profile),
             'is_complete': False
         }
@@ -336,17 +1475,19 @@ class AdvancedAIRecruiter:
         """Генерация умного сообщения"""
         
         # Создаем контекстный промпт
-        prompt = self._create_context_prompt(profile, stage, user_message, language)
+        system_prompt, prompt = self._create_context_prompt(profile, stage, user_message, language)
         
         if user_providers:
             try:
                 provider, model, api_key = user_providers[0]
+                # Реплики разговора не кэшируются: каждый пользователь получает свой ответ
                 ai_message = await modern_llm_manager.generate_content(
                     prompt=prompt,
                     provider=provider,
                     model=model,
                     api_key=api_key,
-                    max_tokens=500
+                    max_tokens=500,
+                    system_message=system_prompt
                 )
                 
                 if ai_message:
@@ -355,409 +1496,247 @@ class AdvancedAIRecruiter:
                 logger.error(f"Failed to generate AI message: {e}")
         
         # Fallback сообщения
-        return self._get_fallback_message_for_stage(stage, language)
+        return _fallback_message_for_stage(stage, language)
+    
+    def _llm_cache_key(self,
+                       prompt: str,
+                       provider: str,
+                       model: str,
+                       max_tokens: int,
+                       system_message: Optional[str]) -> str:
+        """Ключ кэша ответов LLM: провайдер, модель, лимит и хэш промпта"""
+        prompt_hasher = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16)
+        if system_message:
+            prompt_hasher.update(b'\0' + system_message.encode('utf-8'))
+        return f"{provider}:{model}:{max_tokens}:{prompt_hasher.hexdigest()}"
+    
+    async def _llm_cache_get(self, cache_key: str) -> Optional[str]:
+        """Поиск ответа в кэше: сначала память, затем БД (записи старше LLM_CACHE_TTL не используются)"""
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            stored_at, response = cached
+            if time.time() - stored_at < LLM_CACHE_TTL:
+                self._llm_cache.move_to_end(cache_key)
+                return response
+            del self._llm_cache[cache_key]
+        
+        try:
+            cached = await self.db.get_llm_cache_entry(cache_key, max_age=LLM_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        
+        if cached is not None:
+            self._remember_llm_response(cache_key, cached)
+        return cached
+    
+    async def _llm_cache_put(self, cache_key: str, response: str):
+        """Сохранение ответа в кэш (служебные ответы менеджера не кэшируются)"""
+        if not response or response.startswith(_LLM_FALLBACK_PREFIXES):
+            return
+        
+        try:
+            await self.db.save_llm_cache_entry(cache_key, response, max_age=LLM_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"LLM cache save failed: {e}")
+        self._remember_llm_response(cache_key, response)
+    
+    def _remember_llm_response(self, cache_key: str, response: str):
+        """Добавление ответа в in-memory LRU"""
+        self._llm_cache[cache_key] = (time.time(), response)
+        if len(self._llm_cache) > LLM_CACHE_MAX_ENTRIES:
+            self._llm_cache.popitem(last=False)
+    
+    async def _cached_generate(self,
+                               prompt: str,
+                               provider: str,
+                               model: str,
+                               api_key: str,
+                               max_tokens: int,
+                               system_message: Optional[str] = None) -> str:
+        """Вызов LLM с кэшем ответов (память + БД) по хэшу промпта
+        
+        Только для детерминированных запросов (перевод вакансии): реплики
+        разговора и анализ ответов идут в LLM напрямую.
+        """
+        cache_key = self._llm_cache_key(prompt, provider, model, max_tokens, system_message)
+        
+        cached = await self._llm_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = await modern_llm_manager.generate_content(
+            prompt=prompt,
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            max_tokens=max_tokens,
+            system_message=system_message
+        )
+        await self._llm_cache_put(cache_key, response)
+        return response
     
     def _create_context_prompt(self,
                               profile: Dict[str, Any],
                               stage: str,
                               user_message: Optional[str],
-                              language: str) -> str:
-        """Создание контекстного промпта"""
+                              language: str) -> Tuple[str, str]:
+        """Создание контекстного промпта: (системные инструкции, данные разговора)"""
         
         collected_data = profile.get('collected_data', {})
         history_summary = self._summarize_conversation_history(profile)
         
-        prompts = {
-            'ru': {
-                'initial': f"""Ты - профессиональный AI-рекрутер, который помогает найти идеальную работу в Германии. 
-                
-Твоя задача - провести короткое интервью (максимум 3-5 вопросов) чтобы узнать:
-- Какую работу ищет человек
-- Какой у него опыт и навыки
-- Где хочет работать
-- Уровень немецкого языка
-
-Будь дружелюбным, профессиональным и эффективным. НЕ говори "Здравствуйте" повторно.
-
-{history_summary}
-
-Твой ответ (на русском языке):""",
-                
-                'skills': f"""Продолжи интервью. Уже собрано: {collected_data}
-                
-Пользователь ответил: "{user_message}"
-
-Теперь узнай подробности о навыках и опыте работы. Задай ОДИН конкретный вопрос.
-
-Твой ответ (на русском языке):""",
-                
-                'preferences': f"""Продолжи интервью. Уже собрано: {collected_data}
-                
-Пользователь ответил: "{user_message}"
-
-Теперь узнай предпочтения по работе (зарплата, график, компания). Задай ОДИН конкретный вопрос.
-
-Твой ответ (на русском языке):""",
-                
-                'complete': f"""Интервью завершено! Собрано: {collected_data}
-                
-Пользователь ответил: "{user_message}"
-
-Поблагодари пользователя и скажи, что начинаешь поиск идеальных вакансий специально для него.
-
-Твой ответ (на русском языке):"""
-            },
-            'en': {
-                'initial': f"""You are a professional AI recruiter helping find the perfect job in Germany.
-                
-Your task is to conduct a short interview (maximum 3-5 questions) to learn:
-- What job they're looking for
-- Their experience and skills
-- Where they want to work
-- German language level
-
-Be friendly, professional, and efficient. DON'T say "Hello" repeatedly.
-
-{history_summary}
-
-Your response (in English):""",
-                
-                'skills': f"""Continue the interview. Already collected: {collected_data}
-                
-User responded: "{user_message}"
-
-Now learn details about skills and work experience. Ask ONE specific question.
-
-Your response (in English):""",
-                
-                'preferences': f"""Continue the interview. Already collected: {collected_data}
-                
-User responded: "{user_message}"
-
-Now learn work preferences (salary, schedule, company). Ask ONE specific question.
-
-Your response (in English):""",
-                
-                'complete': f"""Interview completed! Collected: {collected_data}
-                
-User responded: "{user_message}"
-
-Thank the user and say you're starting to search for perfect job opportunities specifically for them.
-
-Your response (in English):"""
-            }
-        }
-        
-        return prompts.get(language, prompts['ru']).get(stage, prompts['ru']['initial'])
+        return (
+            _static_system_prompt(language, stage),
+            _dynamic_suffix(collected_data, user_message, history_summary, language)
+        )
     
     def _summarize_conversation_history(self, profile: Dict[str, Any]) -> str:
-        """Краткое изложение истории разговора"""
-        history = profile.get('conversation_history', [])
-        if not history:
-            return "Разговор только начинается."
-        
-        if len(history) == 1:
-            return "Это первое взаимодействие с пользователем."
-        
-        return f"Уже было {len(history)} сообщений. Предыдущие ответы пользователя учтены."
+        """Краткое изложение истории разговора (обновляется в _update_summary)"""
+        summary = profile.get('history_summary')
+        if summary is None:
+            # Профиль, сохраненный до появления history_summary
+            return _history_summary(len(profile.get('conversation_history', [])))
+        return summary
+    
+    def _update_summary(self, profile: Dict[str, Any], new_turn: Dict[str, Any]):
+        """Обновление краткого изложения после добавления хода в историю"""
+        history_length = profile.get('history_length', len(profile['conversation_history']) - 1) + 1
+        profile['history_length'] = history_length
+        profile['history_summary'] = _history_summary(history_length)
     
     async def _analyze_user_response(self,
                                    user_message: str,
                                    profile: Dict[str, Any],
-                                   user_providers: List[Tuple[str, str, str]] = None) -> Dict[str, Any]:
-        """Анализ ответа пользователя и извлечение данных"""
-        
-        current_stage = profile.get('stage', 'initial')
+                                   user_providers: List[Tuple[str, str, str]] = None,
+                                   ai_augment: bool = False) -> Dict[str, Any]:
+        """Анализ ответа пользователя и извлечение данных
         
-        # Простой анализ по ключевым словам
-        extracted_data = {}
+        LLM уточняет результат, только если ключевые слова не дали основных полей
+        этапа; ai_augment=True вызывает LLM всегда (например, для оценки качества).
+        """
         
-        if current_stage == 'initial':
-            # Ищем профессию, город, уровень языка
-            extracted_data.update(self._extract_initial_data(user_message))
+        current_stage = profile.get('stage', 'initial')
         
-        elif current_stage == 'skills':
-            # Ищем навыки и опыт
-            extracted_data.update(self._extract_skills_data(user_message))
+        # Простой анализ по ключевым словам (профессия, город, уровень языка,
+        # навыки и опыт или предпочтения - в зависимости от этапа)
+        extracted_data = self._extract_data(user_message, current_stage)
         
-        elif current_stage == 'preferences':
-            # Ищем предпочтения
-            extracted_data.update(self._extract_preferences_data(user_message))
+        # Если есть LLM и ответ не распознан уверенно, делаем более точный анализ
+        if not user_providers:
+            return extracted_data
         
-        # Если есть LLM, делаем более точный анализ
-        if user_providers:
-            try:
-                ai_analysis = await self._ai_analyze_response(user_message, current_stage, user_providers)
-                extracted_data.update(ai_analysis)
-            except Exception as e:
-                logger.error(f"Failed AI analysis: {e}")
+        required = _STAGE_REQUIRED_FIELDS.get(current_stage)
+        if not ai_augment and required is not None and required.issubset(extracted_data):
+            logger.info(f"Stage {current_stage}: keyword extraction is sufficient, skipping AI analysis")
+            return extracted_data
         
+        logger.info(f"Stage {current_stage}: running AI analysis")
+        extracted_data.update(await self._ai_analyze_response(user_message, current_stage, user_providers))
         return extracted_data
     
-    def _extract_initial_data(self, message: str) -> Dict[str, Any]:
-        """Улучшенное извлечение начальных данных"""
-        data = {}
-        
-        # Поиск уровня немецкого
-        message_lower = message.lower()
-        for level in ['a1', 'a2', 'b1', 'b2', 'c1', 'c2']:
-            if level in message_lower:
-                data['german_level'] = level.upper()
-                break
-        
-        # Поиск города (расширенный список)
-        cities = [
-            'berlin', 'берлин', 'münchen', 'мюнхен', 'munich', 'hamburg', 'гамбург',
-            'köln', 'кёльн', 'cologne', 'frankfurt', 'франкфурт', 'düsseldorf', 'дюссельдорф',
-            'stuttgart', 'штутгарт', 'leipzig', 'лейпциг', 'dresden', 'дрезден',
-            'hannover', 'ганновер', 'nürnberg', 'нюрнберг', 'nuremberg'
-        ]
-        for city in cities:
-            if city in message_lower:
-                # Нормализуем название города
-                if city in ['берлин', 'berlin']:
-                    data['preferred_city'] = 'Berlin'
-                elif city in ['мюнхен', 'münchen', 'munich']:
-                    data['preferred_city'] = 'München'
-                elif city in ['гамбург', 'hamburg']:
-                    data['preferred_city'] = 'Hamburg'
-                elif city in ['кёльн', 'köln', 'cologne']:
-                    data['preferred_city'] = 'Köln'
-                elif city in ['франкфурт', 'frankfurt']:
-                    data['preferred_city'] = 'Frankfurt'
-                elif city in ['дюссельдорф', 'düsseldorf']:
-                    data['preferred_city'] = 'Düsseldorf'
-                elif city in ['штутгарт', 'stuttgart']:
-                    data['preferred_city'] = 'Stuttgart'
-                else:
-                    data['preferred_city'] = city.title()
-                break
-        
-        # Поиск профессии (значительно расширенный список)
-        profession_patterns = {
-            'developer': ['developer', 'разработчик', 'программист', 'dev', 'coder'],
-            'python developer': ['python', 'пайтон'],
-            'frontend developer': ['frontend', 'фронтенд', 'react', 'vue', 'angular'],
-            'backend developer': ['backend', 'бэкенд', 'бекенд'],
-            'fullstack developer': ['fullstack', 'фуллстек', 'full stack', 'full-stack'],
-            'data scientist': ['data scientist', 'дата саентист', 'аналитик данных'],
-            'designer': ['designer', 'дизайнер', 'ui', 'ux'],
-            'manager': ['manager', 'менеджер', 'project manager', 'проект-менеджер'],
-            'qa engineer': ['qa', 'тестировщик', 'quality', 'tester'],
-            'devops': ['devops', 'девопс', 'infrastructure', 'инфраструктура'],
-            'engineer': ['engineer', 'инженер'],
-            'analyst': ['analyst', 'аналитик'],
-            'consultant': ['consultant', 'консультант'],
-            'marketing': ['marketing', 'маркетинг', 'маркетолог'],
-            'sales': ['sales', 'продажи', 'менеджер по продажам']
-        }
-        
-        for profession, patterns in profession_patterns.items():
-            for pattern in patterns:
-                if pattern in message_lower:
-                    data['profession'] = profession
-                    break
-            if 'profession' in data:
-                break
-        
-        # Если не нашли точную профессию, берем первое подходящее слово
-        if 'profession' not in data:
-            words = message_lower.split()
-            profession_words = ['developer', 'разработчик', 'программист', 'manager', 'менеджер', 
-                              'designer', 'дизайнер', 'analyst', 'аналитик', 'specialist', 'специалист']
-            for word in words:
-                if word in profession_words:
-                    data['profession'] = word
-                    break
-        
-        return data
-        
-        return data
-    
-    def _extract_skills_data(self, message: str) -> Dict[str, Any]:
-        """Улучшенное извлечение данных о навыках"""
+    def _extract_data(self, message: str, stage: str) -> Dict[str, Any]:
+        """Извлечение данных этапа за один проход по сообщению"""
         data = {}
+        if stage not in _STAGE_KEYWORD_ENTRIES:
+            return data
         
         message_lower = message.lower()
         
-        # Расширенный поиск технических навыков
-        tech_skills = {
-            'python': ['python', 'пайтон', 'питон'],
-            'javascript': ['javascript', 'js', 'джаваскрипт'],
-            'java': ['java', 'джава'],
-            'react': ['react', 'реакт'],
-            'vue': ['vue', 'vue.js'],
-            'angular': ['angular', 'ангуляр'],
-            'node.js': ['node', 'node.js', 'nodejs'],
-            'django': ['django', 'джанго'],
-            'flask': ['flask', 'фласк'],
-            'docker': ['docker', 'докер'],
-            'kubernetes': ['kubernetes', 'k8s', 'кубернетес'],
-            'postgresql': ['postgresql', 'postgres', 'постгрес'],
-            'mysql': ['mysql', 'майсквл'],
-            'mongodb': ['mongodb', 'mongo'],
-            'redis': ['redis', 'редис'],
-            'git': ['git', 'гит'],
-            'aws': ['aws', 'amazon'],
-            'linux': ['linux', 'линукс'],
-            'sql': ['sql', 'эсквл'],
-            'html': ['html'],
-            'css': ['css'],
-            'typescript': ['typescript', 'ts'],
-            'c++': ['c++', 'cpp'],
-            'c#': ['c#', 'csharp'],
-            'php': ['php', 'пхп'],
-            'go': ['golang', 'go'],
-            'rust': ['rust', 'раст'],
-            'kotlin': ['kotlin', 'котлин'],
-            'swift': ['swift', 'свифт']
-        }
-        
+        # Все ключевые слова этапа ищутся одним проходом; в каждой категории
+        # побеждает совпадение с наивысшим приоритетом (порядок в таблицах)
+        best: Dict[str, Tuple[int, Any]] = {}
         found_skills = []
-        for skill_name, patterns in tech_skills.items():
-            for pattern in patterns:
-                if pattern in message_lower:
-                    found_skills.append(skill_name)
-                    break
-        
+        for category, canonical, priority in self._iter_keyword_matches(message_lower, stage):
+            if category == 'technical_skills':
+                if canonical not in found_skills:
+                    found_skills.append(canonical)
+            elif category not in best or priority < best[category][0]:
+                best[category] = (priority, canonical)
+        
+        for category, (_, canonical) in best.items():
+            data[category] = canonical
         if found_skills:
-            data['technical_skills'] = list(set(found_skills))  # убираем дубликаты
-        
-        # Поиск опыта работы (более точно)
-        import re
-        
-        # Паттерны для поиска лет опыта
-        experience_patterns = [
-            r'(\d+)\s*(?:год|лет|года)',
-            r'(\d+)\s*years?',
-            r'(\d+)\s*лет\s*опыта',
-            r'опыт\s*(\d+)',
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'
-        ]
-        
-        for pattern in experience_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                years = int(match.group(1))
-                data['experience_years'] = years
-                break
-        
-        # Поиск образования
-        education_keywords = ['университет', 'институт', 'university', 'degree', 'диплом', 'образование', 'магистр', 'бакалавр']
-        for keyword in education_keywords:
-            if keyword in message_lower:
-                data['has_education'] = True
-                break
-        
-        return data
-    
-    def _extract_preferences_data(self, message: str) -> Dict[str, Any]:
-        """Улучшенное извлечение данных о предпочтениях"""
-        data = {}
-        
-        message_lower = message.lower()
-        
-        # Поиск зарплатных ожиданий (более точно)
-        import re
-        
-        salary_patterns = [
-            r'(\d+)\s*(?:000)?\s*(?:-|до|to)\s*(\d+)\s*(?:000)?\s*(?:евро|euro|eur|€)',
-            r'от\s*(\d+)\s*(?:000)?\s*до\s*(\d+)\s*(?:000)?\s*(?:евро|euro|eur|€)',
-            r'(\d+)\s*(?:к|k|тысяч)\s*(?:-|до|to)\s*(\d+)\s*(?:к|k|тысяч)',
-            r'зарплата\s*(\d+)',
-            r'salary\s*(\d+)'
-        ]
-        
-        for pattern in salary_patterns:
-            match = re.search(pattern, message_lower)
-            if match:
-                if len(match.groups()) >= 2:
-                    # Диапазон зарплаты
-                    min_salary = int(match.group(1))
-                    max_salary = int(match.group(2))
-                    # Если числа меньше 1000, вероятно это в тысячах
-                    if min_salary < 1000:
-                        min_salary *= 1000
-                    if max_salary < 1000:
-                        max_salary *= 1000
-                    data['salary_min'] = min_salary
-                    data['salary_max'] = max_salary
-                    data['salary_expectations'] = f"{min_salary}-{max_salary} EUR"
-                else:
-                    # Одно число
-                    salary = int(match.group(1))
-                    if salary < 1000:
-                        salary *= 1000
-                    data['salary_expectations'] = f"{salary} EUR"
-                break
-        
-        # Поиск формата работы
-        work_format_keywords = {
-            'remote': ['remote', 'удаленно', 'удаленная', 'дистанционно', 'из дома', 'home office'],
-            'office': ['office', 'офис', 'офисе', 'на месте', 'очно'],
-            'hybrid': ['hybrid', 'гибрид', 'смешанный', 'частично удаленно']
-        }
-        
-        for format_type, keywords in work_format_keywords.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    data['work_format'] = format_type
-                    break
-            if 'work_format' in data:
-                break
-        
-        # Поиск типа занятости
-        employment_keywords = {
-            'full_time': ['полный день', 'full time', 'fulltime', 'полная занятость', 'фулл тайм'],
-            'part_time': ['частичная занятость', 'part time', 'parttime', 'неполный день'],
-            'contract': ['контракт', 'contract', 'подряд', 'фриланс', 'freelance'],
-            'internship': ['стажировка', 'internship', 'intern', 'практика']
-        }
+            data['technical_skills'] = found_skills
         
-        for employment_type, keywords in employment_keywords.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    data['employment_type'] = employment_type
+        if stage == 'initial':
+            # Уровни в _GERMAN_LEVELS идут по алфавиту, поэтому min() - первый по приоритету
+            levels = _GERMAN_LEVEL_RE.findall(message_lower)
+            if levels:
+                data['german_level'] = _GERMAN_LEVELS[min(levels)]
+            
+            # Если не нашли точную профессию, берем первое подходящее слово
+            if 'profession' not in data:
+                for word in message_lower.split():
+                    if word in _PROFESSION_WORDS:
+                        data['profession'] = word
+                        break
+        
+        elif stage == 'skills':
+            # Поиск опыта работы
+            for pattern in _EXPERIENCE_PATTERNS:
+                match = pattern.search(message_lower)
+                if match:
+                    data['experience_years'] = int(match.group(1))
                     break
-            if 'employment_type' in data:
-                break
-        
-        # Поиск размера компании
-        company_size_keywords = {
-            'startup': ['стартап', 'startup', 'молодая компания', 'небольшая компания'],
-            'small': ['малая', 'маленькая', 'small company', 'до 50'],
-            'medium': ['средняя', 'medium', 'средний размер', '50-500'],
-            'large': ['большая', 'крупная', 'large', 'корпорация', 'более 500']
-        }
         
-        for size_type, keywords in company_size_keywords.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    data['company_size_preference'] = size_type
+        elif stage == 'preferences':
+            # Поиск зарплатных ожиданий
+            for pattern in _SALARY_PATTERNS:
+                match = pattern.search(message_lower)
+                if match:
+                    if len(match.groups()) >= 2:
+                        # Диапазон зарплаты
+                        min_salary = int(match.group(1))
+                        max_salary = int(match.group(2))
+                        # Если числа меньше 1000, вероятно это в тысячах
+                        if min_salary < 1000:
+                            min_salary *= 1000
+                        if max_salary < 1000:
+                            max_salary *= 1000
+                        data['salary_min'] = min_salary
+                        data['salary_max'] = max_salary
+                        data['salary_expectations'] = f"{min_salary}-{max_salary} EUR"
+                    else:
+                        # Одно число
+                        salary = int(match.group(1))
+                        if salary < 1000:
+                            salary *= 1000
+                        data['salary_expectations'] = f"{salary} EUR"
                     break
-            if 'company_size_preference' in data:
-                break
         
         return data
     
+    def _iter_keyword_matches(self, message_lower: str, stage: str):
+        """(категория, каноническое значение, приоритет) для каждого найденного ключевого слова этапа"""
+        automaton = self._kw_automata[stage]
+        if automaton is not None:
+            for _, entries in automaton.iter(message_lower):
+                yield from entries
+        else:
+            pattern, prefix_entries = _STAGE_KEYWORD_RE[stage]
+            for match in pattern.finditer(message_lower):
+                yield from prefix_entries[match.group(1)]
+    
     async def _ai_analyze_response(self,
                                   user_message: str,
                                   stage: str,
                                   user_providers: List[Tuple[str, str, str]]) -> Dict[str, Any]:
-        """AI анализ ответа пользователя"""
+        """AI анализ ответа пользователя (с кэшем по этапу и нормализованному ответу)"""
         
-        prompt = f"""Проанализируй ответ пользователя и извлеки структурированную информацию.
+        cache_key = hashlib.blake2b(
+            f"{stage}|{user_message.strip().lower()}".encode('utf-8'), digest_size=16
+        ).digest()
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            return copy.deepcopy(cached)
         
-Этап: {stage}
-Ответ пользователя: "{user_message}"
-
-Верни JSON с найденной информацией. Например:
-{{"profession": "Software Developer", "german_level": "B1", "city": "Berlin", "experience": "3 years"}}
-
-Только JSON, без дополнительного текста:"""
+        prompt = _ANALYSIS_PROMPT_TEMPLATE.format(stage=stage, user_message=user_message)
         
         try:
             provider, model, api_key = user_providers[0]
+            # Результат кэшируется уже разобранным в _analysis_cache, кэш ответов LLM не нужен
             result = await modern_llm_manager.generate_content(
                 prompt=prompt,
                 provider=provider,
@@ -767,10 +1746,17 @@ Your response (in English):"""
             )
             
             # Пытаемся парсить JSON
-            if result and '{' in result:
-                json_str = result[result.find('{'):result.rfind('}')+1]
-                return json.loads(json_str)
-                
+            extracted = await _extract_json_async(result)
+            if extracted:
+                # Значения (списки навыков) попадают в collected_data профиля - кэш хранит свою копию
+                self._analysis_cache[cache_key] = copy.deepcopy(extracted)
+                if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
+            return extracted
+        
+        except ValueError as e:
+            # orjson.JSONDecodeError и json.JSONDecodeError - подклассы ValueError
+            logger.warning(f"AI analysis returned invalid JSON: {e}")
         except Exception as e:
             logger.error(f"Failed to AI analyze response: {e}")
         
@@ -825,16 +1811,12 @@ Your response (in English):"""
             collected_data = profile.get('collected_data', {})
             
             # Расширенные параметры для поиска
-            search_params = {
-                'location': collected_data.get('preferred_city', 'Berlin'),
-                'language_level': collected_data.get('german_level', 'B1'),
-                'search_query': collected_data.get('profession', 'developer')
-            }
+            search_params = self._job_search_params(collected_data)
             
             logger.info(f"Searching jobs with params: {search_params}")
             
-            # Поиск вакансий
-            jobs_result = await self.job_search_service.search_jobs(**search_params)
+            # Поиск вакансий (если он уже запущен заранее - ждем его)
+            jobs_result = await self._search_jobs(profile.get('user_id'), search_params)
             
             if jobs_result.get('status') == 'success':
                 all_jobs = jobs_result.get('jobs', [])
@@ -844,26 +1826,22 @@ Your response (in English):"""
                     # Если нет вакансий, создаем демо-рекомендации
                     return self._create_demo_job_recommendations(collected_data)
                 
-                # Анализируем совместимость для каждой вакансии
-                recommendations = []
-                for job in all_jobs[:10]:  # Топ 10 вакансий для анализа
-                    compatibility = await self._analyze_compatibility(profile, job, user_providers)
-                    
-                    recommendation = {
-                        'job': job,
-                        'compatibility': compatibility,
-                        'recommendation_reason': self._get_recommendation_reason(profile, job, compatibility),
-                        'action_items': self._get_action_items_for_job(profile, job, compatibility),
-                        'match_highlights': self._get_match_highlights(profile, job, compatibility)
-                    }
-                    
-                    recommendations.append(recommendation)
+                # Анализируем совместимость для каждой вакансии (одной пачкой в потоке)
+                top_jobs = all_jobs[:10]  # Топ 10 вакансий для анализа
+                compatibilities = await self._analyze_compatibility_batch(profile, top_jobs)
+                
+                # Сборка рекомендаций - чистый Python; в потоке она не задерживает
+                # ходы других пользователей
+                recommendations = await asyncio.to_thread(
+                    self._postprocess_recs, list(zip(top_jobs, compatibilities)), profile
+                )
                 
-                # Сортируем по совместимости
-                recommendations.sort(key=lambda x: x['compatibility'].get('score', 0), reverse=True)
+                # Отобранные вакансии переводятся на язык пользователя одним вызовом
+                language = profile.get('language', JOB_SEARCH_LANGUAGE)
+                if user_providers and recommendations and language != JOB_SEARCH_LANGUAGE:
+                    await self._translate_recommendations(recommendations, language, user_providers)
                 
-                # Берем топ 5 лучших совпадений
-                return recommendations[:5]
+                return recommendations
             else:
                 logger.warning(f"Job search failed: {jobs_result}")
                 return self._create_demo_job_recommendations(collected_data)
@@ -873,6 +1851,135 @@ Your response (in English):"""
             # Создаем демо-рекомендации в случае ошибки
             return self._create_demo_job_recommendations(collected_data)
     
+    async def _translate_recommendations(self,
+                                         recommendations: List[Dict[str, Any]],
+                                         target_language: str,
+                                         user_providers: List[Tuple[str, str, str]]):
+        """Перевод вакансий рекомендаций на месте; оригинал остается в original_job"""
+        jobs = [recommendation['job'] for recommendation in recommendations]
+        result = await self.translate_jobs(jobs, target_language, user_providers)
+        if result.get('status') != 'success':
+            return
+        
+        for recommendation, job, translated in zip(recommendations, jobs, result['translated_jobs']):
+            if translated is not job:
+                # Перевод содержит только текстовые поля - id, url и т.п. берутся из оригинала
+                recommendation['job'] = {**job, **translated}
+                recommendation['original_job'] = job
+    
+    def _postprocess_recs(self,
+                          pairs: List[Tuple[Dict[str, Any], Any]],
+                          profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Рекомендации по парам (вакансия, совместимость или исключение): топ 5 по баллу"""
+        recommendations = []
+        for job, compatibility in pairs:
+            if not isinstance(compatibility, dict):
+                logger.error(f"Compatibility analysis failed: {compatibility}")
+                compatibility = {'score': 0}
+            
+            recommendation = {
+                'job': job,
+                'compatibility': compatibility,
+                'recommendation_reason': self._get_recommendation_reason(profile, job, compatibility),
+                'action_items': self._get_action_items_for_job(profile, job, compatibility),
+                'match_highlights': self._get_match_highlights(profile, job, compatibility)
+            }
+            
+            recommendations.append(recommendation)
+        
+        # Берем топ 5 лучших совпадений по совместимости (без полной
+        # сортировки; при равных баллах порядок поиска сохраняется)
+        return heapq.nlargest(5, recommendations, key=lambda x: x['compatibility'].get('score', 0))
+    
+    def _job_search_params(self, collected_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Параметры поиска вакансий по собранным данным"""
+        return {
+            'location': collected_data.get('preferred_city', 'Berlin'),
+            'language_level': collected_data.get('german_level', 'B1'),
+            'search_query': collected_data.get('profession', 'developer')
+        }
+    
+    def _prefetch_jobs(self, profile: Dict[str, Any]):
+        """Запуск поиска вакансий в фоне, пока пользователь отвечает на последний вопрос"""
+        user_id = profile.get('user_id')
+        if user_id is None:
+            return
+        
+        # Поиски, которые так и не понадобились, отменяются по истечении TTL
+        now = time.monotonic()
+        for stale_id, (_, task, started) in list(self._job_prefetch.items()):
+            if now - started > JOB_PREFETCH_TTL:
+                task.cancel()
+                del self._job_prefetch[stale_id]
+        
+        if user_id in self._job_prefetch:
+            return
+        
+        search_params = self._job_search_params(profile.get('collected_data', {}))
+        if self._job_search_cache_get(search_params) is not None:
+            return
+        
+        task = asyncio.create_task(self.job_search_service.search_jobs(**search_params))
+        # Результат может так и не понадобиться - помечаем исключение как полученное
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._job_prefetch[user_id] = (search_params, task, now)
+    
+    async def _search_jobs(self, user_id: Optional[str], search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Поиск вакансий: заранее запущенный поиск, кэш по параметрам или новый запрос"""
+        jobs_result = None
+        
+        prefetched = self._job_prefetch.pop(user_id, None)
+        if prefetched is not None:
+            prefetch_params, task, started = prefetched
+            if prefetch_params == search_params and time.monotonic() - started <= JOB_PREFETCH_TTL:
+                try:
+                    jobs_result = await task
+                except Exception as e:
+                    logger.warning(f"Prefetched job search failed, searching again: {e}")
+            else:
+                task.cancel()
+        
+        if jobs_result is None:
+            jobs_result = self._job_search_cache_get(search_params)
+            logger.info(f"Job search cache_hit={jobs_result is not None} for {search_params}")
+            if jobs_result is not None:
+                return jobs_result
+            jobs_result = await self.job_search_service.search_jobs(**search_params)
+        
+        if jobs_result.get('status') == 'success':
+            cache_key = tuple(search_params.values())
+            self._job_search_cache[cache_key] = (time.monotonic(), jobs_result)
+            self._job_search_cache.move_to_end(cache_key)
+            if len(self._job_search_cache) > JOB_SEARCH_CACHE_SIZE:
+                self._job_search_cache.popitem(last=False)
+        return jobs_result
+    
+    def _job_search_cache_get(self, search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Результат поиска из кэша, если он моложе JOB_SEARCH_CACHE_TTL"""
+        cache_key = tuple(search_params.values())
+        cached = self._job_search_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        searched_at, jobs_result = cached
+        if time.monotonic() - searched_at > JOB_SEARCH_CACHE_TTL:
+            del self._job_search_cache[cache_key]
+            return None
+        return jobs_result
+    
+    def clear_job_search_cache(self) -> int:
+        """Сброс кэша поиска вакансий и заранее запущенных поисков (обновление базы вакансий админом)
+        
+        Возвращает число удаленных записей кэша.
+        """
+        cleared = len(self._job_search_cache)
+        self._job_search_cache.clear()
+        for _, task, _ in self._job_prefetch.values():
+            task.cancel()
+        self._job_prefetch.clear()
+        logger.info(f"Job search cache cleared: {cleared} entries")
+        return cleared
+    
     def _create_demo_job_recommendations(self, collected_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Создание демо-рекомендаций при отсутствии реальных вакансий"""
         
@@ -996,13 +2103,14 @@ Your response (in English):"""
         
         # Специфические действия на основе проблем
         for concern in concerns:
-            if 'немецкого' in concern.lower() or 'german' in concern.lower():
+            concern_lower = concern.lower()
+            if 'немецкого' in concern_lower or 'german' in concern_lower:
                 actions.append("🇩🇪 Укажите свой реальный уровень немецкого в резюме")
-            elif 'город' in concern.lower() or 'city' in concern.lower():
+            elif 'город' in concern_lower or 'city' in concern_lower:
                 actions.append("📍 Объясните готовность к переезду")
-            elif 'опыт' in concern.lower() or 'experience' in concern.lower():
+            elif 'опыт' in concern_lower or 'experience' in concern_lower:
                 actions.append("💼 Детально опишите релевантный опыт")
-            elif 'навык' in concern.lower() or 'skill' in concern.lower():
+            elif 'навык' in concern_lower or 'skill' in concern_lower:
                 actions.append("🛠 Подготовьте примеры использования требуемых технологий")
         
         return actions[:6]  # Максимум 6 действий
@@ -1030,10 +2138,88 @@ Your response (in English):"""
     async def _analyze_compatibility(self,
                                    profile: Dict[str, Any],
                                    job: Dict[str, Any],
-                                   user_providers: List[Tuple[str, str, str]] = None) -> Dict[str, Any]:
-        """Улучшенный анализ совместимости с вакансией"""
-        
+                                   user_providers: List[Tuple[str, str, str]] = None,
+                                   features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Улучшенный анализ совместимости с вакансией (пачка вакансий - _analyze_compatibility_batch)"""
+        [analysis] = await self._analyze_compatibility_batch(profile, [job], features)
+        if isinstance(analysis, Exception):
+            raise analysis
+        return analysis
+    
+    async def _analyze_compatibility_batch(self,
+                                           profile: Dict[str, Any],
+                                           jobs: List[Dict[str, Any]],
+                                           features: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Анализ совместимости пачки вакансий: анализ или исключение для каждой, в порядке jobs
+        
+        Результат зависит только от данных профиля и полей вакансии, поэтому он
+        кэшируется (LRU на COMPATIBILITY_CACHE_SIZE пар); вызывающий код получает
+        свою копию и может ее менять. Кэши читаются и пополняются только здесь,
+        в event loop, а промахи - чистый Python - считаются одним вызовом в потоке.
+        """
         collected_data = profile.get('collected_data', {})
+        if features is None:
+            features = self._profile_features(collected_data)
+        
+        results: List[Any] = [None] * len(jobs)
+        misses = []
+        for index, job in enumerate(jobs):
+            job_key = _job_content_key(job)
+            cache_key = (features['cache_key'], job_key)
+            cached = self._compatibility_cache.get(cache_key)
+            if cached is not None:
+                self._compatibility_cache.move_to_end(cache_key)
+                results[index] = copy.deepcopy(cached)
+                continue
+            
+            job_features = self._job_feature_cache.get(job_key)
+            if job_features is not None:
+                self._job_feature_cache.move_to_end(job_key)
+            misses.append((index, job, cache_key, job_features))
+        
+        if not misses:
+            return results
+        
+        scored = await asyncio.to_thread(self._score_jobs, misses, collected_data, features)
+        for (index, _, cache_key, _), (job_features, analysis) in zip(misses, scored):
+            results[index] = analysis
+            if isinstance(analysis, Exception):
+                continue
+            
+            self._job_feature_cache[cache_key[1]] = job_features
+            if len(self._job_feature_cache) > JOB_FEATURE_CACHE_SIZE:
+                self._job_feature_cache.popitem(last=False)
+            
+            self._compatibility_cache[cache_key] = copy.deepcopy(analysis)
+            if len(self._compatibility_cache) > COMPATIBILITY_CACHE_SIZE:
+                self._compatibility_cache.popitem(last=False)
+        
+        return results
+    
+    def _score_jobs(self,
+                    misses: List[Tuple[int, Dict[str, Any], Any, Optional[Dict[str, Any]]]],
+                    collected_data: Dict[str, Any],
+                    features: Dict[str, Any]) -> List[Tuple[Optional[Dict[str, Any]], Any]]:
+        """Анализ вакансий без кэша (в потоке): (признаки, анализ или исключение) для каждой"""
+        scored = []
+        for _, job, _, job_features in misses:
+            try:
+                if job_features is None:
+                    job_features = self._job_features(job)
+                scored.append((job_features, self._compute_compatibility(job_features, collected_data, features)))
+            except Exception as e:
+                scored.append((None, e))
+        return scored
+    
+    def _compute_compatibility(self,
+                               job_features: Dict[str, Any],
+                               collected_data: Dict[str, Any],
+                               features: Dict[str, Any]) -> Dict[str, Any]:
+        """Анализ совместимости по признакам вакансии и профиля
+        
+        features - нормализованные данные профиля из _profile_features; при
+        анализе пачки вакансий их считают один раз.
+        """
         
         # Более детальная система оценки
         analysis = {
@@ -1046,36 +2232,31 @@ Your response (in English):"""
             'summary': ''
         }
         
-        # 1. Анализ локации (25 баллов)
-        location_score = self._analyze_location_match(job, collected_data)
-        analysis['categories']['location'] = location_score
-        analysis['score'] += location_score['score']
-        
-        # 2. Анализ профессии/навыков (30 баллов)
-        skills_score = self._analyze_skills_match(job, collected_data)
-        analysis['categories']['skills'] = skills_score
-        analysis['score'] += skills_score['score']
-        
-        # 3. Анализ требований по языку (20 баллов)
-        language_score = self._analyze_language_requirements(job, collected_data)
-        analysis['categories']['language'] = language_score
-        analysis['score'] += language_score['score']
-        
-        # 4. Анализ опыта работы (15 баллов)
-        experience_score = self._analyze_experience_match(job, collected_data)
-        analysis['categories']['experience'] = experience_score
-        analysis['score'] += experience_score['score']
-        
-        # 5. Анализ предпочтений (10 баллов)
-        preferences_score = self._analyze_preferences_match(job, collected_data)
-        analysis['categories']['preferences'] = preferences_score
-        analysis['score'] += preferences_score['score']
-        
-        # Собираем все insights
-        for category in analysis['categories'].values():
-            analysis['strengths'].extend(category.get('strengths', []))
-            analysis['concerns'].extend(category.get('concerns', []))
-            analysis['recommendations'].extend(category.get('recommendations', []))
+        categories = (
+            # 1. Анализ локации (25 баллов)
+            ('location', self._analyze_location_match(job_features, collected_data, features)),
+            # 2. Анализ профессии/навыков (30 баллов)
+            ('skills', self._analyze_skills_match(job_features, collected_data, features)),
+            # 3. Анализ требований по языку (20 баллов)
+            ('language', self._analyze_language_requirements(job_features, collected_data, features)),
+            # 4. Анализ опыта работы (15 баллов)
+            ('experience', self._analyze_experience_match(job_features, collected_data)),
+            # 5. Анализ предпочтений (10 баллов)
+            ('preferences', self._analyze_preferences_match(job_features, collected_data))
+        )
+        
+        # Собираем баллы и все insights; в ответ категории уходят словарями
+        for name, category in categories:
+            analysis['categories'][name] = category.as_dict()
+            analysis['score'] += category.score
+            analysis['strengths'].extend(category.strengths)
+            analysis['concerns'].extend(category.concerns)
+            analysis['recommendations'].extend(category.recommendations)
+        
+        # Одинаковые пункты из разных категорий показываем один раз (порядок сохраняется)
+        analysis['strengths'] = list(dict.fromkeys(analysis['strengths']))
+        analysis['concerns'] = list(dict.fromkeys(analysis['concerns']))
+        analysis['recommendations'] = list(dict.fromkeys(analysis['recommendations']))
         
         # Генерируем итоговое резюме
         analysis['summary'] = self._generate_compatibility_summary(analysis['score'], analysis['strengths'], analysis['concerns'])
@@ -1094,175 +2275,230 @@ Your response (in English):"""
             analysis['overall_recommendation'] = 'low'
             analysis['recommendation_text'] = '📝 Низкое соответствие. Возможно, стоит поискать другие варианты.'
         
-        return analysis
+        return analysis
+    
+    def _profile_features(self, collected_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Нормализованные данные профиля, которые не зависят от вакансии"""
+        profession = collected_data.get('profession', '').lower()
+        user_german_level = collected_data.get('german_level', '')
+        technical_skills = [skill.lower() for skill in collected_data.get('technical_skills', [])]
+        
+        # Навыки из одного слова сравниваются с множеством слов вакансии,
+        # остальные ("node.js", "c++", "machine learning") - поиском подстроки
+        skill_words = frozenset(skill for skill in technical_skills if _WORD_RE.fullmatch(skill))
+        skill_phrases = frozenset(technical_skills) - skill_words
+        
+        return {
+            # Хэш всех данных профиля - часть ключа кэша анализа совместимости
+            'cache_key': hashlib.blake2b(
+                json.dumps(collected_data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'),
+                digest_size=16
+            ).digest(),
+            'preferred_city': collected_data.get('preferred_city', '').lower(),
+            'profession': profession,
+            'profession_words': profession.split(),
+            'technical_skills': technical_skills,
+            'skill_words': skill_words,
+            'skill_phrases': skill_phrases,
+            # Автомат строится один раз на профиль и находит все фразы за один проход по тексту
+            'skill_phrase_automaton': _build_keyword_automaton(
+                {phrase: phrase for phrase in skill_phrases}
+            ) if skill_phrases else None,
+            'german_level_num': self._german_level_to_number(user_german_level) if user_german_level else 0
+        }
+    
+    def _job_features(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Данные вакансии для анализа, которые не зависят от профиля
+        
+        Вакансии из поиска повторяются у разных пользователей, поэтому признаки
+        кэшируются по хэшу полей вакансии (LRU на JOB_FEATURE_CACHE_SIZE вакансий,
+        см. _analyze_compatibility_batch).
+        """
+        job_text = (job.get('description', '') + ' ' + job.get('requirements', '')).lower()
+        job_features = {
+            'location': job.get('location', '').lower(),
+            'title': job.get('title', '').lower(),
+            'text': job_text,
+            'words': frozenset(_WORD_RE.findall(job_text)),
+            'german_level': self._extract_german_level_from_job(job_text),
+            'experience': self._extract_experience_from_job(job_text)
+        }
+        return job_features
     
-    def _analyze_location_match(self, job: Dict[str, Any], collected_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_location_match(self,
+                                job_features: Dict[str, Any],
+                                collected_data: Dict[str, Any],
+                                features: Dict[str, Any]) -> CategoryResult:
         """Анализ соответствия по локации"""
-        result = {'score': 0, 'max_score': 25, 'strengths': [], 'concerns': [], 'recommendations': []}
+        result = CategoryResult(max_score=25)
         
-        job_location = job.get('location', '').lower()
-        preferred_city = collected_data.get('preferred_city', '').lower()
+        job_location = job_features['location']
+        preferred_city = features['preferred_city']
         work_format = collected_data.get('work_format', '')
         
         if preferred_city and preferred_city in job_location:
-            result['score'] = 25
-            result['strengths'].append(f"🎯 Вакансия в желаемом городе: {job_location.title()}")
+            result.score = 25
+            result.strengths.append(f"🎯 Вакансия в желаемом городе: {job_location.title()}")
         elif 'remote' in job_location and work_format == 'remote':
-            result['score'] = 20
-            result['strengths'].append("🏠 Удаленная работа соответствует предпочтениям")
+            result.score = 20
+            result.strengths.append("🏠 Удаленная работа соответствует предпочтениям")
         elif preferred_city:
             # Проверяем близкие города
             if self._are_cities_nearby(preferred_city, job_location):
-                result['score'] = 15
-                result['recommendations'].append(f"📍 Рассмотрите переезд: {job_location.title()} недалеко от {preferred_city.title()}")
+                result.score = 15
+                result.recommendations.append(f"📍 Рассмотрите переезд: {job_location.title()} недалеко от {preferred_city.title()}")
             else:
-                result['score'] = 5
-                result['concerns'].append(f"📍 Другой город: {job_location.title()} вместо {preferred_city.title()}")
+                result.score = 5
+                result.concerns.append(f"📍 Другой город: {job_location.title()} вместо {preferred_city.title()}")
         else:
-            result['score'] = 10
-            result['recommendations'].append("📍 Укажите предпочтения по городу для лучшего поиска")
+            result.score = 10
+            result.recommendations.append("📍 Укажите предпочтения по городу для лучшего поиска")
         
         return result
     
-    def _analyze_skills_match(self, job: Dict[str, Any], collected_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_skills_match(self,
+                              job_features: Dict[str, Any],
+                              collected_data: Dict[str, Any],
+                              features: Dict[str, Any]) -> CategoryResult:
         """Анализ соответствия навыков"""
-        result = {'score': 0, 'max_score': 30, 'strengths': [], 'concerns': [], 'recommendations': []}
+        result = CategoryResult(max_score=30)
         
-        job_description = (job.get('description', '') + ' ' + job.get('requirements', '')).lower()
-        job_title = job.get('title', '').lower()
+        job_description = job_features['text']
+        job_title = job_features['title']
         
-        profession = collected_data.get('profession', '').lower()
-        technical_skills = [skill.lower() for skill in collected_data.get('technical_skills', [])]
-        experience_years = collected_data.get('experience_years', 0)
+        profession = features['profession']
+        technical_skills = features['technical_skills']
         
         # Проверка соответствия профессии
         if profession and profession in job_title:
-            result['score'] += 15
-            result['strengths'].append(f"💼 Точное соответствие профессии: {profession}")
-        elif profession and any(word in job_title for word in profession.split()):
-            result['score'] += 10
-            result['strengths'].append(f"💼 Частичное соответствие профессии: {profession}")
-        
-        # Проверка технических навыков
-        matching_skills = []
-        for skill in technical_skills:
-            if skill in job_description:
-                matching_skills.append(skill)
+            result.score += 15
+            result.strengths.append(f"💼 Точное соответствие профессии: {profession}")
+        elif profession and any(word in job_title for word in features['profession_words']):
+            result.score += 10
+            result.strengths.append(f"💼 Частичное соответствие профессии: {profession}")
+        
+        # Проверка технических навыков: пересечение множеств слов и один проход
+        # автомата по тексту вакансии для навыков-фраз
+        common_words = features['skill_words'] & job_features['words']
+        automaton = features['skill_phrase_automaton']
+        if automaton is not None:
+            common_words |= {phrase for _, phrase in automaton.iter(job_description)}
+        else:
+            common_words |= {phrase for phrase in features['skill_phrases'] if phrase in job_description}
+        matching_skills = [skill for skill in technical_skills if skill in common_words]
         
         if matching_skills:
             skills_score = min(len(matching_skills) * 3, 15)
-            result['score'] += skills_score
-            result['strengths'].append(f"🛠 Совпадают навыки: {', '.join(matching_skills)}")
+            result.score += skills_score
+            result.strengths.append(f"🛠 Совпадают навыки: {', '.join(matching_skills)}")
         else:
-            result['concerns'].append("🛠 Не найдено явных совпадений по техническим навыкам")
-            result['recommendations'].append("📚 Изучите требования вакансии и подготовьте примеры использования нужных технологий")
+            result.concerns.append("🛠 Не найдено явных совпадений по техническим навыкам")
+            result.recommendations.append("📚 Изучите требования вакансии и подготовьте примеры использования нужных технологий")
         
         return result
     
-    def _analyze_language_requirements(self, job: Dict[str, Any], collected_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_language_requirements(self,
+                                       job_features: Dict[str, Any],
+                                       collected_data: Dict[str, Any],
+                                       features: Dict[str, Any]) -> CategoryResult:
         """Анализ языковых требований"""
-        result = {'score': 0, 'max_score': 20, 'strengths': [], 'concerns': [], 'recommendations': []}
+        result = CategoryResult(max_score=20)
         
-        job_text = (job.get('description', '') + ' ' + job.get('requirements', '')).lower()
         user_german_level = collected_data.get('german_level', '')
         
-        # Определяем требуемый уровень немецкого
-        required_level = self._extract_german_level_from_job(job_text)
+        # Требуемый уровень немецкого (извлечен из текста вакансии заранее)
+        required_level = job_features['german_level']
         
         if user_german_level and required_level:
-            user_level_num = self._german_level_to_number(user_german_level)
+            user_level_num = features['german_level_num']
             required_level_num = self._german_level_to_number(required_level)
             
             if user_level_num >= required_level_num:
-                result['score'] = 20
-                result['strengths'].append(f"🇩🇪 Уровень немецкого {user_german_level} соответствует требованиям ({required_level})")
+                result.score = 20
+                result.strengths.append(f"🇩🇪 Уровень немецкого {user_german_level} соответствует требованиям ({required_level})")
             elif user_level_num >= required_level_num - 1:
-                result['score'] = 15
-                result['strengths'].append(f"🇩🇪 Уровень немецкого {user_german_level} близок к требованиям ({required_level})")
-                result['recommendations'].append("📖 Рассмотрите возможность повышения уровня немецкого")
+                result.score = 15
+                result.strengths.append(f"🇩🇪 Уровень немецкого {user_german_level} близок к требованиям ({required_level})")
+                result.recommendations.append("📖 Рассмотрите возможность повышения уровня немецкого")
             else:
-                result['score'] = 5
-                result['concerns'].append(f"🇩🇪 Требуется {required_level}, у вас {user_german_level}")
-                result['recommendations'].append("📖 Необходимо значительно улучшить уровень немецкого языка")
+                result.score = 5
+                result.concerns.append(f"🇩🇪 Требуется {required_level}, у вас {user_german_level}")
+                result.recommendations.append("📖 Необходимо значительно улучшить уровень немецкого языка")
         else:
-            result['score'] = 10
+            result.score = 10
             if not user_german_level:
-                result['recommendations'].append("🇩🇪 Укажите ваш уровень немецкого языка")
+                result.recommendations.append("🇩🇪 Укажите ваш уровень немецкого языка")
             else:
-                result['recommendations'].append("🇩🇪 В вакансии не указаны требования к немецкому языку")
+                result.recommendations.append("🇩🇪 В вакансии не указаны требования к немецкому языку")
         
         return result
     
-    def _analyze_experience_match(self, job: Dict[str, Any], collected_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_experience_match(self, job_features: Dict[str, Any], collected_data: Dict[str, Any]) -> CategoryResult:
         """Анализ соответствия опыта"""
-        result = {'score': 0, 'max_score': 15, 'strengths': [], 'concerns': [], 'recommendations': []}
+        result = CategoryResult(max_score=15)
         
-        job_text = (job.get('description', '') + ' ' + job.get('requirements', '')).lower()
         user_experience = collected_data.get('experience_years', 0)
         
-        # Извлекаем требуемый опыт из описания вакансии
-        required_experience = self._extract_experience_from_job(job_text)
+        # Требуемый опыт (извлечен из описания вакансии заранее)
+        required_experience = job_features['experience']
         
         if required_experience is not None and user_experience > 0:
             if user_experience >= required_experience:
-                result['score'] = 15
-                result['strengths'].append(f"⏱ Опыт {user_experience} лет соответствует требованиям ({required_experience}+ лет)")
+                result.score = 15
+                result.strengths.append(f"⏱ Опыт {user_experience} лет соответствует требованиям ({required_experience}+ лет)")
             elif user_experience >= required_experience - 1:
-                result['score'] = 10
-                result['strengths'].append(f"⏱ Опыт {user_experience} лет близок к требованиям ({required_experience}+ лет)")
+                result.score = 10
+                result.strengths.append(f"⏱ Опыт {user_experience} лет близок к требованиям ({required_experience}+ лет)")
             else:
-                result['score'] = 5
-                result['concerns'].append(f"⏱ Требуется {required_experience}+ лет, у вас {user_experience} лет")
-                result['recommendations'].append("💼 Подчеркните в резюме все релевантные проекты и достижения")
+                result.score = 5
+                result.concerns.append(f"⏱ Требуется {required_experience}+ лет, у вас {user_experience} лет")
+                result.recommendations.append("💼 Подчеркните в резюме все релевантные проекты и достижения")
         else:
-            result['score'] = 8
+            result.score = 8
             if user_experience == 0:
-                result['recommendations'].append("⏱ Укажите ваш опыт работы для более точного анализа")
+                result.recommendations.append("⏱ Укажите ваш опыт работы для более точного анализа")
             else:
-                result['recommendations'].append("⏱ В вакансии не указаны четкие требования к опыту")
+                result.recommendations.append("⏱ В вакансии не указаны четкие требования к опыту")
         
         return result
     
-    def _analyze_preferences_match(self, job: Dict[str, Any], collected_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_preferences_match(self, job_features: Dict[str, Any], collected_data: Dict[str, Any]) -> CategoryResult:
         """Анализ соответствия предпочтений"""
-        result = {'score': 0, 'max_score': 10, 'strengths': [], 'concerns': [], 'recommendations': []}
+        result = CategoryResult(max_score=10)
         
-        job_text = (job.get('description', '') + ' ' + job.get('requirements', '')).lower()
+        job_text = job_features['text']
         salary_expectations = collected_data.get('salary_expectations', '')
         work_format = collected_data.get('work_format', '')
         
         # Анализ формата работы
         if work_format == 'remote' and 'remote' in job_text:
-            result['score'] += 5
-            result['strengths'].append("🏠 Удаленная работа как предпочитаете")
+            result.score += 5
+            result.strengths.append("🏠 Удаленная работа как предпочитаете")
         elif work_format == 'office' and 'office' in job_text:
-            result['score'] += 5
-            result['strengths'].append("🏢 Офисная работа как предпочитаете")
+            result.score += 5
+            result.strengths.append("🏢 Офисная работа как предпочитаете")
         elif work_format and work_format not in job_text:
-            result['concerns'].append(f"📍 Возможно, формат работы не соответствует предпочтениям ({work_format})")
+            result.concerns.append(f"📍 Возможно, формат работы не соответствует предпочтениям ({work_format})")
         
         # Анализ зарплатных ожиданий (упрощенно)
         if salary_expectations:
-            result['score'] += 3
-            result['strengths'].append("💰 Зарплатные ожидания учтены в анализе")
+            result.score += 3
+            result.strengths.append("💰 Зарплатные ожидания учтены в анализе")
         else:
-            result['score'] += 2
-            result['recommendations'].append("💰 Укажите зарплатные ожидания для лучшего подбора")
+            result.score += 2
+            result.recommendations.append("💰 Укажите зарплатные ожидания для лучшего подбора")
         
         return result
     
     def _are_cities_nearby(self, city1: str, city2: str) -> bool:
         """Проверка близости городов"""
-        nearby_cities = {
-            'berlin': ['potsdam', 'brandenburg'],
-            'munich': ['münchen', 'augsburg'],
-            'hamburg': ['bremen', 'lübeck'],
-            'frankfurt': ['mainz', 'darmstadt', 'wiesbaden'],
-            'cologne': ['köln', 'düsseldorf', 'bonn'],
-            'stuttgart': ['karlsruhe', 'heilbronn']
-        }
+        # Быстрый путь: оба значения - точные названия городов из таблицы
+        if tuple(sorted((city1.strip(), city2.strip()))) in _NEARBY_CITY_PAIRS:
+            return True
         
-        for main_city, nearby in nearby_cities.items():
+        # Локации вакансий приходят строками вида "10115 berlin", поэтому
+        # остальные случаи проверяются по вхождению подстроки
+        for main_city, nearby in _NEARBY_CITIES:
             if (main_city in city1 and any(c in city2 for c in nearby)) or \
                (main_city in city2 and any(c in city1 for c in nearby)):
                 return True
@@ -1271,18 +2507,10 @@ Your response (in English):"""
     
     def _extract_german_level_from_job(self, job_text: str) -> str:
         """Извлечение требуемого уровня немецкого из описания"""
-        import re
-        
-        # Паттерны для поиска уровня немецкого
-        patterns = [
-            r'german.*?([abc][12])',
-            r'deutsch.*?([abc][12])',
-            r'([abc][12]).*german',
-            r'([abc][12]).*deutsch'
-        ]
         
-        for pattern in patterns:
-            match = re.search(pattern, job_text, re.IGNORECASE)
+        # Паттерны проверяются по порядку: побеждает первый сработавший
+        for pattern in _JOB_GERMAN_LEVEL_PATTERNS:
+            match = pattern.search(job_text)
             if match:
                 return match.group(1).upper()
         
@@ -1298,23 +2526,14 @@ Your response (in English):"""
     
     def _german_level_to_number(self, level: str) -> int:
         """Конвертация уровня немецкого в число для сравнения"""
-        level_map = {'A1': 1, 'A2': 2, 'B1': 3, 'B2': 4, 'C1': 5, 'C2': 6}
-        return level_map.get(level.upper(), 0)
+        # Уровни обычно уже в верхнем регистре (_GERMAN_LEVELS, паттерны вакансий)
+        return _GERMAN_LEVEL_MAP.get(level) or _GERMAN_LEVEL_MAP.get(level.upper() if level else '', 0)
     
     def _extract_experience_from_job(self, job_text: str) -> int:
         """Извлечение требуемого опыта из описания"""
-        import re
-        
-        # Паттерны для поиска опыта
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*jahre?\s*erfahrung',
-            r'experience.*?(\d+)\+?\s*years?',
-            r'minimum.*?(\d+)\+?\s*years?'
-        ]
         
-        for pattern in patterns:
-            match = re.search(pattern, job_text, re.IGNORECASE)
+        for pattern in _JOB_EXPERIENCE_PATTERNS:
+            match = pattern.search(job_text)
             if match:
                 return int(match.group(1))
         
@@ -1362,16 +2581,7 @@ Your response (in English):"""
     def _create_translation_prompt(self, job_data: Dict[str, Any], target_language: str) -> str:
         """Создание промпта для перевода"""
         
-        lang_names = {
-            'ru': 'русский',
-            'en': 'английский',
-            'de': 'немецкий',
-            'uk': 'украинский',
-            'es': 'испанский',
-            'fr': 'французский'
-        }
-        
-        lang_name = lang_names.get(target_language, target_language)
+        lang_name = _TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)
         
         return f"""Переведи информацию о вакансии на {lang_name} язык.
 
@@ -1394,16 +2604,51 @@ Your response (in English):"""
 
 Только JSON, без дополнительного текста:"""
     
+    def _create_batch_translation_prompt(self, jobs: List[Dict[str, Any]], target_language: str) -> Tuple[str, str]:
+        """Промпт для перевода нескольких вакансий: (инструкции, вакансии)
+        
+        Инструкции зависят только от языка и уходят системным сообщением перед
+        вакансиями, поэтому провайдеры могут кэшировать этот префикс.
+        """
+        
+        lang_name = _TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)
+        
+        job_blocks = "\n\n".join(
+            f"""Вакансия {index}:
+Название: {job.get('title', '')}
+Компания: {job.get('company', '')}
+Локация: {job.get('location', '')}
+Описание: {job.get('description', '')}
+Требования: {job.get('requirements', '')}
+Зарплата: {job.get('salary', '')}"""
+            for index, job in enumerate(jobs)
+        )
+        
+        return _BATCH_TRANSLATION_INSTRUCTIONS.format(lang_name=lang_name), job_blocks
+    
+    def _parse_batch_translation(self, translation: str, original_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Парсинг перевода пачки вакансий (непереведенные возвращаются как есть)"""
+        translated = list(original_jobs)
+        try:
+            for item in _extract_json_array(translation):
+                if not isinstance(item, dict):
+                    continue
+                index = item.pop('index', None)
+                if isinstance(index, int) and 0 <= index < len(translated) and 'title' in item and 'description' in item:
+                    translated[index] = item
+        except Exception as e:
+            logger.error(f"Failed to parse batch translation: {e}")
+        
+        return translated
+    
     def _parse_translation(self, translation: str, original_job: Dict[str, Any]) -> Dict[str, Any]:
         """Парсинг переведенного контента"""
         try:
-            if translation and '{' in translation:
-                json_str = translation[translation.find('{'):translation.rfind('}')+1]
-                parsed = json.loads(json_str)
-                
-                # Проверяем наличие ключевых полей
-                if 'title' in parsed and 'description' in parsed:
-                    return parsed
+            parsed = _extract_json(translation)
+            
+            # Проверяем наличие ключевых полей
+            if 'title' in parsed and 'description' in parsed:
+                return parsed
                     
         except Exception as e:
             logger.error(f"Failed to parse translation: {e}")
@@ -1414,114 +2659,77 @@ Your response (in English):"""
     def _create_demo_translation(self, job_data: Dict[str, Any], target_language: str) -> str:
         """Улучшенный демо-перевод для fallback"""
         
-        # Извлекаем данные о вакансии
-        original_title = job_data.get('title', 'Software Developer')
-        original_company = job_data.get('company', 'Tech Company')
-        original_location = job_data.get('location', 'Berlin, Germany')
-        original_description = job_data.get('description', 'Interesting software development position')
-        original_requirements = job_data.get('requirements', 'Programming experience required')
-        original_salary = job_data.get('salary', 'Competitive salary')
+        # Извлекаем данные о вакансии: копируем только поля, заданные в вакансии
+        overrides = job_data.keys() & _DEMO_JOB_DEFAULTS.keys()
+        fields = _demo_job_fields(
+            {**_DEMO_JOB_DEFAULTS, **{field: job_data[field] for field in overrides}} if overrides else _DEMO_JOB_DEFAULTS
+        )
         
-        translations = {
-            'ru': {
-                'title': self._translate_title_to_russian(original_title),
-                'company': original_company,
-                'location': self._translate_location_to_russian(original_location),
-                'description': f"""📋 Описание позиции:
-{self._translate_description_to_russian(original_description)}
-
-🏢 О компании: {original_company} - динамично развивающаяся компания в сфере технологий.
-
-🎯 Что предлагаем:
-• Конкурентоспособная зарплата
-• Возможность профессионального роста
-• Современные технологии и инструменты
-• Дружный коллектив профессионалов""",
-                'requirements': f"""✅ Требования:
-{self._translate_requirements_to_russian(original_requirements)}
-
-📚 Будет плюсом:
-• Опыт работы в команде
-• Знание современных методологий разработки
-• Желание изучать новые технологии""",
-                'salary': self._translate_salary_to_russian(original_salary)
-            },
-            'en': {
-                'title': self._translate_title_to_english(original_title),
-                'company': original_company,
-                'location': original_location,
-                'description': f"""📋 Position Description:
-{self._enhance_english_description(original_description)}
-
-🏢 About Company: {original_company} - rapidly growing technology company.
-
-🎯 What we offer:
-• Competitive salary package
-• Professional growth opportunities
-• Modern technologies and tools
-• Friendly team of professionals""",
-                'requirements': f"""✅ Requirements:
-{self._enhance_english_requirements(original_requirements)}
-
-📚 Nice to have:
-• Team collaboration experience
-• Knowledge of modern development methodologies
-• Willingness to learn new technologies""",
-                'salary': original_salary
-            },
-            'de': {
-                'title': self._translate_title_to_german(original_title),
-                'company': original_company,
-                'location': original_location,
-                'description': f"""📋 Stellenbeschreibung:
-{self._translate_description_to_german(original_description)}
-
-🏢 Über das Unternehmen: {original_company} - dynamisch wachsendes Technologieunternehmen.
-
-🎯 Was wir bieten:
-• Wettbewerbsfähiges Gehalt
-• Berufliche Entwicklungsmöglichkeiten
-• Moderne Technologien und Tools
-• Freundliches Profi-Team""",
-                'requirements': f"""✅ Anforderungen:
-{self._translate_requirements_to_german(original_requirements)}
-
-📚 Von Vorteil:
-• Teamarbeit-Erfahrung
-• Kenntnisse moderner Entwicklungsmethoden
-• Lernbereitschaft für neue Technologien""",
-                'salary': self._translate_salary_to_german(original_salary)
-            }
-        }
+        # Результат зависит только от языка и этих полей: соседние вакансии
+        # одной компании или без данных дают одинаковый JSON
+        cache_key = (target_language, fields)
+        try:
+            translation = self._demo_translation_cache.get(cache_key)
+        except TypeError:
+            # Нехэшируемые значения полей (например, список требований) - без кэша
+            return self._render_demo_translation(fields, target_language)
+        
+        if translation is not None:
+            self._demo_translation_cache.move_to_end(cache_key)
+            return translation
         
-        target_translation = translations.get(target_language, translations['en'])
+        translation = self._render_demo_translation(fields, target_language)
+        self._demo_translation_cache[cache_key] = translation
+        if len(self._demo_translation_cache) > DEMO_TRANSLATION_CACHE_SIZE:
+            self._demo_translation_cache.popitem(last=False)
         
-        return json.dumps({
-            'title': target_translation['title'],
-            'company': target_translation['company'],
-            'location': target_translation['location'],
-            'description': target_translation['description'],
-            'requirements': target_translation['requirements'],
-            'salary': target_translation['salary'],
-            'translation_note': f"Перевод на {self.languages.get(target_language, target_language)} выполнен автоматически"
-        }, ensure_ascii=False, indent=2)
+        return translation
+    
+    def _render_demo_translation(self, fields: Tuple[Any, ...], target_language: str) -> str:
+        """Сборка JSON демо-перевода из полей в порядке _DEMO_JOB_DEFAULTS"""
+        
+        (original_title, original_company, original_location,
+         original_description, original_requirements, original_salary) = fields
+        
+        # Переводим только на нужный язык (неизвестный язык - как английский)
+        if target_language == 'ru':
+            title = self._translate_title_to_russian(original_title)
+            location = self._translate_location_to_russian(original_location)
+            description = self._translate_description_to_russian(original_description)
+            requirements = self._translate_requirements_to_russian(original_requirements)
+            salary = self._translate_salary_to_russian(original_salary)
+        elif target_language == 'de':
+            title = self._translate_title_to_german(original_title)
+            location = original_location
+            description = self._translate_description_to_german(original_description)
+            requirements = self._translate_requirements_to_german(original_requirements)
+            salary = self._translate_salary_to_german(original_salary)
+        else:
+            title = self._translate_title_to_english(original_title)
+            location = original_location
+            description = self._enhance_english_description(original_description)
+            requirements = self._enhance_english_requirements(original_requirements)
+            salary = original_salary
+        
+        templates = _DEMO_TRANSLATION_TEMPLATES.get(target_language, _DEFAULT_DEMO_TRANSLATION_TEMPLATES)
+        
+        # Схема ответа фиксирована: экранируем только значения, без indent-кодировщика json
+        return _DEMO_JSON_TEMPLATE.format(
+            title=_json_value(title),
+            company=_json_value(original_company),
+            location=_json_value(location),
+            description=_json_value(templates['description'].format(description=description, company=original_company)),
+            requirements=_json_value(templates['requirements'].format(requirements=requirements)),
+            salary=_json_value(salary),
+            translation_note=_json_value(
+                f"Перевод на {self.languages.get(target_language, target_language)} выполнен автоматически"
+            )
+        )
     
     def _translate_title_to_russian(self, title: str) -> str:
         """Перевод названия на русский"""
-        common_translations = {
-            'software developer': 'Разработчик ПО',
-            'full stack developer': 'Fullstack разработчик',
-            'frontend developer': 'Frontend разработчик',
-            'backend developer': 'Backend разработчик',
-            'data scientist': 'Специалист по данным',
-            'project manager': 'Проект-менеджер',
-            'ui/ux designer': 'UI/UX дизайнер',
-            'marketing manager': 'Менеджер по маркетингу',
-            'sales manager': 'Менеджер по продажам'
-        }
-        
         title_lower = title.lower()
-        for eng, rus in common_translations.items():
+        for eng, rus in _RU_TITLE_TRANSLATIONS.items():
             if eng in title_lower:
                 return rus
                 
@@ -1551,17 +2759,8 @@ Your response (in English):"""
     
     def _translate_location_to_russian(self, location: str) -> str:
         """Перевод локации на русский"""
-        city_translations = {
-            'berlin': 'Берлин',
-            'munich': 'Мюнхен',
-            'hamburg': 'Гамбург',
-            'frankfurt': 'Франкфурт',
-            'cologne': 'Кёльн',
-            'stuttgart': 'Штутгарт'
-        }
-        
         location_lower = location.lower()
-        for eng, rus in city_translations.items():
+        for eng, rus in _RU_CITY_TRANSLATIONS.items():
             if eng in location_lower:
                 return location.replace(eng.title(), rus)
                 
@@ -1584,17 +2783,8 @@ Your response (in English):"""
         return f"{requirements}\n• 2+ years of relevant experience\n• Strong problem-solving skills\n• Team collaboration abilities"
     
     def _translate_title_to_german(self, title: str) -> str:
-        german_translations = {
-            'software developer': 'Softwareentwickler',
-            'full stack developer': 'Fullstack-Entwickler',
-            'frontend developer': 'Frontend-Entwickler',
-            'backend developer': 'Backend-Entwickler',
-            'project manager': 'Projektmanager',
-            'designer': 'Designer'
-        }
-        
         title_lower = title.lower()
-        for eng, ger in german_translations.items():
+        for eng, ger in _DE_TITLE_TRANSLATIONS.items():
             if eng in title_lower:
                 return ger
                 
@@ -1611,206 +2801,7 @@ Your response (in English):"""
             return 'Attraktives Gehalt (45.000-80.000 EUR/Jahr)'
         return salary
     
-    def _get_fallback_message(self, language: str) -> str:
-        """Fallback сообщение"""
-        messages = {
-            'ru': "Привет! Я AI-рекрутер, помогу найти идеальную работу в Германии. Расскажи, какую работу ищешь?",
-            'en': "Hi! I'm an AI recruiter, I'll help find the perfect job in Germany. Tell me what job you're looking for?",
-            'de': "Hallo! Ich bin ein AI-Recruiter und helfe dir den perfekten Job in Deutschland zu finden. Erzähl mir, welchen Job du suchst?"
-        }
-        
-        return messages.get(language, messages['ru'])
-    
-    def _get_fallback_message_for_stage(self, stage: str, language: str) -> str:
-        """Улучшенные fallback сообщения для каждого этапа"""
-        
-        messages = {
-            'ru': {
-                'initial': """👋 Привет! Я AI-рекрутер и помогу найти идеальную работу в Германии. 
-
-Расскажи мне:
-• Какую должность ищешь? (например: разработчик, дизайнер, маркетолог)
-• В каком городе хочешь работать?
-• Какой у тебя уровень немецкого языка? (A1-C2)
-
-Начни с любого пункта! 🚀""",
-                
-                'skills': """💼 Отлично! Теперь расскажи о своем опыте:
-
-• Сколько лет работаешь в этой сфере?
-• Какие технологии/инструменты знаешь?
-• Есть ли образование или сертификаты?
-• Какие проекты реализовывал?
-
-Чем подробнее - тем лучше подберу вакансии! ⚡""",
-                
-                'preferences': """⚙️ Почти готово! Последние детали:
-
-• Какая зарплата интересна? (от ... до ... EUR)
-• Готов работать полный день или предпочитаешь частичную занятость?
-• Интересует удаленная работа или только офис?
-• Есть предпочтения по размеру компании? (стартап/корпорация)
-
-После этого найду идеальные варианты! 🎯""",
-                
-                'complete': """🎉 Профиль готов! Сейчас ищу лучшие вакансии...
-
-На основе твоих данных я найду:
-✅ Вакансии с подходящими требованиями
-✅ Позиции в выбранном городе
-✅ Работу с нужным уровнем немецкого
-✅ Соответствующую зарплатную вилку
-
-Также могу:
-🔄 Перевести любую вакансию на русский
-📊 Проанализировать совместимость
-✍️ Составить сопроводительное письмо
-
-Вот что нашел для тебя:"""
-            },
-            'en': {
-                'initial': """👋 Hi! I'm an AI recruiter helping find perfect jobs in Germany.
-
-Tell me:
-• What position are you looking for? (e.g., developer, designer, marketer)
-• Which city would you like to work in?
-• What's your German level? (A1-C2)
-
-Start with any point! 🚀""",
-                
-                'skills': """💼 Great! Now tell me about your experience:
-
-• How many years have you worked in this field?
-• What technologies/tools do you know?
-• Do you have education or certifications?
-• What projects have you implemented?
-
-The more details, the better I can match jobs! ⚡""",
-                
-                'preferences': """⚙️ Almost ready! Final details:
-
-• What salary range interests you? (from ... to ... EUR)
-• Full-time or part-time preference?
-• Interested in remote work or office only?
-• Company size preference? (startup/corporation)
-
-After this, I'll find perfect matches! 🎯""",
-                
-                'complete': """🎉 Profile ready! Searching for best jobs...
-
-Based on your data, I'll find:
-✅ Jobs matching your requirements
-✅ Positions in your chosen city
-✅ Work with your German level
-✅ Matching salary range
-
-I can also:
-🔄 Translate any job to English
-📊 Analyze compatibility
-✍️ Create cover letters
-
-Here's what I found for you:"""
-            },
-            'de': {
-                'initial': """👋 Hallo! Ich bin ein AI-Recruiter und helfe bei der Jobsuche in Deutschland.
-
-Erzähl mir:
-• Welche Position suchst du? (z.B. Entwickler, Designer, Marketer)
-• In welcher Stadt möchtest du arbeiten?
-• Wie ist dein Deutschniveau? (A1-C2)
-
-Fang mit einem Punkt an! 🚀""",
-                
-                'skills': """💼 Toll! Jetzt erzähl von deiner Erfahrung:
-
-• Wie viele Jahre Berufserfahrung hast du?
-• Welche Technologien/Tools beherrschst du?
-• Hast du Ausbildung oder Zertifikate?
-• Welche Projekte hast du umgesetzt?
-
-Je mehr Details, desto besser kann ich Jobs finden! ⚡""",
-                
-                'preferences': """⚙️ Fast fertig! Letzte Details:
-
-• Welches Gehalt stellst du dir vor? (von ... bis ... EUR)
-• Vollzeit oder Teilzeit?
-• Remote-Arbeit oder nur Büro?
-• Präferenz für Unternehmensgröße? (Startup/Konzern)
-
-Danach finde ich perfekte Stellen! 🎯""",
-                
-                'complete': """🎉 Profil fertig! Suche beste Jobs...
-
-Basierend auf deinen Daten finde ich:
-✅ Jobs mit passenden Anforderungen
-✅ Stellen in deiner gewählten Stadt
-✅ Arbeit mit deinem Deutschniveau
-✅ Passende Gehaltsvorstellungen
-
-Ich kann auch:
-🔄 Jobs ins Deutsche übersetzen
-📊 Kompatibilität analysieren
-✍️ Anschreiben erstellen
-
-Hier ist was ich für dich gefunden habe:"""
-            }
-        }
-        
-        return messages.get(language, messages['ru']).get(stage, messages['ru']['initial'])
-    
-    def _get_completion_message(self, language: str) -> str:
-        """Улучшенное сообщение о завершении"""
-        messages = {
-            'ru': """🎉 Отлично! Ваш профиль готов!
-
-Теперь я могу предложить вам:
-
-🎯 **ПЕРСОНАЛЬНЫЕ РЕКОМЕНДАЦИИ ВАКАНСИЙ**
-• Подобрал лучшие варианты под ваш профиль
-• Проанализировал совместимость с каждой позицией
-• Указал конкретные шаги для каждой вакансии
-
-💡 **ДОПОЛНИТЕЛЬНЫЕ ВОЗМОЖНОСТИ:**
-🔄 **Перевод вакансий** - переведу любую вакансию на русский
-📊 **Анализ совместимости** - детальный разбор ваших шансов
-✍️ **Сопроводительные письма** - составлю для каждой вакансии
-📝 **Улучшение резюме** - подскажу как адаптировать под вакансию
-
-⭐ Вот лучшие вакансии специально для вас:""",
-            
-            'en': """🎉 Excellent! Your profile is ready!
-
-Now I can offer you:
-
-🎯 **PERSONALIZED JOB RECOMMENDATIONS**
-• Selected best matches for your profile
-• Analyzed compatibility with each position
-• Provided specific action steps for each job
-
-💡 **ADDITIONAL FEATURES:**
-🔄 **Job Translation** - translate any job to English
-📊 **Compatibility Analysis** - detailed breakdown of your chances
-✍️ **Cover Letters** - create personalized letters for each job
-📝 **Resume Improvement** - advice on adapting to specific jobs
-
-⭐ Here are the best jobs specifically for you:""",
-            
-            'de': """🎉 Ausgezeichnet! Ihr Profil ist fertig!
-
-Jetzt kann ich Ihnen anbieten:
-
-🎯 **PERSONALISIERTE STELLENEMPFEHLUNGEN**
-• Beste Übereinstimmungen für Ihr Profil ausgewählt
-• Kompatibilität mit jeder Position analysiert
-• Spezifische Handlungsschritte für jede Stelle bereitgestellt
-
-💡 **ZUSÄTZLICHE FUNKTIONEN:**
-🔄 **Stellenübersetzung** - übersetze jede Stelle ins Deutsche
-📊 **Kompatibilitätsanalyse** - detaillierte Aufschlüsselung Ihrer Chancen
-✍️ **Anschreiben** - erstelle personalisierte Briefe für jede Stelle
-📝 **Lebenslauf-Verbesserung** - Ratschläge zur Anpassung an spezifische Jobs
-
-⭐ Hier sind die besten Jobs speziell für Sie:"""
-        }
-        
-        return messages.get(language, messages['ru'])
\ No newline at end of file
+    # Тексты по умолчанию не зависят от экземпляра: методы - псевдонимы функций модуля
+    _get_fallback_message = staticmethod(_fallback_message)
+    _get_fallback_message_for_stage = staticmethod(_fallback_message_for_stage)
+    _get_completion_message = staticmethod(_completion_message)
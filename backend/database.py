@@ -4,13 +4,28 @@ from contextlib import asynccontextmanager
 import os
 from pathlib import Path
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import logging
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _dumps(data: Any) -> str:
+    """Сериализация в JSON для хранения (orjson, если установлен)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # Типы, которые orjson не сериализует (например, одиночные суррогаты) - через json
+            pass
+    return json.dumps(data, ensure_ascii=False)
+
 class SQLiteDatabase:
     def __init__(self, db_path: str = None):
         # Используем переменную окружения или значение по умолчанию
@@ -229,6 +244,51 @@ class SQLiteDatabase:
             )
         ''')
 
+        # Профили AI-рекрутера: снимок профиля + изменяемый заголовок (этап, собранные данные)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ai_recruiter_profiles (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                profile_data TEXT NOT NULL,
+                header_data TEXT,
+                stage TEXT DEFAULT 'initial',
+                progress INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
+        
+        # Добавляем поле header_data если его нет (для существующих баз данных)
+        try:
+            cursor.execute('ALTER TABLE ai_recruiter_profiles ADD COLUMN header_data TEXT')
+            logger.info("Added header_data column to ai_recruiter_profiles table")
+        except sqlite3.OperationalError:
+            pass
+        
+        # Журнал ходов разговора с AI-рекрутером (дописывается, а не перезаписывается)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ai_recruiter_turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                turn_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_ai_recruiter_turns_user 
+            ON ai_recruiter_turns (user_id, id)
+        ''')
+
+        # Кэш ответов LLM (ключ - хэш провайдера, модели, промпта и max_tokens)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
         # Заполним начальные тексты
         cursor.execute('''
             INSERT OR IGNORE INTO app_texts (id, key_name, text_value, description, category)
@@ -1136,6 +1196,7 @@ class SQLiteDatabase:
                     id TEXT PRIMARY KEY,
                     user_id TEXT NOT NULL,
                     profile_data TEXT NOT NULL,
+                    header_data TEXT,
                     stage TEXT DEFAULT 'initial',
                     progress INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -1152,16 +1213,64 @@ class SQLiteDatabase:
             ''', (
                 f"ai_profile_{user_id}",
                 user_id,
-                json.dumps(profile_data),
+                _dumps(profile_data),
                 profile_data.get('stage', 'initial'),
                 profile_data.get('progress', 0),
                 profile_data.get('created_at', datetime.utcnow().isoformat()),
                 datetime.utcnow().isoformat()
             ))
+            
+            # Полный снимок уже содержит всю историю, журнал ходов начинается заново
+            await conn.execute('''
+                DELETE FROM ai_recruiter_turns WHERE user_id = ?
+            ''', (user_id,))
             await conn.commit()
         
         return f"ai_profile_{user_id}"
 
+    async def append_ai_recruiter_turns(self,
+                                        user_id: str,
+                                        turns: List[Dict[str, Any]],
+                                        keep_last: Optional[int] = None):
+        """Добавление ходов разговора в журнал одной транзакцией (без перезаписи профиля)
+        
+        keep_last - сколько последних ходов пользователя оставить в журнале;
+        более старые удаляются в той же транзакции
+        """
+        created_at = datetime.utcnow().isoformat()
+        async with self.get_connection() as conn:
+            await conn.executemany('''
+                INSERT INTO ai_recruiter_turns (user_id, turn_data, created_at)
+                VALUES (?, ?, ?)
+            ''', [(user_id, _dumps(turn), created_at) for turn in turns])
+            if keep_last is not None:
+                await conn.execute('''
+                    DELETE FROM ai_recruiter_turns 
+                    WHERE user_id = ? AND id NOT IN (
+                        SELECT id FROM ai_recruiter_turns 
+                        WHERE user_id = ? 
+                        ORDER BY id DESC 
+                        LIMIT ?
+                    )
+                ''', (user_id, user_id, keep_last))
+            await conn.commit()
+
+    async def update_ai_recruiter_header(self, user_id: str, header_data: Dict[str, Any]) -> bool:
+        """Обновление изменяемых полей профиля (stage, collected_data, last_interaction)"""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute('''
+                UPDATE ai_recruiter_profiles 
+                SET header_data = ?, stage = ?, updated_at = ?
+                WHERE user_id = ?
+            ''', (
+                _dumps(header_data),
+                header_data.get('stage', 'initial'),
+                datetime.utcnow().isoformat(),
+                user_id
+            ))
+            await conn.commit()
+            return cursor.rowcount > 0
+
     async def get_ai_recruiter_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Получение профиля AI-рекрутера"""
         async with self.get_connection() as conn:
@@ -1171,6 +1280,7 @@ class SQLiteDatabase:
                     id TEXT PRIMARY KEY,
                     user_id TEXT NOT NULL,
                     profile_data TEXT NOT NULL,
+                    header_data TEXT,
                     stage TEXT DEFAULT 'initial',
                     progress INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -1184,14 +1294,45 @@ class SQLiteDatabase:
                 WHERE user_id = ?
             ''', (user_id,)) as cursor:
                 row = await cursor.fetchone()
-                if row:
-                    profile = dict(row)
-                    try:
-                        profile['profile_data'] = json.loads(profile['profile_data'])
-                        return profile['profile_data']
-                    except:
-                        return None
+            if not row:
                 return None
+            
+            try:
+                profile_data = self._merge_ai_recruiter_header(dict(row))
+            except:
+                return None
+            
+            # Дописываем ходы из журнала к истории из снимка
+            async with conn.execute('''
+                SELECT turn_data FROM ai_recruiter_turns 
+                WHERE user_id = ? 
+                ORDER BY id
+            ''', (user_id,)) as cursor:
+                turns = await cursor.fetchall()
+            if turns:
+                history = profile_data.setdefault('conversation_history', [])
+                history.extend(self._parse_ai_recruiter_turns(user_id, [turn['turn_data'] for turn in turns]))
+            
+            return profile_data
+
+    @staticmethod
+    def _parse_ai_recruiter_turns(user_id: str, raw_turns: List[str]) -> List[Dict[str, Any]]:
+        """Разбор ходов из журнала; поврежденные записи пропускаются"""
+        turns = []
+        for raw_turn in raw_turns:
+            try:
+                turns.append(json.loads(raw_turn))
+            except (TypeError, ValueError):
+                logger.warning(f"Skipping malformed AI recruiter turn for user {user_id}")
+        return turns
+
+    @staticmethod
+    def _merge_ai_recruiter_header(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Снимок профиля с наложенными поверх полями заголовка"""
+        profile_data = json.loads(row['profile_data'])
+        if row.get('header_data'):
+            profile_data.update(json.loads(row['header_data']))
+        return profile_data
 
     async def delete_ai_recruiter_profile(self, user_id: str) -> bool:
         """Удаление профиля AI-рекрутера"""
@@ -1200,6 +1341,10 @@ class SQLiteDatabase:
                 DELETE FROM ai_recruiter_profiles 
                 WHERE user_id = ?
             ''', (user_id,))
+            await conn.execute('''
+                DELETE FROM ai_recruiter_turns 
+                WHERE user_id = ?
+            ''', (user_id,))
             
             await conn.commit()
             return cursor.rowcount > 0
@@ -1213,6 +1358,7 @@ class SQLiteDatabase:
                     id TEXT PRIMARY KEY,
                     user_id TEXT NOT NULL,
                     profile_data TEXT NOT NULL,
+                    header_data TEXT,
                     stage TEXT DEFAULT 'initial',
                     progress INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -1228,20 +1374,62 @@ class SQLiteDatabase:
                 ORDER BY arp.updated_at DESC
             ''') as cursor:
                 rows = await cursor.fetchall()
-                profiles = []
-                for row in rows:
-                    profile = dict(row)
-                    try:
-                        profile_data = json.loads(profile['profile_data'])
-                        profile.update({
-                            'user_email': profile['email'],
-                            'user_name': profile['name'],
-                            'profile_data': profile_data
-                        })
-                        profiles.append(profile)
-                    except:
-                        continue
-                return profiles
+            
+            # Журнал ходов всех пользователей одним запросом
+            turns_by_user: Dict[str, List[str]] = {}
+            async with conn.execute('''
+                SELECT user_id, turn_data FROM ai_recruiter_turns ORDER BY id
+            ''') as cursor:
+                async for turn in cursor:
+                    turns_by_user.setdefault(turn['user_id'], []).append(turn['turn_data'])
+            
+            profiles = []
+            for row in rows:
+                profile = dict(row)
+                try:
+                    profile_data = self._merge_ai_recruiter_header(profile)
+                    if profile['user_id'] in turns_by_user:
+                        profile_data.setdefault('conversation_history', []).extend(
+                            self._parse_ai_recruiter_turns(profile['user_id'], turns_by_user[profile['user_id']])
+                        )
+                    profile.update({
+                        'user_email': profile['email'],
+                        'user_name': profile['name'],
+                        'profile_data': profile_data
+                    })
+                    profiles.append(profile)
+                except:
+                    continue
+            return profiles
+
+    # =====================================================
+    # КЭШ ОТВЕТОВ LLM
+    # =====================================================
+
+    async def get_llm_cache_entry(self, cache_key: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Получение закэшированного ответа LLM (не старше max_age секунд, если задано)"""
+        oldest = (datetime.utcnow() - timedelta(seconds=max_age)).isoformat() if max_age is not None else ''
+        async with self.get_connection() as conn:
+            async with conn.execute('''
+                SELECT response FROM llm_response_cache 
+                WHERE cache_key = ? AND created_at >= ?
+            ''', (cache_key, oldest)) as cursor:
+                row = await cursor.fetchone()
+                return row['response'] if row else None
+
+    async def save_llm_cache_entry(self, cache_key: str, response: str, max_age: Optional[float] = None):
+        """Сохранение ответа LLM в кэш; записи старше max_age секунд удаляются"""
+        now = datetime.utcnow()
+        async with self.get_connection() as conn:
+            await conn.execute('''
+                INSERT OR REPLACE INTO llm_response_cache (cache_key, response, created_at)
+                VALUES (?, ?, ?)
+            ''', (cache_key, response, now.isoformat()))
+            if max_age is not None:
+                await conn.execute('''
+                    DELETE FROM llm_response_cache WHERE created_at < ?
+                ''', ((now - timedelta(seconds=max_age)).isoformat(),))
+            await conn.commit()
 
 # Глобальный экземпляр базы данных
 db = SQLiteDatabase()
\ No newline at end of file
@@ -61,9 +61,14 @@ class JobSearchService:
         }
 
     async def _get_session(self):
-        """Get or create aiohttp session"""
+        """Get or create aiohttp session
+        
+        The session is shared by all searches, so its pooled connector keeps the
+        TCP/TLS connection to the API alive between requests.
+        """
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector)
         return self.session
 
     async def close_session(self):
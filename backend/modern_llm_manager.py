@@ -37,6 +37,9 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Системное сообщение по умолчанию (анализ документов)
+DEFAULT_SYSTEM_MESSAGE = "You are a precise document analyzer. Extract ONLY factual information from documents. IMPORTANT: Always respond in the language requested in the user's prompt. Do NOT translate the document content, but DO respond in the requested language. If the prompt asks for Russian, respond in Russian. If it asks for English, respond in English. If it asks for German, respond in German. DO NOT interpret, assume, or add information that is not explicitly written in the text."
+
 class ModernLLMProvider(ABC):
     """Абстрактный класс для современных провайдеров LLM"""
 
@@ -46,8 +49,12 @@ class ModernLLMProvider(ABC):
         self.name = self.__class__.__name__
 
     @abstractmethod
-    async def generate_content(self, prompt: str, image_path: Optional[str] = None) -> str:
-        """Генерация контента с опциональным изображением"""
+    async def generate_content(self, prompt: str, image_path: Optional[str] = None, system_message: Optional[str] = None) -> str:
+        """Генерация контента с опциональным изображением
+        
+        system_message заменяет системное сообщение по умолчанию. Неизменный системный
+        промпт отправляется первым, что позволяет провайдерам кэшировать этот префикс.
+        """
         pass
 
     @abstractmethod
@@ -62,7 +69,7 @@ class ModernGeminiProvider(ModernLLMProvider):
         super().__init__(api_key, model_name)
         self.session_id = f"gemini_session_{hash(api_key)}"
 
-    async def generate_content(self, prompt: str, image_path: Optional[str] = None) -> str:
+    async def generate_content(self, prompt: str, image_path: Optional[str] = None, system_message: Optional[str] = None) -> str:
         try:
             if not EMERGENT_INTEGRATIONS_AVAILABLE:
                 # Fallback mode - возвращаем информативное сообщение
@@ -83,7 +90,7 @@ class ModernGeminiProvider(ModernLLMProvider):
             chat = LlmChat(
                 api_key=self.api_key,
                 session_id=self.session_id,
-                system_message="You are a precise document analyzer. Extract ONLY factual information from documents. IMPORTANT: Always respond in the language requested in the user's prompt. Do NOT translate the document content, but DO respond in the requested language. If the prompt asks for Russian, respond in Russian. If it asks for English, respond in English. If it asks for German, respond in German. DO NOT interpret, assume, or add information that is not explicitly written in the text."
+                system_message=system_message or DEFAULT_SYSTEM_MESSAGE
             ).with_model("gemini", self.model_name)
 
             # Создаем сообщение пользователя
@@ -123,7 +130,7 @@ class ModernOpenAIProvider(ModernLLMProvider):
         super().__init__(api_key, model_name)
         self.session_id = f"openai_session_{hash(api_key)}"
 
-    async def generate_content(self, prompt: str, image_path: Optional[str] = None) -> str:
+    async def generate_content(self, prompt: str, image_path: Optional[str] = None, system_message: Optional[str] = None) -> str:
         try:
             if not EMERGENT_INTEGRATIONS_AVAILABLE:
                 # Fallback mode - возвращаем информативное сообщение
@@ -144,7 +151,7 @@ class ModernOpenAIProvider(ModernLLMProvider):
             chat = LlmChat(
                 api_key=self.api_key,
                 session_id=self.session_id,
-                system_message="You are a precise document analyzer. Extract ONLY factual information from documents. IMPORTANT: Always respond in the language requested in the user's prompt. Do NOT translate the document content, but DO respond in the requested language. If the prompt asks for Russian, respond in Russian. If it asks for English, respond in English. If it asks for German, respond in German. DO NOT interpret, assume, or add information that is not explicitly written in the text."
+                system_message=system_message or DEFAULT_SYSTEM_MESSAGE
             ).with_model("openai", self.model_name)
 
             # Создаем сообщение пользователя
@@ -185,7 +192,7 @@ class ModernAnthropicProvider(ModernLLMProvider):
         super().__init__(api_key, model_name)
         self.session_id = f"anthropic_session_{hash(api_key)}"
 
-    async def generate_content(self, prompt: str, image_path: Optional[str] = None) -> str:
+    async def generate_content(self, prompt: str, image_path: Optional[str] = None, system_message: Optional[str] = None) -> str:
         try:
             if not EMERGENT_INTEGRATIONS_AVAILABLE:
                 # Fallback mode - возвращаем информативное сообщение
@@ -206,7 +213,7 @@ class ModernAnthropicProvider(ModernLLMProvider):
             chat = LlmChat(
                 api_key=self.api_key,
                 session_id=self.session_id,
-                system_message="You are a precise document analyzer. Extract ONLY factual information from documents. IMPORTANT: Always respond in the language requested in the user's prompt. Do NOT translate the document content, but DO respond in the requested language. If the prompt asks for Russian, respond in Russian. If it asks for English, respond in English. If it asks for German, respond in German. DO NOT interpret, assume, or add information that is not explicitly written in the text."
+                system_message=system_message or DEFAULT_SYSTEM_MESSAGE
             ).with_model("anthropic", self.model_name)
 
             # Создаем сообщение пользователя
@@ -364,7 +371,8 @@ class ModernLLMManager:
         model: Optional[str] = None,
         api_key: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        system_message: Optional[str] = None
     ) -> str:
         """Генерация контента с поддержкой пользовательских API ключей"""
         
@@ -373,7 +381,7 @@ class ModernLLMManager:
             try:
                 logger.info(f"Using user provider: {provider} with custom API key")
                 user_provider = self.create_user_provider(provider, model or self._get_default_model(provider), api_key)
-                response = await user_provider.generate_content(prompt, image_path)
+                response = await user_provider.generate_content(prompt, image_path, system_message)
                 if response:
                     logger.info(f"User provider {provider} successful")
                     return response
@@ -397,7 +405,7 @@ class ModernLLMManager:
             if provider_name in active_providers:
                 try:
                     provider_obj = self.providers[provider_name]
-                    response = await provider_obj.generate_content(prompt, image_path)
+                    response = await provider_obj.generate_content(prompt, image_path, system_message)
                     return response
                 except Exception as e:
                     logger.warning(f"Modern provider {provider_name} failed: {e}")
@@ -1633,6 +1633,19 @@ async def delete_admin_text(key_name: str, admin_auth: AdminAuth):
         logger.error(f"Failed to delete app text: {e}")
         raise HTTPException(status_code=500, detail="Ошибка удаления текста")
 
+# Refresh job search results
+@api_router.post("/admin/job-search-cache/clear")
+async def clear_job_search_cache(admin_auth: AdminAuth):
+    """Сбросить кэш поиска вакансий AI-рекрутера (после обновления вакансий)"""
+    if not verify_admin_password(admin_auth.password):
+        raise HTTPException(status_code=401, detail="Доступ запрещен")
+    
+    cleared = advanced_ai_recruiter.clear_job_search_cache()
+    return {
+        "status": "success",
+        "message": f"Кэш поиска вакансий сброшен ({cleared} записей)"
+    }
+
 # Get public app texts (for frontend)
 @api_router.get("/texts")
 async def get_public_texts():
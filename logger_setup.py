@@ -0,0 +1,53 @@
+"""
+Logging setup shared by the AI recruiter test scripts.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+_CONFIGURED = False
+_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_once(level: int = logging.INFO, with_time: bool = True, use_queue: bool = False):
+    """Attach a single stream handler to the root logger (later calls are no-ops)
+
+    with_time adds a short HH:MM:SS timestamp; scripts that don't need
+    wall-clock time can skip the strftime call per record.
+    use_queue hands records to a background thread through a QueueHandler,
+    so formatting and stderr writes stay off the event loop.
+    """
+    global _CONFIGURED, _LISTENER
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
+    
+    if with_time:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
+    else:
+        formatter = logging.Formatter('%(levelname)s - %(message)s')
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(formatter)
+    
+    root = logging.getLogger()
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        _LISTENER = logging.handlers.QueueListener(log_queue, handler)
+        _LISTENER.start()
+        atexit.register(stop_listener)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def stop_listener():
+    """Flush queued records and stop the background logging thread, if any"""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
@@ -0,0 +1,16 @@
+"""
+Общие настройки тестов: модули backend импортируются напрямую, а база данных
+при импорте создается во временном каталоге, а не рядом с кодом.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Добавляем backend к пути
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# database.py создает глобальный экземпляр при импорте
+os.environ.setdefault("SQLITE_DB_PATH", os.path.join(tempfile.mkdtemp(), "test.db"))
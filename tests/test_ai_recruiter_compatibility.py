@@ -0,0 +1,86 @@
+"""
+Тесты кэша анализа совместимости AI-рекрутера
+"""
+
+import asyncio
+
+import pytest
+
+from advanced_ai_recruiter import AdvancedAIRecruiter
+
+PROFILE = {
+    "collected_data": {
+        "profession": "python developer",
+        "technical_skills": ["python", "docker", "node.js"],
+        "preferred_city": "berlin",
+        "german_level": "B1",
+    }
+}
+
+JOB = {
+    "id": "job-1",
+    "title": "Python Developer",
+    "location": "Potsdam",
+    "description": "We use python, docker and node.js",
+    "requirements": "German B2, 3+ years experience",
+}
+
+
+@pytest.fixture
+def recruiter():
+    return AdvancedAIRecruiter(None)
+
+
+def test_cached_result_is_not_shared_with_caller(recruiter):
+    """Изменение результата вызывающим кодом не портит следующие попадания в кэш"""
+
+    async def scenario():
+        first = await recruiter._analyze_compatibility(PROFILE, JOB)
+        expected_strengths = list(first["strengths"])
+        first["strengths"].append("mutated")
+        first["categories"]["skills"]["strengths"].clear()
+
+        second = await recruiter._analyze_compatibility(PROFILE, JOB)
+        assert second["strengths"] == expected_strengths
+        assert second["categories"]["skills"]["strengths"]
+        assert len(recruiter._compatibility_cache) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cache_key_follows_job_content(recruiter):
+    """Та же вакансия (id) с другим описанием анализируется заново"""
+
+    async def scenario():
+        first = await recruiter._analyze_compatibility(PROFILE, JOB)
+        changed = await recruiter._analyze_compatibility(PROFILE, dict(JOB, description="Sales manager"))
+        assert changed["categories"]["skills"]["score"] < first["categories"]["skills"]["score"]
+        assert len(recruiter._compatibility_cache) == 2
+
+    asyncio.run(scenario())
+
+
+def test_batch_runs_in_one_thread_call(recruiter, monkeypatch):
+    """Промахи пачки считаются одним вызовом в потоке; ошибка вакансии не мешает остальным"""
+    calls = []
+    to_thread = asyncio.to_thread
+
+    async def counting_to_thread(func, *args, **kwargs):
+        calls.append(func.__name__)
+        return await to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+    broken = dict(JOB, location={"city": "Berlin"})
+    jobs = [JOB, broken, dict(JOB, title="Backend Developer")]
+
+    async def scenario():
+        results = await recruiter._analyze_compatibility_batch(PROFILE, jobs)
+        assert calls == ["_score_jobs"]
+        assert isinstance(results[0], dict) and isinstance(results[2], dict)
+        assert isinstance(results[1], Exception)
+
+        # Повторная пачка целиком из кэша - без потока
+        await recruiter._analyze_compatibility_batch(PROFILE, [JOB])
+        assert calls == ["_score_jobs"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+"""
+Тесты извлечения данных из ответов пользователя: автомат Ахо-Корасик, запасная регулярка и порог вызова LLM
+"""
+
+import asyncio
+
+import pytest
+
+from advanced_ai_recruiter import AdvancedAIRecruiter, AHOCORASICK_AVAILABLE
+
+
+@pytest.fixture(params=[
+    pytest.param("ahocorasick", marks=pytest.mark.skipif(not AHOCORASICK_AVAILABLE, reason="pyahocorasick не установлен")),
+    "regex",
+])
+def recruiter(request):
+    recruiter = AdvancedAIRecruiter(None)
+    if request.param == "regex":
+        # Без автоматов _iter_keyword_matches идет по запасной регулярке
+        recruiter._kw_automata = dict.fromkeys(recruiter._kw_automata)
+    return recruiter
+
+
+def test_initial_stage(recruiter):
+    data = recruiter._extract_data("Я python разработчик, живу в Берлине, немецкий B2", "initial")
+    assert data["preferred_city"] == "Berlin"
+    assert data["german_level"] == "B2"
+    assert "profession" in data
+
+
+@pytest.mark.parametrize("message, city", [
+    ("переезжаю из Мюнхена", "München"),
+    ("живу в Гамбурге", "Hamburg"),
+    ("работаю в Берлине", "Berlin"),
+])
+def test_inflected_city(recruiter, message, city):
+    assert recruiter._extract_data(message, "initial")["preferred_city"] == city
+
+
+@pytest.mark.parametrize("message, skills", [
+    ("java", {"java"}),
+    ("знаю java и javascript", {"java", "javascript"}),
+    # "java" - подстрока "javascript": совпадение по подстроке, как и раньше
+    ("javascript", {"java", "javascript"}),
+])
+def test_java_javascript_overlap(recruiter, message, skills):
+    data = recruiter._extract_data(message, "skills")
+    assert set(data["technical_skills"]) == skills
+    assert len(data["technical_skills"]) == len(skills)
+
+
+def test_level_is_a_whole_word(recruiter):
+    assert "german_level" not in recruiter._extract_data("обучаю модели на a100", "initial")
+    assert recruiter._extract_data("a100, немецкий b1-level", "initial")["german_level"] == "B1"
+
+
+def test_keywords_of_other_stages_are_ignored(recruiter):
+    assert "technical_skills" not in recruiter._extract_data("python в Берлине", "initial")
+    assert recruiter._extract_data("python в Берлине", "unknown") == {}
+
+
+@pytest.mark.parametrize("ai_augment, expected_calls", [(False, 0), (True, 1)])
+def test_covered_stage_skips_ai_analysis_unless_forced(monkeypatch, ai_augment, expected_calls):
+    """Если ключевые слова дали все основные поля этапа, LLM вызывается только с ai_augment"""
+    recruiter = AdvancedAIRecruiter(None)
+    calls = []
+
+    async def fake_ai_analyze_response(user_message, stage, user_providers):
+        calls.append(stage)
+        return {"experience_years": 3}
+
+    monkeypatch.setattr(recruiter, "_ai_analyze_response", fake_ai_analyze_response)
+    profile = {"stage": "initial"}
+    data = asyncio.run(recruiter._analyze_user_response(
+        "Я python разработчик из Берлина", profile, [("gemini", "model", "key")], ai_augment=ai_augment
+    ))
+
+    assert data["preferred_city"] == "Berlin" and "profession" in data
+    assert len(calls) == expected_calls
+    assert ("experience_years" in data) is ai_augment
+
+
+def test_uncovered_stage_runs_ai_analysis(monkeypatch):
+    recruiter = AdvancedAIRecruiter(None)
+    calls = []
+
+    async def fake_ai_analyze_response(user_message, stage, user_providers):
+        calls.append(stage)
+        return {}
+
+    monkeypatch.setattr(recruiter, "_ai_analyze_response", fake_ai_analyze_response)
+    asyncio.run(recruiter._analyze_user_response("ищу работу", {"stage": "initial"}, [("gemini", "model", "key")]))
+    assert calls == ["initial"]
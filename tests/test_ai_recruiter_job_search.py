@@ -0,0 +1,33 @@
+"""
+Тесты кэша поиска вакансий AI-рекрутера
+"""
+
+import asyncio
+
+from advanced_ai_recruiter import AdvancedAIRecruiter
+
+PARAMS = {"location": "Berlin", "language_level": "B1", "search_query": "developer"}
+
+
+def test_clear_forces_a_new_search(monkeypatch):
+    """После сброса кэша (обновление вакансий админом) поиск идет в сервис заново"""
+    recruiter = AdvancedAIRecruiter(None)
+    calls = []
+
+    async def fake_search_jobs(**search_params):
+        calls.append(search_params)
+        return {"status": "success", "jobs": [{"id": f"job-{len(calls)}"}]}
+
+    monkeypatch.setattr(recruiter.job_search_service, "search_jobs", fake_search_jobs)
+
+    async def scenario():
+        first = await recruiter._search_jobs("u1", PARAMS)
+        assert await recruiter._search_jobs("u2", PARAMS) is first
+        assert len(calls) == 1
+
+        assert recruiter.clear_job_search_cache() == 1
+        refreshed = await recruiter._search_jobs("u1", PARAMS)
+        assert refreshed["jobs"] == [{"id": "job-2"}]
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
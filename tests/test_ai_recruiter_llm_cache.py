@@ -0,0 +1,62 @@
+"""
+Тесты кэша ответов LLM AI-рекрутера: кэшируются только переводы и с ограниченным сроком
+"""
+
+import asyncio
+
+import pytest
+
+import advanced_ai_recruiter
+from database import SQLiteDatabase
+from advanced_ai_recruiter import AdvancedAIRecruiter, LLM_CACHE_TTL
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def fake_generate_content(**kwargs):
+        calls.append(kwargs["prompt"])
+        return f"ответ {len(calls)}"
+
+    monkeypatch.setattr(advanced_ai_recruiter.modern_llm_manager, "generate_content", fake_generate_content)
+    return calls
+
+
+@pytest.fixture
+def recruiter(tmp_path):
+    return AdvancedAIRecruiter(SQLiteDatabase(str(tmp_path / "recruiter.db")))
+
+
+def test_translation_is_cached_until_ttl(recruiter, llm_calls):
+    """Повторный перевод берется из кэша, просроченная запись запрашивается заново"""
+
+    async def scenario():
+        first = await recruiter._cached_generate("переведи", "gemini", "model", "key", max_tokens=2000)
+        assert await recruiter._cached_generate("переведи", "gemini", "model", "key", max_tokens=2000) == first
+        assert len(llm_calls) == 1
+
+        # Запись старше TTL не используется ни из памяти, ни из БД
+        for cache_key, (stored_at, response) in list(recruiter._llm_cache.items()):
+            recruiter._llm_cache[cache_key] = (stored_at - LLM_CACHE_TTL - 1, response)
+        async with recruiter.db.get_connection() as conn:
+            await conn.execute("UPDATE llm_response_cache SET created_at = '2000-01-01T00:00:00'")
+            await conn.commit()
+        assert await recruiter._cached_generate("переведи", "gemini", "model", "key", max_tokens=2000) != first
+        assert len(llm_calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_conversation_reply_is_not_cached(recruiter, llm_calls):
+    """Одинаковый промпт разговора каждый раз уходит в LLM"""
+
+    async def scenario():
+        for _ in range(2):
+            await recruiter._generate_smart_message(
+                {"collected_data": {}, "conversation_history": []}, "greeting", "привет", "ru",
+                [("gemini", "model", "key")]
+            )
+        assert len(llm_calls) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+"""
+Тесты хранения профилей AI-рекрутера: каждый ход сразу попадает в БД
+"""
+
+import asyncio
+
+import pytest
+
+from database import SQLiteDatabase
+from advanced_ai_recruiter import AdvancedAIRecruiter, MAX_HISTORY
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SQLiteDatabase(str(tmp_path / "recruiter.db"))
+
+
+def test_turn_is_persisted_without_flush(db):
+    """Ход виден при прямом чтении из БД и в новом экземпляре рекрутера"""
+    recruiter = AdvancedAIRecruiter(db)
+
+    async def scenario():
+        await recruiter.start_conversation("u1", "ru", None)
+        result = await recruiter.continue_conversation("u1", "Я python разработчик из Берлина, B2", None)
+        assert result["status"] == "success"
+
+        profile = await db.get_ai_recruiter_profile("u1")
+        assert profile["stage"] == result["stage"]
+        assert profile["collected_data"]["preferred_city"] == "Berlin"
+        assert [turn["user_message"] for turn in profile["conversation_history"]] == [
+            None, "Я python разработчик из Берлина, B2"
+        ]
+
+        # Другой процесс (новый экземпляр) продолжает с того же места
+        reloaded = await AdvancedAIRecruiter(db)._get_profile("u1")
+        assert reloaded["stage"] == profile["stage"]
+        assert reloaded["history_length"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_history_is_bounded_after_reload(db):
+    """Журнал ходов в БД ограничен так же, как история в памяти"""
+    recruiter = AdvancedAIRecruiter(db)
+    messages = [f"ответ {index}" for index in range(MAX_HISTORY + 4)]
+
+    async def scenario():
+        await recruiter.start_conversation("u1", "ru", None)
+        for message in messages:
+            await recruiter.continue_conversation("u1", message, None)
+
+        profile = await db.get_ai_recruiter_profile("u1")
+        history = profile["conversation_history"]
+        assert len(history) == MAX_HISTORY
+        assert history[0]["user_message"] is None
+        assert [turn["user_message"] for turn in history[1:]] == messages[-(MAX_HISTORY - 1):]
+        assert profile["history_length"] == len(messages) + 1
+
+    asyncio.run(scenario())
+
+
+def test_turns_and_header_round_trip(db):
+    """Журнал ходов и заголовок накладываются на снимок профиля при чтении"""
+
+    async def scenario():
+        assert not await db.update_ai_recruiter_header("u1", {"stage": "skills"})
+
+        await db.save_ai_recruiter_profile("u1", {
+            "stage": "initial",
+            "collected_data": {},
+            "conversation_history": [{"user_message": None, "stage": "initial"}],
+        })
+        await db.append_ai_recruiter_turns("u1", [
+            {"user_message": "первый", "stage": "initial"},
+            {"user_message": "второй", "stage": "skills", "scores": {1: 0.5}},
+        ])
+        await db.append_ai_recruiter_turns("u1", [{"user_message": "третий", "stage": "skills"}], keep_last=2)
+        assert await db.update_ai_recruiter_header("u1", {
+            "stage": "skills",
+            "collected_data": {"preferred_city": "Berlin"},
+        })
+
+        profile = await db.get_ai_recruiter_profile("u1")
+        assert profile["stage"] == "skills"
+        assert profile["collected_data"] == {"preferred_city": "Berlin"}
+        # Снимок + два последних хода журнала; нестроковые ключи сохраняются строками
+        assert [turn["user_message"] for turn in profile["conversation_history"]] == [None, "второй", "третий"]
+        assert profile["conversation_history"][1]["scores"] == {"1": 0.5}
+
+    asyncio.run(scenario())
+
+
+def test_malformed_turn_is_skipped(db):
+    """Поврежденная запись журнала не ломает чтение профиля и список профилей"""
+
+    async def scenario():
+        await db.save_ai_recruiter_profile("u1", {"stage": "initial", "collected_data": {}, "conversation_history": []})
+        await db.append_ai_recruiter_turns("u1", [{"user_message": "первый"}])
+        async with db.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO ai_recruiter_turns (user_id, turn_data, created_at) VALUES ('u1', '{broken', '')"
+            )
+            await conn.execute(
+                "INSERT INTO users (id, email, name, oauth_provider) VALUES ('u1', 'u1@example.com', 'U1', 'telegram')"
+            )
+            await conn.commit()
+        await db.append_ai_recruiter_turns("u1", [{"user_message": "второй"}])
+
+        profile = await db.get_ai_recruiter_profile("u1")
+        assert [turn["user_message"] for turn in profile["conversation_history"]] == ["первый", "второй"]
+
+        profiles = await db.get_all_ai_recruiter_profiles()
+        assert [entry["user_id"] for entry in profiles] == ["u1"]
+        assert len(profiles[0]["profile_data"]["conversation_history"]) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,108 @@
+"""
+Тесты пакетного перевода вакансий AI-рекрутера
+"""
+
+import asyncio
+import json
+import math
+import re
+
+import pytest
+
+import advanced_ai_recruiter
+from advanced_ai_recruiter import AdvancedAIRecruiter, TRANSLATION_BATCH_SIZE
+
+PROVIDERS = [("gemini", "model", "key")]
+
+
+def make_jobs(count):
+    return [
+        {"id": f"job-{index}", "title": f"Entwickler {index}", "description": f"Beschreibung {index}", "url": f"https://jobs/{index}"}
+        for index in range(count)
+    ]
+
+
+class FakeLLM:
+    """Отвечает переводом на промпт пачки (JSON-массив) и одной вакансии (JSON-объект)"""
+
+    def __init__(self, skip_indexes=()):
+        self.calls = []
+        self.skip_indexes = set(skip_indexes)
+
+    async def generate_content(self, **kwargs):
+        self.calls.append(kwargs)
+        prompt = kwargs["prompt"]
+        if kwargs.get("system_message"):
+            titles = re.findall(r"Вакансия (\d+):\nНазвание: (.*)", prompt)
+            return json.dumps([
+                {"index": int(index), "title": f"RU {title}", "description": "перевод"}
+                for index, title in titles if int(index) not in self.skip_indexes
+            ], ensure_ascii=False)
+        title = re.search(r"Название: (.*)", prompt).group(1)
+        return json.dumps({"title": f"RU single {title}", "description": "перевод"}, ensure_ascii=False)
+
+
+@pytest.fixture
+def recruiter():
+    return AdvancedAIRecruiter(None)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(advanced_ai_recruiter.modern_llm_manager, "generate_content", fake.generate_content)
+    return fake
+
+
+@pytest.mark.parametrize("count", [2, TRANSLATION_BATCH_SIZE, TRANSLATION_BATCH_SIZE * 2 + 2])
+def test_jobs_are_translated_in_batches(recruiter, llm, count):
+    """N вакансий - ceil(N / TRANSLATION_BATCH_SIZE) вызовов LLM, порядок сохраняется"""
+    jobs = make_jobs(count)
+    result = asyncio.run(recruiter.translate_jobs(jobs, "ru", PROVIDERS))
+
+    assert result["status"] == "success"
+    assert len(llm.calls) == math.ceil(count / TRANSLATION_BATCH_SIZE)
+    assert [job["title"] for job in result["translated_jobs"]] == [f"RU {job['title']}" for job in jobs]
+
+
+def test_missing_item_falls_back_to_translate_job(recruiter, llm, monkeypatch):
+    """Вакансия, пропущенная в ответе на пачку, переводится отдельно через translate_job"""
+    llm.skip_indexes = {1}
+    single_calls = []
+    translate_job = recruiter.translate_job
+
+    async def counting_translate_job(job_data, target_language, user_providers=None):
+        single_calls.append(job_data["id"])
+        return await translate_job(job_data, target_language, user_providers)
+
+    monkeypatch.setattr(recruiter, "translate_job", counting_translate_job)
+    jobs = make_jobs(3)
+    result = asyncio.run(recruiter.translate_jobs(jobs, "ru", PROVIDERS))
+
+    assert single_calls == ["job-1"]
+    assert len(llm.calls) == 2
+    assert [job["title"] for job in result["translated_jobs"]] == [
+        "RU Entwickler 0", "RU single Entwickler 1", "RU Entwickler 2"
+    ]
+
+
+@pytest.mark.parametrize("language, translated", [("ru", True), ("de", False)])
+def test_recommendations_are_translated_once(recruiter, llm, monkeypatch, language, translated):
+    """Рекомендации переводятся одним вызовом, только если язык пользователя не язык поиска"""
+    jobs = make_jobs(7)
+
+    async def fake_search_jobs(user_id, search_params):
+        return {"status": "success", "jobs": jobs}
+
+    monkeypatch.setattr(recruiter, "_search_jobs", fake_search_jobs)
+    profile = {"user_id": "u1", "language": language, "collected_data": {"profession": "entwickler"}}
+    recommendations = asyncio.run(recruiter._generate_job_recommendations(profile, PROVIDERS))
+
+    assert len(recommendations) == 5
+    assert len(llm.calls) == (1 if translated else 0)
+    for recommendation in recommendations:
+        job = recommendation["job"]
+        assert job["title"].startswith("RU ") is translated
+        # Поля, которых нет в переводе, остаются от оригинала
+        assert job["url"] == f"https://jobs/{job['id'].split('-')[1]}"
+        assert ("original_job" in recommendation) is translated